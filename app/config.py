@@ -0,0 +1,93 @@
+# app/config.py
+from dotenv import load_dotenv
+import os
+
+
+load_dotenv()
+
+# How ETL classes write into the database:
+#   "copy"   - stream rows into a temporary staging table with COPY, then merge
+#   "values" - batched INSERT ... VALUES statements (original behaviour)
+ETL_LOAD_MODE = os.getenv("ETL_LOAD_MODE", "copy")
+
+# What ETL loads do with rows whose key (station and date/year) already exists:
+#   "ignore" - keep the stored row (original behaviour)
+#   "update" - overwrite it if any measurement differs; identical rows are not
+#              rewritten, and the feedback counts inserted/updated/unchanged rows
+ETL_ON_CONFLICT = os.getenv("ETL_ON_CONFLICT", "ignore")
+
+# How WeatherETL parses wx_data files:
+#   "arrow"  - pyarrow CSV reader into int32 columns, dates and units converted
+#              with integer arithmetic; falls back to pandas on unexpected input
+#   "pandas" - pandas.read_csv with string dates (original behaviour)
+WEATHER_PARSER = os.getenv("WEATHER_PARSER", "arrow")
+
+# Where weather measurements are stored (see app/db/schema.py):
+#   "float"   - weather_data, station_id strings and float columns (original)
+#   "compact" - weather_data_compact, SMALLINT station keys and integer tenths
+WEATHER_STORAGE = os.getenv("WEATHER_STORAGE", "float")
+
+# Incremental weather ingestion: look up the dates already stored for the
+# station and drop those rows during transform instead of sending them to the
+# database. Rows for stored dates are never updated in this mode.
+ETL_INCREMENTAL = os.getenv("ETL_INCREMENTAL", "false").lower() in ("1", "true")
+
+# Number of worker processes used for the CPU-bound extract/transform steps.
+# 0 runs them inline on the event loop.
+ETL_PROCESS_POOL_SIZE = int(os.getenv("ETL_PROCESS_POOL_SIZE", "2"))
+
+# Streaming uploads: bytes read from the upload per chunk, and how many parsed
+# chunks may wait for the loader before reading pauses.
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+STREAM_MAX_PENDING_CHUNKS = int(os.getenv("STREAM_MAX_PENDING_CHUNKS", "2"))
+
+# Archive uploads: how many archive members are ingested at the same time.
+# Each member uses its own session, so keep this below the DB pool size.
+ARCHIVE_INGEST_CONCURRENCY = int(os.getenv("ARCHIVE_INGEST_CONCURRENCY", "4"))
+
+# Asynchronous ingestion jobs: concurrent workers (each holds one DB
+# connection while loading), queued jobs accepted before uploads get a 503,
+# and finished jobs kept in memory for status lookups.
+INGESTION_JOB_WORKERS = int(os.getenv("INGESTION_JOB_WORKERS", "2"))
+INGESTION_JOB_QUEUE_SIZE = int(os.getenv("INGESTION_JOB_QUEUE_SIZE", "100"))
+INGESTION_JOB_HISTORY_SIZE = int(os.getenv("INGESTION_JOB_HISTORY_SIZE", "1000"))
+
+# In-process response caches for the read endpoints. Entries expire after the
+# TTL and are invalidated per station when ingestion inserts rows. A size of
+# 0 disables the cache.
+STATS_CACHE_SIZE = int(os.getenv("STATS_CACHE_SIZE", "1024"))
+STATS_CACHE_TTL_SECONDS = float(os.getenv("STATS_CACHE_TTL_SECONDS", "300"))
+WEATHER_DATA_CACHE_SIZE = int(os.getenv("WEATHER_DATA_CACHE_SIZE", "256"))
+WEATHER_DATA_CACHE_TTL_SECONDS = float(
+    os.getenv("WEATHER_DATA_CACHE_TTL_SECONDS", "60")
+)
+
+# Rows fetched per round trip from the server-side cursor behind /weather/export.
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+
+# Cache-Control max-age of the read endpoints. Clients revalidate with
+# If-None-Match afterwards and get a 304 until new data is ingested.
+HTTP_CACHE_MAX_AGE_SECONDS = int(os.getenv("HTTP_CACHE_MAX_AGE_SECONDS", "0"))
+
+# Seconds the read endpoints reuse the data versions read from the database
+# before querying them again. Loads in other processes become visible (and
+# drop this process's cached responses) after at most this long.
+DATA_VERSION_TTL_SECONDS = float(os.getenv("DATA_VERSION_TTL_SECONDS", "2"))
+
+# Database connection pool. Keep DB_POOL_SIZE + DB_MAX_OVERFLOW (per process)
+# below Postgres max_connections. DB_POOL_RECYCLE of -1 never recycles.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true")
+# Prepared statements cached per asyncpg connection; 0 disables (needed
+# behind PgBouncer in transaction mode).
+DB_PREPARED_STATEMENT_CACHE_SIZE = int(
+    os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", "100")
+)
+
+# ETL instrumentation: trace peak memory per phase with tracemalloc (slows
+# ETL down noticeably), and functions listed in cProfile reports.
+ETL_TRACE_MEMORY = os.getenv("ETL_TRACE_MEMORY", "false").lower() in ("1", "true")
+ETL_PROFILE_TOP_N = int(os.getenv("ETL_PROFILE_TOP_N", "30"))
@@ -0,0 +1,101 @@
+from typing import Sequence, Tuple
+import io
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from sqlalchemy.dialects.postgresql import asyncpg as asyncpg_dialect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.etl.copy_loader import get_driver_connection
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+
+WEATHER_ARROW_SCHEMA = pa.schema(
+    [
+        ("station_id", pa.string()),
+        ("date", pa.date32()),
+        ("max_temp", pa.float64()),
+        ("min_temp", pa.float64()),
+        ("precipitation", pa.float64()),
+    ]
+)
+
+
+def compile_query(query) -> Tuple[str, list]:
+    """
+    Compile a SQLAlchemy select into asyncpg SQL with positional arguments.
+    """
+    compiled = query.compile(dialect=asyncpg_dialect.dialect())
+    return str(compiled), [compiled.params[name] for name in compiled.positiontup]
+
+
+async def fetch_arrow_table(
+    session: AsyncSession, query, schema: pa.Schema
+) -> pa.Table:
+    """
+    Run `query` with COPY ... TO STDOUT and parse the result straight into Arrow.
+
+    Rows never become Python objects: Postgres writes CSV into a buffer and
+    pyarrow parses it column by column with the given schema. NaN values are
+    turned into nulls, matching the JSON responses.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        query: SQLAlchemy select whose columns match `schema`, in order.
+        schema (pa.Schema): Arrow schema of the result.
+
+    Returns:
+        pa.Table: The query result.
+    """
+    sql, args = compile_query(query)
+    buffer = io.BytesIO()
+    driver_connection = await get_driver_connection(session)
+    await driver_connection.copy_from_query(sql, *args, output=buffer, format="csv")
+    if not buffer.getbuffer().nbytes:
+        return schema.empty_table()
+    buffer.seek(0)
+
+    table = pa_csv.read_csv(
+        buffer,
+        read_options=pa_csv.ReadOptions(column_names=schema.names),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=schema, strings_can_be_null=False
+        ),
+    )
+    return nan_to_null(table)
+
+
+def nan_to_null(table: pa.Table) -> pa.Table:
+    """
+    Replace NaN with null in every floating point column.
+    """
+    for index, field in enumerate(table.schema):
+        if pa.types.is_floating(field.type):
+            column = table.column(index)
+            table = table.set_column(
+                index, field, pc.if_else(pc.is_nan(column), None, column)
+            )
+    return table
+
+
+def table_to_bytes(table: pa.Table, output_format: str) -> bytes:
+    """
+    Serialize an Arrow table as an Arrow IPC stream ("arrow") or Parquet ("parquet").
+    """
+    sink = io.BytesIO()
+    if output_format == "parquet":
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue()
+
+
+def last_row_values(table: pa.Table, columns: Sequence[str]) -> list:
+    """
+    Return the values of `columns` in the last row of `table` as Python objects.
+    """
+    return [table.column(name)[-1].as_py() for name in columns]
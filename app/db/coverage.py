@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Stored dates of one station as contiguous ranges ("gaps and islands"): in a
+# run of consecutive days, date - row_number() is constant. One index-only
+# range scan of the station's rows, returning a handful of ranges.
+DATE_COVERAGE_SQL = text(
+    """
+    SELECT MIN(date) AS start_date, MAX(date) AS end_date
+    FROM (
+        SELECT date, date - CAST(ROW_NUMBER() OVER (ORDER BY date) AS integer) AS island
+        FROM weather_data
+        WHERE station_id = :station_id
+    ) AS days
+    GROUP BY island
+    ORDER BY start_date
+    """
+)
+
+DATE_COVERAGE_COMPACT_SQL = text(
+    """
+    SELECT MIN(date) AS start_date, MAX(date) AS end_date
+    FROM (
+        SELECT w.date, w.date - CAST(ROW_NUMBER() OVER (ORDER BY w.date) AS integer) AS island
+        FROM weather_data_compact w
+        JOIN stations s ON s.id = w.station_key
+        WHERE s.station_id = :station_id
+    ) AS days
+    GROUP BY island
+    ORDER BY start_date
+    """
+)
+
+
+class DateCoverage:
+    """
+    Dates already stored for a station, as sorted, disjoint [start, end] ranges.
+
+    The last range ends at the station's max date; the holes between ranges
+    are its gaps. Small enough to be pickled along with the ETL object into
+    the process pool.
+    """
+
+    def __init__(self, station_id: str, ranges: Sequence[Tuple[date, date]]):
+        self.station_id = station_id
+        self.starts = np.array([start for start, _ in ranges], dtype="datetime64[D]")
+        self.ends = np.array([end for _, end in ranges], dtype="datetime64[D]")
+
+    @property
+    def max_date(self) -> Optional[date]:
+        return self.ends[-1].astype(date) if len(self.ends) else None
+
+    def gaps(self) -> List[Tuple[date, date]]:
+        """
+        Return the missing date ranges before max_date, inclusive.
+        """
+        one_day = timedelta(days=1)
+        return [
+            (end.astype(date) + one_day, start.astype(date) - one_day)
+            for end, start in zip(self.ends[:-1], self.starts[1:])
+        ]
+
+    def covers(self, dates: np.ndarray) -> np.ndarray:
+        """
+        Return a boolean mask of the dates that are already stored.
+
+        Args:
+            dates (np.ndarray): datetime64 values; NaT is never covered.
+
+        Returns:
+            np.ndarray: True where the date falls inside a stored range.
+        """
+        days = dates.astype("datetime64[D]")
+        index = np.searchsorted(self.starts, days, side="right") - 1
+        inside = index >= 0
+        inside[inside] = days[inside] <= self.ends[index[inside]]
+        return inside & ~np.isnat(days)
+
+
+async def fetch_date_coverage(
+    session: AsyncSession, station_id: str, storage: str = "float"
+) -> DateCoverage:
+    """
+    Look up which dates are already stored for a station.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        station_id (str): Station to look up.
+        storage (str, optional): "float" to read weather_data, "compact" to read
+            weather_data_compact. Defaults to "float".
+
+    Returns:
+        DateCoverage: The stored date ranges; empty for a new station.
+    """
+    sql = DATE_COVERAGE_COMPACT_SQL if storage == "compact" else DATE_COVERAGE_SQL
+    result = await session.execute(sql, {"station_id": station_id})
+    return DateCoverage(station_id, [tuple(row) for row in result.fetchall()])
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Scope of the version that covers all ingested data
+ALL_DATA_SCOPE = "*"
+
+# Rows are locked in scope order ("*" sorts before station IDs), so concurrent
+# loads cannot deadlock on each other's versions.
+BUMP_DATA_VERSIONS_SQL = text(
+    """
+    INSERT INTO data_versions (scope, version, modified_at)
+    SELECT s.scope, 1, now()
+    FROM unnest(CAST(:scopes AS varchar[])) AS s(scope)
+    ORDER BY s.scope
+    ON CONFLICT (scope) DO UPDATE
+        SET version = data_versions.version + 1, modified_at = now()
+    """
+)
+
+SELECT_DATA_VERSIONS_SQL = text(
+    """
+    SELECT scope, version, modified_at
+    FROM data_versions
+    """
+)
+
+
+async def bump_data_versions(session: AsyncSession, station_ids: Iterable[str]) -> None:
+    """
+    Bump the version of the given stations and of all data.
+
+    Runs inside the caller's transaction, so the new version becomes visible
+    to readers together with the rows that changed.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        station_ids (Iterable[str]): Stations whose rows were inserted or updated.
+    """
+    scopes = sorted({ALL_DATA_SCOPE, *(str(s) for s in station_ids)})
+    await session.execute(BUMP_DATA_VERSIONS_SQL, {"scopes": scopes})
+
+
+async def fetch_data_versions(session: AsyncSession) -> Dict[str, Tuple[int, datetime]]:
+    """
+    Return every stored version as {scope: (version, modified_at)}.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+
+    Returns:
+        Dict[str, Tuple[int, datetime]]: One entry per station, plus "*".
+    """
+    result = await session.execute(SELECT_DATA_VERSIONS_SQL)
+    return {scope: (version, modified_at) for scope, version, modified_at in result}
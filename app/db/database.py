@@ -3,6 +3,15 @@ from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 import os
 from app.db.schema import Base
+from app.db.pool import InstrumentedQueuePool
+from app.config import (
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    DB_PREPARED_STATEMENT_CACHE_SIZE,
+)
 
 
 load_dotenv()
@@ -18,7 +27,16 @@ if not DATABASE_URL.startswith("postgresql+asyncpg://"):
 
 # Create an asynchronous engine
 engine = create_async_engine(
-    DATABASE_URL, echo=False, future=True  # Set to False in production
+    DATABASE_URL,
+    echo=False,  # Set to False in production
+    future=True,
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    connect_args={"prepared_statement_cache_size": DB_PREPARED_STATEMENT_CACHE_SIZE},
 )
 
 # Create an asynchronous sessionmaker
@@ -26,6 +44,7 @@ AsyncSessionLocal = sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
+
 # Dependency to provide an AsyncSession
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
@@ -0,0 +1,158 @@
+from typing import Iterable, List, Optional, Tuple
+import hashlib
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.db.schema import IngestionManifest
+
+# File names looked up per query by find_ingested
+MANIFEST_LOOKUP_BATCH_SIZE = 5000
+
+
+def file_checksum(content: bytes) -> str:
+    """
+    Return the SHA-256 hex digest identifying a file's content in the manifest.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+async def get_latest_manifest_entry(
+    session: AsyncSession, filename: str
+) -> Optional[IngestionManifest]:
+    """
+    Return the most recently ingested version of a file, or None if it never was.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        filename (str): Name of the uploaded file.
+
+    Returns:
+        Optional[IngestionManifest]: The entry, if any.
+    """
+    result = await session.execute(
+        select(IngestionManifest)
+        .where(IngestionManifest.filename == filename)
+        .order_by(IngestionManifest.ingested_at.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
+
+
+async def find_unchanged(
+    session: AsyncSession, filename: str, checksum: str, force: bool = False
+) -> Optional[dict]:
+    """
+    Return the feedback of the last ingestion of a file if it had the same content.
+
+    Only the most recent version counts: after A, then B, re-uploading A must
+    be ingested again, since B's rows replaced some of A's.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        filename (str): Name of the uploaded file.
+        checksum (str): SHA-256 hex digest of its content.
+        force (bool, optional): Ignore the manifest and always ingest.
+
+    Returns:
+        Optional[dict]: Feedback to return instead of running the ETL, or None.
+    """
+    if force:
+        return None
+    entry = await get_latest_manifest_entry(session, filename)
+    if entry is None or entry.checksum != checksum:
+        return None
+    logging.info(
+        f"File '{filename}' is unchanged since {entry.ingested_at}; skipping ingestion."
+    )
+    return unchanged_feedback(entry)
+
+
+async def find_ingested(
+    session: AsyncSession, files: Iterable[Tuple[str, str]]
+) -> List[Tuple[str, str]]:
+    """
+    Return which (filename, checksum) pairs are the latest ingested version of
+    their file, the batch counterpart of find_unchanged.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        files (Iterable[Tuple[str, str]]): Pairs to look up.
+
+    Returns:
+        List[Tuple[str, str]]: The pairs that match their file's latest entry.
+    """
+    files = list(files)
+    filenames = sorted({filename for filename, _ in files})
+    latest = set()
+    # One bind parameter per file name; stay far below the driver's 32767 limit
+    for start in range(0, len(filenames), MANIFEST_LOOKUP_BATCH_SIZE):
+        batch = filenames[start : start + MANIFEST_LOOKUP_BATCH_SIZE]
+        result = await session.execute(
+            select(IngestionManifest.filename, IngestionManifest.checksum)
+            .where(IngestionManifest.filename.in_(batch))
+            .distinct(IngestionManifest.filename)
+            .order_by(IngestionManifest.filename, IngestionManifest.ingested_at.desc())
+        )
+        latest.update(tuple(row) for row in result.fetchall())
+    return [pair for pair in files if pair in latest]
+
+
+async def record_manifest_entry(
+    session: AsyncSession,
+    filename: str,
+    checksum: str,
+    etl_class: str,
+    station_id: Optional[str],
+    feedback: dict,
+) -> None:
+    """
+    Record a successfully ingested file version and commit.
+
+    Called after the load committed, so a crash in between only means the
+    file is parsed again next time; loads skip rows that already exist.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        filename (str): Name of the uploaded file.
+        checksum (str): SHA-256 hex digest of its content.
+        etl_class (str): Name of the ETL class that ingested it.
+        station_id (Optional[str]): Station of the file, if it has a single one.
+        feedback (dict): ETL feedback with total and inserted record counts.
+    """
+    stmt = insert(IngestionManifest).values(
+        filename=filename,
+        checksum=checksum,
+        station_id=station_id,
+        etl_class=etl_class,
+        row_count=feedback["total_records"],
+        inserted_count=feedback["inserted_records"],
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["filename", "checksum"],
+        set_={
+            "row_count": stmt.excluded.row_count,
+            "inserted_count": stmt.excluded.inserted_count,
+            "ingested_at": func.now(),
+        },
+    )
+    await session.execute(stmt)
+    await session.commit()
+    logging.info(f"Recorded '{filename}' ({checksum[:12]}) in the ingestion manifest.")
+
+
+def unchanged_feedback(entry: IngestionManifest) -> dict:
+    """
+    Feedback returned instead of running the ETL for an already ingested file.
+    """
+    return {
+        "total_records": entry.row_count,
+        "inserted_records": 0,
+        "time_taken": 0.0,
+        "unchanged": True,
+        "checksum": entry.checksum,
+        "ingested_at": entry.ingested_at.isoformat() if entry.ingested_at else None,
+    }
@@ -0,0 +1,106 @@
+"""Add weather_stats_summary table
+
+Revision ID: 3f7a2c9d41b6
+Revises: 92cbc328b09c
+Create Date: 2026-10-17 09:12:41.508133
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7a2c9d41b6"
+down_revision: Union[str, None] = "92cbc328b09c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's startup create_all may have created the (empty) table already
+    if not sa.inspect(op.get_bind()).has_table("weather_stats_summary"):
+        op.create_table(
+            "weather_stats_summary",
+            sa.Column("station_id", sa.String(), nullable=False),
+            sa.Column("year", sa.Integer(), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("sum_max_temp", sa.Float(), nullable=True),
+            sa.Column("sum_min_temp", sa.Float(), nullable=True),
+            sa.Column("sum_precipitation", sa.Float(), nullable=True),
+            sa.PrimaryKeyConstraint("station_id", "year"),
+        )
+
+    # Backfill from the rows already ingested, overwriting any groups that
+    # were refreshed before the migration ran
+    op.execute(
+        """
+    INSERT INTO weather_stats_summary (
+        station_id, year, row_count, sum_max_temp, sum_min_temp, sum_precipitation
+    )
+    SELECT
+        station_id,
+        EXTRACT(YEAR FROM date)::integer AS year,
+        COUNT(*),
+        SUM(max_temp),
+        SUM(min_temp),
+        SUM(precipitation)
+    FROM
+        weather_data
+    WHERE
+        max_temp <> 'NaN' AND
+        min_temp <> 'NaN' AND
+        precipitation <> 'NaN'
+    GROUP BY
+        station_id, EXTRACT(YEAR FROM date)
+    ON CONFLICT (station_id, year) DO UPDATE SET
+        row_count = EXCLUDED.row_count,
+        sum_max_temp = EXCLUDED.sum_max_temp,
+        sum_min_temp = EXCLUDED.sum_min_temp,
+        sum_precipitation = EXCLUDED.sum_precipitation;
+    """
+    )
+
+    # Keep the view for ad-hoc queries, but read it from the summary table
+    op.execute("DROP VIEW IF EXISTS weather_stats_view;")
+    op.execute(
+        """
+    CREATE VIEW weather_stats_view AS
+    SELECT
+        station_id,
+        year,
+        sum_max_temp / row_count AS avg_max_temp,
+        sum_min_temp / row_count AS avg_min_temp,
+        sum_precipitation AS total_precipitation
+    FROM
+        weather_stats_summary
+    WHERE
+        row_count > 0;
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS weather_stats_view;")
+    op.execute(
+        """
+    CREATE VIEW weather_stats_view AS
+    SELECT
+        station_id,
+        EXTRACT(YEAR FROM date) AS year,
+        AVG(max_temp) AS avg_max_temp,
+        AVG(min_temp) AS avg_min_temp,
+        SUM(precipitation) AS total_precipitation
+    FROM
+        weather_data
+    WHERE
+        max_temp != -9999 AND
+        min_temp != -9999 AND
+        precipitation != -9999
+    GROUP BY
+        station_id, EXTRACT(YEAR FROM date);
+    """
+    )
+    op.drop_table("weather_stats_summary")
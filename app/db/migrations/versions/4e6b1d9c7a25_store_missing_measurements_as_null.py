@@ -0,0 +1,40 @@
+"""Store missing weather measurements as NULL
+
+Revision ID: 4e6b1d9c7a25
+Revises: 8d41f6b2a9e3
+Create Date: 2026-10-17 18:20:11.402716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e6b1d9c7a25"
+down_revision: Union[str, None] = "8d41f6b2a9e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # INSERT ... VALUES loads used to store missing measurements as NaN while
+    # COPY loads stored NULL; both load modes now write NULL.
+    op.execute(
+        """
+        UPDATE weather_data SET
+            max_temp = NULLIF(max_temp, 'NaN'),
+            min_temp = NULLIF(min_temp, 'NaN'),
+            precipitation = NULLIF(precipitation, 'NaN')
+        WHERE
+            max_temp = 'NaN' OR
+            min_temp = 'NaN' OR
+            precipitation = 'NaN'
+        """
+    )
+
+
+def downgrade() -> None:
+    # NULL is a valid representation for both load modes; nothing to undo
+    pass
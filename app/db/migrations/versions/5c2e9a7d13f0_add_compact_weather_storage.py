@@ -0,0 +1,87 @@
+"""Add compact weather storage with a station dimension table
+
+Revision ID: 5c2e9a7d13f0
+Revises: b8e5d0c27f4a
+Create Date: 2026-10-17 14:26:09.310457
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e9a7d13f0"
+down_revision: Union[str, None] = "b8e5d0c27f4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's startup create_all may have created the tables already
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("stations"):
+        op.create_table(
+            "stations",
+            sa.Column("id", sa.SmallInteger(), sa.Identity(), nullable=False),
+            sa.Column("station_id", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+            sa.UniqueConstraint("station_id"),
+        )
+    if not inspector.has_table("weather_data_compact"):
+        op.create_table(
+            "weather_data_compact",
+            sa.Column("station_key", sa.SmallInteger(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=False),
+            sa.Column("max_temp", sa.SmallInteger(), nullable=True),
+            sa.Column("min_temp", sa.SmallInteger(), nullable=True),
+            sa.Column("precipitation", sa.SmallInteger(), nullable=True),
+            sa.ForeignKeyConstraint(["station_key"], ["stations.id"]),
+            sa.PrimaryKeyConstraint("station_key", "date"),
+        )
+
+    # Copy the rows already ingested, so WEATHER_STORAGE=compact serves the
+    # same data. Missing measurements are NULL (COPY) or NaN (INSERT ... VALUES).
+    # Rows that are already there are kept.
+    op.execute(
+        """
+    INSERT INTO stations (station_id)
+    SELECT DISTINCT station_id FROM weather_data ORDER BY station_id
+    ON CONFLICT (station_id) DO NOTHING;
+    """
+    )
+    op.execute(
+        """
+    INSERT INTO weather_data_compact (
+        station_key, date, max_temp, min_temp, precipitation
+    )
+    SELECT
+        s.id,
+        w.date,
+        round(NULLIF(w.max_temp, 'NaN') * 10),
+        round(NULLIF(w.min_temp, 'NaN') * 10),
+        round(NULLIF(w.precipitation, 'NaN') * 10)
+    FROM
+        weather_data w
+    JOIN stations s ON s.station_id = w.station_id
+    ON CONFLICT (station_key, date) DO NOTHING;
+    """
+    )
+
+    # Built after the backfill, which is faster than maintaining it row by row
+    op.create_index(
+        "ix_weather_data_compact_date_station",
+        "weather_data_compact",
+        ["date", "station_key"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_weather_data_compact_date_station", table_name="weather_data_compact"
+    )
+    op.drop_table("weather_data_compact")
+    op.drop_table("stations")
@@ -0,0 +1,44 @@
+"""Add ingestion_manifest table
+
+Revision ID: 8d41f6b2a9e3
+Revises: 5c2e9a7d13f0
+Create Date: 2026-10-17 15:02:47.118630
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41f6b2a9e3"
+down_revision: Union[str, None] = "5c2e9a7d13f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's startup create_all may have created the (empty) table already
+    if not sa.inspect(op.get_bind()).has_table("ingestion_manifest"):
+        op.create_table(
+            "ingestion_manifest",
+            sa.Column("filename", sa.String(), nullable=False),
+            sa.Column("checksum", sa.String(length=64), nullable=False),
+            sa.Column("station_id", sa.String(), nullable=True),
+            sa.Column("etl_class", sa.String(), nullable=False),
+            sa.Column("row_count", sa.Integer(), nullable=False),
+            sa.Column("inserted_count", sa.Integer(), nullable=False),
+            sa.Column(
+                "ingested_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.PrimaryKeyConstraint("filename", "checksum"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("ingestion_manifest")
@@ -0,0 +1,63 @@
+"""Add data_versions table
+
+Revision ID: a17c3e5f92d8
+Revises: 4e6b1d9c7a25
+Create Date: 2026-10-17 19:41:05.270318
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a17c3e5f92d8"
+down_revision: Union[str, None] = "4e6b1d9c7a25"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The app's startup create_all may have created the (empty) table already
+    if not sa.inspect(op.get_bind()).has_table("data_versions"):
+        op.create_table(
+            "data_versions",
+            sa.Column("scope", sa.String(), nullable=False),
+            sa.Column("version", sa.BigInteger(), nullable=False),
+            sa.Column(
+                "modified_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.PrimaryKeyConstraint("scope"),
+        )
+
+    # Seed a version for the data ingested before this migration, so stations
+    # that already have rows are not reported as unmodified since the epoch
+    op.execute(
+        """
+    INSERT INTO data_versions (scope, version, modified_at)
+    SELECT scope, 1, now()
+    FROM (
+        SELECT station_id FROM weather_data
+        UNION
+        SELECT s.station_id
+        FROM stations s
+        WHERE EXISTS (
+            SELECT 1 FROM weather_data_compact w WHERE w.station_key = s.id
+        )
+        UNION
+        SELECT station_id FROM crop_yield_data
+    ) AS ingested(scope)
+    UNION ALL
+    SELECT '*', 1, now()
+    ON CONFLICT (scope) DO NOTHING
+    """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
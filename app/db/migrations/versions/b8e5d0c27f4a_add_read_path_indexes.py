@@ -0,0 +1,46 @@
+"""Add indexes for the weather read paths
+
+Revision ID: b8e5d0c27f4a
+Revises: 3f7a2c9d41b6
+Create Date: 2026-10-17 10:03:18.774902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e5d0c27f4a"
+down_revision: Union[str, None] = "3f7a2c9d41b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /weather filtered by date range without station_id, and ordered by date
+    # (including keyset pages on (date, station_id)). A B-tree rather than BRIN
+    # because it also has to serve ORDER BY date.
+    # The app's startup create_all creates both indexes along with new tables
+    op.create_index(
+        "ix_weather_data_date_station",
+        "weather_data",
+        ["date", "station_id"],
+        if_not_exists=True,
+    )
+
+    # /weather/stats filtered by year only. Stats are read from
+    # weather_stats_summary, whose primary key already covers station_id.
+    op.create_index(
+        "ix_weather_stats_summary_year",
+        "weather_stats_summary",
+        ["year"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_weather_stats_summary_year", table_name="weather_stats_summary")
+    op.drop_index("ix_weather_data_date_station", table_name="weather_data")
@@ -1,17 +1,23 @@
 from sqlalchemy import (
     Column,
     Integer,
+    BigInteger,
     String,
     Float,
+    SmallInteger,
+    Identity,
     Date,
+    DateTime,
+    Index,
     UniqueConstraint,
     ForeignKey,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
+
 # Define the WeatherData ORM class
 class WeatherData(Base):
     __tablename__ = "weather_data"
@@ -25,14 +31,63 @@ class WeatherData(Base):
 
     __table_args__ = (
         UniqueConstraint("station_id", "date", name="uq_weather_station_date"),
+        # Date-range filters without a station, and date-ordered keyset pages
+        Index("ix_weather_data_date_station", "date", "station_id"),
+    )
+
+
+# Optional compact storage of weather_data (WEATHER_STORAGE=compact):
+# measurements stay in the integer tenths of the source files as SMALLINT, and
+# each row references its station through a SMALLINT key instead of repeating
+# the station_id string. That roughly halves the heap and index size. The
+# read endpoints convert back to real units.
+class Station(Base):
+    __tablename__ = "stations"
+
+    id = Column(SmallInteger, Identity(), primary_key=True)
+    station_id = Column(String, nullable=False, unique=True)
+
+
+class WeatherDataCompact(Base):
+    __tablename__ = "weather_data_compact"
+
+    station_key = Column(SmallInteger, ForeignKey("stations.id"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    max_temp = Column(SmallInteger, nullable=True)  # Tenths of a degree Celsius
+    min_temp = Column(SmallInteger, nullable=True)  # Tenths of a degree Celsius
+    precipitation = Column(SmallInteger, nullable=True)  # Tenths of a mm
+
+    __table_args__ = (
+        Index("ix_weather_data_compact_date_station", "date", "station_key"),
     )
 
-    # Define relationship to WeatherStats
-    stats = relationship(
-        "WeatherStats",
-        back_populates="weather_data",
-        primaryjoin="WeatherData.station_id == foreign(WeatherStats.station_id)",
-        viewonly=True,
+
+# One row per ingested version of a file: its name and the SHA-256 of its
+# content. Uploads already listed here are skipped before they are parsed.
+class IngestionManifest(Base):
+    __tablename__ = "ingestion_manifest"
+
+    filename = Column(String, primary_key=True)
+    checksum = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    station_id = Column(String, nullable=True)  # None for crop yield files
+    etl_class = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    inserted_count = Column(Integer, nullable=False)
+    ingested_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+# Version of the ingested data, bumped in every load transaction that changes
+# rows: one row per station, and scope "*" for the data as a whole. Read
+# endpoints derive their ETags from it, so every process agrees on them.
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    scope = Column(String, primary_key=True)  # Station ID, or "*" for all data
+    version = Column(BigInteger, nullable=False)
+    modified_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
     )
 
 
@@ -54,6 +109,24 @@ class CropYieldData(Base):
     )
 
 
+# Running per-station, per-year sums and counts, maintained during ingestion
+# for the (station_id, year) groups each load touches. Averages are derived on
+# read, so stats queries are a primary key lookup instead of a GROUP BY over
+# weather_data. Only days with all three measurements present are counted,
+# matching the original weather_stats_view.
+class WeatherStatsSummary(Base):
+    __tablename__ = "weather_stats_summary"
+
+    station_id = Column(String, primary_key=True)
+    year = Column(Integer, primary_key=True)
+    row_count = Column(Integer, nullable=False, default=0)
+    sum_max_temp = Column(Float, nullable=True)
+    sum_min_temp = Column(Float, nullable=True)
+    sum_precipitation = Column(Float, nullable=True)
+
+    __table_args__ = (Index("ix_weather_stats_summary_year", "year"),)
+
+
 # Never needed this as a table, data should be dynamicly fetched and calulated: using a view instead
 
 # Define the WeatherStats ORM class
@@ -0,0 +1,54 @@
+from typing import Dict, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Only stations that are not known yet are inserted: ON CONFLICT alone would
+# still draw a value from the SMALLINT identity sequence for every station of
+# every load, and run out of keys after a few thousand re-ingestions.
+INSERT_STATIONS_SQL = text(
+    """
+    INSERT INTO stations (station_id)
+    SELECT s.station_id
+    FROM unnest(CAST(:station_ids AS varchar[])) AS s(station_id)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM stations WHERE stations.station_id = s.station_id
+    )
+    ON CONFLICT (station_id) DO NOTHING
+    """
+)
+
+SELECT_STATION_KEYS_SQL = text(
+    """
+    SELECT station_id, id
+    FROM stations
+    WHERE station_id = ANY(CAST(:station_ids AS varchar[]))
+    """
+)
+
+
+async def get_station_keys(
+    session: AsyncSession, station_ids: Sequence[str]
+) -> Dict[str, int]:
+    """
+    Return the SMALLINT keys of the given stations, registering new ones.
+
+    Runs inside the caller's transaction, so new stations commit together with
+    their weather rows.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        station_ids (Sequence[str]): Distinct station ids.
+
+    Returns:
+        Dict[str, int]: Station id to key.
+    """
+    station_ids = list(station_ids)
+    if not station_ids:
+        return {}
+    await session.execute(INSERT_STATIONS_SQL, {"station_ids": station_ids})
+    result = await session.execute(
+        SELECT_STATION_KEYS_SQL, {"station_ids": station_ids}
+    )
+    return dict(result.fetchall())
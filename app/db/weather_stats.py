@@ -0,0 +1,143 @@
+from typing import List, Tuple
+import logging
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Serialize refreshes of the same (station_id, year) group: a transaction
+# holds the group's advisory lock until it commits, so a concurrent load
+# recomputes the group only after that commit and, under READ COMMITTED,
+# from a snapshot that includes it. Locks are taken in sorted order so two
+# loads touching the same groups cannot deadlock.
+LOCK_WEATHER_STATS_GROUPS_SQL = text(
+    """
+    SELECT pg_advisory_xact_lock(hashtext(g.station_id), g.year)
+    FROM
+        unnest(CAST(:station_ids AS varchar[]), CAST(:years AS integer[]))
+            AS g(station_id, year)
+    ORDER BY g.station_id, g.year
+    """
+)
+
+# Recompute the summary rows of the given (station_id, year) groups from
+# weather_data. Each group is a range scan on uq_weather_station_date, so the
+# cost depends on the number of groups touched, not on the size of the table.
+# Groups without any complete day keep a row with row_count = 0; missing
+# measurements are NULL in both load modes.
+REFRESH_WEATHER_STATS_SQL = text(
+    """
+    INSERT INTO weather_stats_summary (
+        station_id, year, row_count, sum_max_temp, sum_min_temp, sum_precipitation
+    )
+    SELECT
+        g.station_id,
+        g.year,
+        COUNT(w.date),
+        SUM(w.max_temp),
+        SUM(w.min_temp),
+        SUM(w.precipitation)
+    FROM
+        unnest(CAST(:station_ids AS varchar[]), CAST(:years AS integer[]))
+            AS g(station_id, year)
+    LEFT JOIN weather_data w ON
+        w.station_id = g.station_id AND
+        w.date >= make_date(g.year, 1, 1) AND
+        w.date < make_date(g.year + 1, 1, 1) AND
+        w.max_temp IS NOT NULL AND
+        w.min_temp IS NOT NULL AND
+        w.precipitation IS NOT NULL
+    GROUP BY
+        g.station_id, g.year
+    ON CONFLICT (station_id, year) DO UPDATE SET
+        row_count = EXCLUDED.row_count,
+        sum_max_temp = EXCLUDED.sum_max_temp,
+        sum_min_temp = EXCLUDED.sum_min_temp,
+        sum_precipitation = EXCLUDED.sum_precipitation
+    """
+)
+
+
+# Same refresh for WEATHER_STORAGE=compact: measurements are integer tenths
+# with NULL for missing values, summed exactly and scaled once per group.
+REFRESH_WEATHER_STATS_COMPACT_SQL = text(
+    """
+    INSERT INTO weather_stats_summary (
+        station_id, year, row_count, sum_max_temp, sum_min_temp, sum_precipitation
+    )
+    SELECT
+        g.station_id,
+        g.year,
+        COUNT(w.date),
+        CAST(SUM(w.max_temp) AS double precision) / 10,
+        CAST(SUM(w.min_temp) AS double precision) / 10,
+        CAST(SUM(w.precipitation) AS double precision) / 10
+    FROM
+        unnest(CAST(:station_ids AS varchar[]), CAST(:years AS integer[]))
+            AS g(station_id, year)
+    LEFT JOIN stations s ON s.station_id = g.station_id
+    LEFT JOIN weather_data_compact w ON
+        w.station_key = s.id AND
+        w.date >= make_date(g.year, 1, 1) AND
+        w.date < make_date(g.year + 1, 1, 1) AND
+        w.max_temp IS NOT NULL AND
+        w.min_temp IS NOT NULL AND
+        w.precipitation IS NOT NULL
+    GROUP BY
+        g.station_id, g.year
+    ON CONFLICT (station_id, year) DO UPDATE SET
+        row_count = EXCLUDED.row_count,
+        sum_max_temp = EXCLUDED.sum_max_temp,
+        sum_min_temp = EXCLUDED.sum_min_temp,
+        sum_precipitation = EXCLUDED.sum_precipitation
+    """
+)
+
+
+def touched_stats_groups(data: pd.DataFrame) -> List[Tuple[str, int]]:
+    """
+    Return the distinct (station_id, year) groups present in weather data.
+
+    Args:
+        data (pd.DataFrame): Transformed weather data with `station_id` and `date`.
+
+    Returns:
+        List[Tuple[str, int]]: Distinct groups; rows without a valid date are ignored.
+    """
+    groups = pd.DataFrame(
+        {"station_id": data["station_id"], "year": data["date"].dt.year}
+    ).dropna()
+    groups = groups.drop_duplicates()
+    return list(zip(groups["station_id"].tolist(), groups["year"].astype(int).tolist()))
+
+
+async def refresh_weather_stats(
+    session: AsyncSession, groups: List[Tuple[str, int]], storage: str = "float"
+) -> None:
+    """
+    Bring weather_stats_summary up to date for the given groups.
+
+    Runs inside the caller's transaction, so the summary commits together
+    with the weather rows that changed it. The groups stay locked against
+    concurrent refreshes until that transaction ends.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        groups (List[Tuple[str, int]]): (station_id, year) groups to recompute.
+        storage (str, optional): "float" to read weather_data, "compact" to read
+            weather_data_compact. Defaults to "float".
+    """
+    if not groups:
+        return
+    station_ids, years = (list(values) for values in zip(*groups))
+    sql = (
+        REFRESH_WEATHER_STATS_COMPACT_SQL
+        if storage == "compact"
+        else REFRESH_WEATHER_STATS_SQL
+    )
+    params = {"station_ids": station_ids, "years": years}
+    # Separate statement: the recompute must take its snapshot after the locks
+    await session.execute(LOCK_WEATHER_STATS_GROUPS_SQL, params)
+    await session.execute(sql, params)
+    logging.info(f"Refreshed weather stats for {len(groups)} station-year groups.")
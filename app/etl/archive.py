@@ -0,0 +1,56 @@
+from typing import BinaryIO, Iterator, Tuple
+import os
+import tarfile
+import zipfile
+
+ALLOWED_MEMBER_EXTENSIONS = {".txt"}
+
+
+def _is_data_member(name: str) -> bool:
+    """
+    Return True for archive members that look like station or yield files.
+    """
+    basename = os.path.basename(name)
+    return (
+        bool(basename)
+        and not basename.startswith(".")
+        and "__MACOSX" not in name
+        and os.path.splitext(basename)[1] in ALLOWED_MEMBER_EXTENSIONS
+    )
+
+
+def iter_archive_members(fileobj: BinaryIO) -> Iterator[Tuple[str, bytes]]:
+    """
+    Iterate over the data files of a zip or tar(.gz/.bz2/.xz) archive.
+
+    Members are read one at a time, in archive order, so only the member
+    being handed out is held in memory.
+
+    Args:
+        fileobj (BinaryIO): Seekable binary file object holding the archive.
+
+    Yields:
+        Tuple[str, bytes]: Base file name (used to derive the station ID) and content.
+
+    Raises:
+        ValueError: If the file is neither a zip nor a tar archive.
+    """
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not _is_data_member(info.filename):
+                    continue
+                yield os.path.basename(info.filename), archive.read(info)
+        return
+
+    fileobj.seek(0)
+    try:
+        archive = tarfile.open(fileobj=fileobj, mode="r:*")
+    except tarfile.TarError as e:
+        raise ValueError(f"Unsupported archive format: {e}")
+    with archive:
+        for member in archive:
+            if not member.isfile() or not _is_data_member(member.name):
+                continue
+            yield os.path.basename(member.name), archive.extractfile(member).read()
@@ -0,0 +1,250 @@
+"""
+Bulk-ingest a directory of station and yield files straight into the database.
+
+For initial loads and disaster recovery, without going through the HTTP API.
+Files are matched to WeatherETL, CropYieldETL or ArrowWeatherETL the same way
+as uploads, extracted and transformed in the ETL process pool, and loaded with
+a bounded number of database sessions from app.db.database. Files already in
+the ingestion manifest are skipped and loads ignore existing rows, so the
+command is safe to re-run after a failure.
+
+Usage:
+    python -m app.etl.bulk data
+    python -m app.etl.bulk data/wx_data --workers 8 --connections 4 --force
+"""
+
+from pathlib import Path
+from typing import Callable, List, Optional
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+from app.db.database import AsyncSessionLocal, engine
+from app.db.manifest import file_checksum, find_unchanged
+from app.etl.archive import ALLOWED_MEMBER_EXTENSIONS
+from app.etl.detect import detect_etl_class
+from app.etl.process_pool import shutdown_process_pool, start_process_pool
+from app.config import DB_POOL_SIZE
+
+# Columnar weather files are picked up next to the text files
+BULK_FILE_EXTENSIONS = ALLOWED_MEMBER_EXTENSIONS | {".parquet", ".arrow"}
+
+# Files loaded at the same time, each with its own session and connection
+DEFAULT_CONNECTIONS = min(4, DB_POOL_SIZE)
+
+
+def find_data_files(directory: Path) -> List[Path]:
+    """
+    Return the station and yield files under `directory`, recursively, sorted.
+
+    Hidden files and macOS resource forks are ignored.
+    """
+    return sorted(
+        path
+        for path in directory.rglob("*")
+        if path.is_file()
+        and path.suffix in BULK_FILE_EXTENSIONS
+        and not path.name.startswith(".")
+        and "__MACOSX" not in path.parts
+    )
+
+
+async def ingest_path(
+    path: Path,
+    session_factory: Callable = AsyncSessionLocal,
+    force: bool = False,
+    db_slots: Optional[asyncio.Semaphore] = None,
+) -> dict:
+    """
+    Run one file through the matching ETL class.
+
+    A session is opened (holding a slot of `db_slots`) to check the manifest
+    and prepare the ETL, and again to load the rows and record the file.
+    Extract and transform run in between without one, so a file that is
+    being parsed never keeps a database connection idle.
+
+    Args:
+        path (Path): File to ingest; its name gives the station ID.
+        session_factory (Callable, optional): Returns an AsyncSession context manager.
+        force (bool, optional): Ingest even if the manifest lists the content.
+        db_slots (asyncio.Semaphore, optional): Bounds the sessions open at once.
+
+    Returns:
+        dict: Per-file result with status and ETL feedback or error detail.
+    """
+    db_slots = db_slots or asyncio.Semaphore(1)
+    content = await asyncio.to_thread(path.read_bytes)
+    checksum = file_checksum(content)
+    try:
+        async with db_slots, session_factory() as session:
+            start_time = time.time()
+            unchanged = await find_unchanged(session, path.name, checksum, force)
+            if unchanged is not None:
+                return {
+                    "filename": path.name,
+                    "status": "unchanged",
+                    "details": unchanged,
+                }
+            try:
+                etl_class = detect_etl_class(content)
+            except ValueError as e:
+                return {"filename": path.name, "status": "error", "detail": str(e)}
+            etl = etl_class(session)
+            await etl.prepare(path.name)
+
+        parsed = await etl.parse(content, path.name)
+        del content
+
+        async with db_slots, session_factory() as session:
+            etl.session = session
+            feedback = await etl.load_parsed(
+                parsed, path.name, start_time, checksum=checksum
+            )
+    except Exception as e:
+        logging.error(f"Bulk ingestion failed for '{path}': {e}")
+        return {"filename": path.name, "status": "error", "detail": str(e)}
+    return {
+        "filename": path.name,
+        "status": "success",
+        "etl_class": etl_class.__name__,
+        "details": feedback,
+    }
+
+
+def format_result(result: dict) -> str:
+    """
+    One report line per file: status, rows, inserted rows, seconds and rows/sec.
+    """
+    if result["status"] == "error":
+        return f"error     {result['filename']}: {result['detail']}"
+    if result["status"] == "unchanged":
+        return f"unchanged {result['filename']}"
+    details = result["details"]
+    seconds = details["time_taken"]
+    rate = details["total_records"] / seconds if seconds else 0.0
+    return (
+        f"loaded    {result['filename']} ({result['etl_class']}): "
+        f"{details['total_records']} rows, {details['inserted_records']} inserted "
+        f"in {seconds:.2f}s ({rate:,.0f} rows/sec)"
+    )
+
+
+async def bulk_ingest(
+    directory: Path,
+    connections: int = DEFAULT_CONNECTIONS,
+    force: bool = False,
+    session_factory: Callable = AsyncSessionLocal,
+    report: Optional[Callable[[str], None]] = print,
+    max_in_flight: Optional[int] = None,
+) -> dict:
+    """
+    Ingest every station and yield file under `directory`.
+
+    At most `connections` sessions are open at once, and only for the manifest
+    check and the load; extract and transform run in the ETL process pool (when
+    started) without one, so other files load meanwhile. At most
+    `max_in_flight` files are read into memory at a time.
+
+    Args:
+        directory (Path): Directory to search, recursively.
+        connections (int, optional): Database sessions open at the same time.
+        force (bool, optional): Ingest files the manifest lists as unchanged.
+        session_factory (Callable, optional): Returns an AsyncSession context manager.
+        report (Callable, optional): Called with one line per finished file.
+        max_in_flight (int, optional): Files being ingested at the same time.
+            Defaults to twice `connections`.
+
+    Returns:
+        dict: Totals, elapsed seconds, files/sec, rows/sec and per-file results.
+    """
+    files = find_data_files(directory)
+    logging.info(f"Bulk ingesting {len(files)} files from {directory}.")
+    db_slots = asyncio.Semaphore(connections)
+    in_flight = asyncio.Semaphore(max_in_flight or 2 * connections)
+    start = time.perf_counter()
+
+    async def bounded_ingest(path: Path) -> dict:
+        async with in_flight:
+            result = await ingest_path(path, session_factory, force, db_slots)
+        if report:
+            report(format_result(result))
+        return result
+
+    results = await asyncio.gather(*(bounded_ingest(path) for path in files))
+    elapsed = time.perf_counter() - start
+
+    loaded = [result for result in results if result["status"] == "success"]
+    total_records = sum(result["details"]["total_records"] for result in loaded)
+    return {
+        "files": len(results),
+        "succeeded": len(loaded),
+        "unchanged": sum(result["status"] == "unchanged" for result in results),
+        "failed": sum(result["status"] == "error" for result in results),
+        "total_records": total_records,
+        "inserted_records": sum(
+            result["details"]["inserted_records"] for result in loaded
+        ),
+        "elapsed_seconds": round(elapsed, 2),
+        "files_per_second": round(len(results) / elapsed, 2) if elapsed else 0.0,
+        "rows_per_second": round(total_records / elapsed, 1) if elapsed else 0.0,
+        "results": results,
+    }
+
+
+async def main(
+    directory: Path, workers: int, connections: int, force: bool = False
+) -> dict:
+    start_process_pool(workers)
+    try:
+        # Enough files in flight to keep every worker and connection busy
+        return await bulk_ingest(
+            directory, connections, force, max_in_flight=connections + workers
+        )
+    finally:
+        shutdown_process_pool()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path, help="Directory of data files")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="ETL worker processes for extract/transform (default: CPU count)",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=DEFAULT_CONNECTIONS,
+        help=(
+            "Database connections open at the same time, used to check the "
+            f"manifest and to load (default: {DEFAULT_CONNECTIONS})"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ingest files even if the ingestion manifest lists them as unchanged",
+    )
+    args = parser.parse_args()
+    if not args.directory.is_dir():
+        parser.error(f"{args.directory} is not a directory")
+
+    summary = asyncio.run(
+        main(args.directory, args.workers, args.connections, args.force)
+    )
+    print(
+        f"\n{summary['files']} files: {summary['succeeded']} loaded, "
+        f"{summary['unchanged']} unchanged, {summary['failed']} failed. "
+        f"{summary['total_records']} rows ({summary['inserted_records']} inserted) "
+        f"in {summary['elapsed_seconds']}s: {summary['files_per_second']} files/sec, "
+        f"{summary['rows_per_second']:,.0f} rows/sec."
+    )
+    raise SystemExit(1 if summary["failed"] else 0)
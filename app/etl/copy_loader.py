@@ -0,0 +1,187 @@
+from typing import List, Sequence, Tuple
+import logging
+
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def get_driver_connection(session: AsyncSession):
+    """
+    Return the asyncpg connection behind an AsyncSession.
+
+    The session's transaction is started first, so anything run on the
+    returned connection takes part in the same transaction as the session.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+
+    Returns:
+        asyncpg.Connection: The underlying driver connection.
+    """
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    return raw_connection.driver_connection
+
+
+def dataframe_to_records(data: pd.DataFrame, columns: Sequence[str]) -> List[tuple]:
+    """
+    Convert DataFrame columns into tuples of native Python values for COPY.
+
+    Dates become `datetime.date`, numpy scalars become Python scalars and
+    NaN/NaT become None, which is what asyncpg's binary COPY encoder expects.
+
+    Args:
+        data (pd.DataFrame): Transformed data.
+        columns (Sequence[str]): Columns to export, in COPY order.
+
+    Returns:
+        List[tuple]: One tuple per DataFrame row.
+    """
+    values = []
+    for name in columns:
+        column = data[name]
+        if is_datetime64_any_dtype(column):
+            column = column.dt.date
+        values.append(column.astype(object).where(column.notna(), None).tolist())
+    return list(zip(*values))
+
+
+def dataframe_to_dicts(data: pd.DataFrame, columns: Sequence[str]) -> List[dict]:
+    """
+    Convert DataFrame columns into row dicts for INSERT ... VALUES.
+
+    Values are converted like dataframe_to_records, so both load modes store
+    missing values as NULL rather than NaN.
+
+    Args:
+        data (pd.DataFrame): Transformed data.
+        columns (Sequence[str]): Columns to export.
+
+    Returns:
+        List[dict]: One dict per DataFrame row.
+    """
+    columns = list(columns)
+    return [dict(zip(columns, row)) for row in dataframe_to_records(data, columns)]
+
+
+async def copy_to_staging(
+    session: AsyncSession,
+    table: Table,
+    data: pd.DataFrame,
+    columns: Sequence[str],
+) -> str:
+    """
+    COPY a DataFrame into a temporary staging table shaped like `table`.
+
+    The staging table is dropped on commit.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        table (Table): Target table the staging table is copied from.
+        data (pd.DataFrame): Transformed data.
+        columns (Sequence[str]): Columns to load.
+
+    Returns:
+        str: Name of the staging table.
+    """
+    staging_table = f"{table.name}_staging"
+
+    await session.execute(
+        text(
+            f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+            f"SELECT {', '.join(columns)} FROM {table.name} WITH NO DATA"
+        )
+    )
+
+    driver_connection = await get_driver_connection(session)
+    await driver_connection.copy_records_to_table(
+        staging_table,
+        records=dataframe_to_records(data, columns),
+        columns=list(columns),
+    )
+    logging.info(f"Copied {len(data)} rows into {staging_table}.")
+    return staging_table
+
+
+async def copy_merge(
+    session: AsyncSession,
+    table: Table,
+    data: pd.DataFrame,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+) -> int:
+    """
+    Bulk load a DataFrame with COPY into a staging table and merge it into `table`.
+
+    Rows that collide with `conflict_columns` are skipped. The caller owns the
+    transaction and is responsible for committing or rolling back.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        table (Table): Target table.
+        data (pd.DataFrame): Transformed data.
+        columns (Sequence[str]): Columns to load.
+        conflict_columns (Sequence[str]): Columns of the unique constraint.
+
+    Returns:
+        int: Number of rows actually inserted into `table`.
+    """
+    staging_table = await copy_to_staging(session, table, data, columns)
+    column_list = ", ".join(columns)
+    result = await session.execute(
+        text(
+            f"INSERT INTO {table.name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging_table} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+        )
+    )
+    return result.rowcount or 0
+
+
+async def copy_upsert(
+    session: AsyncSession,
+    table: Table,
+    data: pd.DataFrame,
+    columns: Sequence[str],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> Tuple[int, int]:
+    """
+    Like copy_merge, but overwrite existing rows whose `update_columns` changed.
+
+    Rows whose values are identical are left alone, so re-loading a file
+    rewrites (and bloats) nothing. New rows have xmax = 0, updated rows the
+    ID of the updating transaction, which tells the two apart.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session.
+        table (Table): Target table.
+        data (pd.DataFrame): Transformed data, unique on `conflict_columns`.
+        columns (Sequence[str]): Columns to load.
+        conflict_columns (Sequence[str]): Columns of the unique constraint.
+        update_columns (Sequence[str]): Columns compared and overwritten.
+
+    Returns:
+        Tuple[int, int]: Number of rows inserted and number of rows updated.
+    """
+    staging_table = await copy_to_staging(session, table, data, columns)
+    column_list = ", ".join(columns)
+    current = ", ".join(f"{table.name}.{name}" for name in update_columns)
+    excluded = ", ".join(f"EXCLUDED.{name}" for name in update_columns)
+    result = await session.execute(
+        text(
+            f"WITH merged AS ("
+            f"INSERT INTO {table.name} ({column_list}) "
+            f"SELECT {column_list} FROM {staging_table} "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET "
+            f"{', '.join(f'{name} = EXCLUDED.{name}' for name in update_columns)} "
+            f"WHERE ({current}) IS DISTINCT FROM ({excluded}) "
+            f"RETURNING (xmax = 0) AS inserted) "
+            f"SELECT COUNT(*) FILTER (WHERE inserted), "
+            f"COUNT(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+    )
+    inserted, updated = result.one()
+    return inserted or 0, updated or 0
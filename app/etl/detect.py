@@ -0,0 +1,43 @@
+import io
+import logging
+
+import pandas as pd
+
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.impl_crop_yield_etl import CropYieldETL
+from app.etl.impl_arrow_weather_etl import ArrowWeatherETL, is_columnar_file
+
+
+def detect_etl_class(sample: bytes):
+    """
+    Pick the ETL class for a file based on the number of tab-separated columns.
+
+    Parquet and Arrow IPC files are recognised by their leading magic bytes.
+
+    Args:
+        sample (bytes): The file content, or at least its first few lines.
+
+    Returns:
+        type: WeatherETL, CropYieldETL or ArrowWeatherETL.
+
+    Raises:
+        ValueError: If the sample cannot be parsed or has an unknown structure.
+    """
+    if is_columnar_file(sample):
+        return ArrowWeatherETL
+
+    try:
+        buffer = io.BytesIO(sample)
+        sample_df = pd.read_csv(buffer, sep="\t", header=None, nrows=5)
+        num_columns = len(sample_df.columns)
+    except Exception as e:
+        logging.error(f"Error reading the uploaded file: {e}")
+        raise ValueError("Invalid file format.")
+
+    # Determine which ETL class to use based on the number of columns
+    if num_columns == 4:
+        return WeatherETL
+    if num_columns == 2:
+        return CropYieldETL
+    logging.error("Unknown file structure based on column count.")
+    raise ValueError("Unknown file structure.")
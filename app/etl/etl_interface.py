@@ -1,12 +1,45 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Tuple
+import asyncio
+import logging
+import time
 import pandas as pd
+from app.etl.process_pool import run_in_process_pool
+from app.etl.streaming import iter_line_blocks
+from app.etl.instrumentation import (
+    PhaseHook,
+    measure_phase,
+    merge_phase_stats,
+    validate_profiler,
+)
+from app.utils.metrics import record_etl_failure, record_etl_run
+from app.db.manifest import record_manifest_entry
+from app.config import STREAM_MAX_PENDING_CHUNKS, ETL_TRACE_MEMORY
+
+# Called with the phase being entered ("extract", "transform", "load",
+# "done") and the progress so far (rows processed, per-phase timings).
+ProgressCallback = Callable[[str, dict], None]
 
 
 class ETLInterface(ABC):
     """
     Abstract base class for ETL processes.
+
+    run_etl and run_etl_stream measure every phase (wall and CPU time, and
+    optionally peak memory and a profile) and call the attached PhaseHooks,
+    so subclasses only implement extract, transform and load.
     """
 
+    # Instrumentation defaults; override per instance with instrument()
+    hooks: Tuple[PhaseHook, ...] = ()
+    trace_memory: bool = ETL_TRACE_MEMORY
+    profiler: Optional[str] = None
+    # "ignore" or "update" existing rows on load; loads in "update" mode add
+    # the rows they overwrote to updated_records
+    on_conflict: str = "ignore"
+    updated_records: int = 0
+
     @abstractmethod
     def extract(self, file_content: bytes, filename: str) -> pd.DataFrame:
         """
@@ -47,23 +80,400 @@ class ETLInterface(ABC):
         """
         pass
 
-    async def run_etl(self, file_content: bytes, filename: str) -> dict:
+    async def prepare(self, filename: str) -> None:
+        """
+        Look up whatever transform needs from the database, before extract runs.
+
+        Runs on the event loop with the session; the state it sets travels with
+        the ETL object into the process pool. Does nothing by default.
+
+        Args:
+            filename (str): Name of the uploaded file.
+        """
+        pass
+
+    def station_of(self, filename: str) -> Optional[str]:
+        """
+        Return the station a file belongs to, for the ingestion manifest.
+
+        Args:
+            filename (str): Name of the uploaded file.
+
+        Returns:
+            Optional[str]: The station ID, or None if the file is not per station.
+        """
+        return None
+
+    async def record_manifest(self, filename: str, checksum: str, feedback: dict):
+        """
+        Record a successfully ingested file version in the ingestion manifest.
+        """
+        await record_manifest_entry(
+            self.session,
+            filename,
+            checksum,
+            type(self).__name__,
+            self.station_of(filename),
+            feedback,
+        )
+
+    def instrument(
+        self,
+        hooks: Iterable[PhaseHook] = (),
+        trace_memory: Optional[bool] = None,
+        profiler: Optional[str] = None,
+    ) -> "ETLInterface":
+        """
+        Configure phase instrumentation for this ETL object.
+
+        Args:
+            hooks (Iterable[PhaseHook], optional): Hooks to add.
+            trace_memory (Optional[bool], optional): Record peak memory per phase
+                with tracemalloc. Defaults to the ETL_TRACE_MEMORY setting.
+            profiler (Optional[str], optional): "cprofile" or "pyinstrument" to
+                include a profile report per phase in the feedback.
+
+        Returns:
+            ETLInterface: self, for chaining.
+
+        Raises:
+            ValueError: If the profiler is unknown or not installed.
+        """
+        validate_profiler(profiler)
+        self.hooks = tuple(self.hooks) + tuple(hooks)
+        if trace_memory is not None:
+            self.trace_memory = trace_memory
+        self.profiler = profiler
+        return self
+
+    @contextmanager
+    def phase(self, name: str, phase_stats: Dict[str, dict]) -> Iterator[None]:
+        """
+        Run the hooks around one phase and record its measurements in `phase_stats`.
+
+        Args:
+            name (str): Phase name (extract, transform or load).
+            phase_stats (Dict[str, dict]): Measurements per phase, updated in place.
+        """
+        for hook in self.hooks:
+            hook.before_phase(self, name)
+        with measure_phase(self.trace_memory, self.profiler) as stats:
+            yield
+        phase_stats[name] = stats
+        for hook in self.hooks:
+            hook.after_phase(self, name, stats)
+
+    def extract_phase(
+        self, file_content: bytes, filename: str
+    ) -> Tuple[pd.DataFrame, Dict[str, dict]]:
+        """
+        Run the extract step and measure it. Runs inside the ETL process pool.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, dict]]: Raw data and phase measurements.
+        """
+        phase_stats: Dict[str, dict] = {}
+        with self.phase("extract", phase_stats):
+            raw_data = self.extract(file_content, filename)
+        return raw_data, phase_stats
+
+    def transform_phase(
+        self, raw_data: pd.DataFrame, phase_stats: Dict[str, dict]
+    ) -> Tuple[pd.DataFrame, Dict[str, dict]]:
+        """
+        Run the transform step and add its measurements to `phase_stats`.
+        Runs inside the ETL process pool.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, dict]]: Transformed data and phase
+            measurements.
+        """
+        with self.phase("transform", phase_stats):
+            transformed_data = self.transform(raw_data)
+        return transformed_data, phase_stats
+
+    def extract_transform(
+        self, file_content: bytes, filename: str
+    ) -> Tuple[int, pd.DataFrame, Dict[str, dict]]:
+        """
+        Run the CPU-bound extract and transform steps.
+
+        This runs inside the ETL process pool, so it must not touch the session.
+
+        Args:
+            file_content (bytes): Binary content of the uploaded file.
+            filename (str): Name of the uploaded file.
+
+        Returns:
+            Tuple[int, pd.DataFrame, Dict[str, dict]]: Number of raw records, the
+            transformed data and the measurements of the extract and transform phases.
+        """
+        raw_data, phase_stats = self.extract_phase(file_content, filename)
+        total_records = len(raw_data)
+        transformed_data, phase_stats = self.transform_phase(raw_data, phase_stats)
+        return total_records, transformed_data, phase_stats
+
+    async def parse(
+        self,
+        file_content: bytes,
+        filename: str,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Tuple[int, pd.DataFrame, Dict[str, dict]]:
+        """
+        Run extract and transform in the ETL process pool.
+
+        With a progress callback, extract and transform are separate pool calls
+        so the transform phase can be reported in between; otherwise they run
+        in one call and the raw data never leaves the worker.
+
+        Args:
+            file_content (bytes): Binary content of the uploaded file.
+            filename (str): Name of the uploaded file.
+            progress (ProgressCallback, optional): Notified when transform starts.
+
+        Returns:
+            Tuple[int, pd.DataFrame, Dict[str, dict]]: As extract_transform.
+        """
+        if progress is None:
+            return await run_in_process_pool(
+                self.extract_transform, file_content, filename
+            )
+        raw_data, phase_stats = await run_in_process_pool(
+            self.extract_phase, file_content, filename
+        )
+        total_records = len(raw_data)
+        progress(
+            "transform",
+            {
+                "rows_processed": total_records,
+                "phase_timings": phase_timings_of(phase_stats),
+            },
+        )
+        transformed_data, phase_stats = await run_in_process_pool(
+            self.transform_phase, raw_data, phase_stats
+        )
+        return total_records, transformed_data, phase_stats
+
+    async def run_etl(
+        self,
+        file_content: bytes,
+        filename: str,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ) -> dict:
         """
         Execute the full ETL process: Extract, Transform, Load.
 
+        Extract and transform run in the ETL process pool; only load runs on the event loop.
+        Each phase is measured and reported in the feedback, and to `progress` as
+        it starts.
+
         Args:
             file_content (bytes): Binary content of the uploaded file.
             filename (str): Name of the uploaded file.
+            progress (ProgressCallback, optional): Notified as the run moves between phases.
+            checksum (str, optional): SHA-256 of the content; when given, the file is
+                recorded in the ingestion manifest once it is loaded.
 
         Returns:
-            dict: Feedback about the ETL process (e.g., total records, inserted records, time taken).
+            dict: Feedback about the ETL process (e.g., total records, inserted records,
+            time taken, the seconds spent in each phase and the per-phase measurements).
         """
-        raw_data = self.extract(file_content, filename)
-        transformed_data = self.transform(raw_data)
-        inserted_records = await self.load(transformed_data)
+        start_time = time.time()
+
+        if progress:
+            progress("extract", {"rows_processed": 0, "phase_timings": {}})
+        try:
+            await self.prepare(filename)
+            parsed = await self.parse(file_content, filename, progress)
+        except Exception:
+            record_etl_failure(type(self).__name__)
+            raise
+        return await self.load_parsed(parsed, filename, start_time, progress, checksum)
 
+    async def load_parsed(
+        self,
+        parsed: Tuple[int, pd.DataFrame, Dict[str, dict]],
+        filename: str,
+        start_time: float,
+        progress: Optional[ProgressCallback] = None,
+        checksum: Optional[str] = None,
+    ) -> dict:
+        """
+        Load the output of parse() and report on the run: the second half of run_etl.
+
+        Callers that must not hold a database connection while the file is
+        parsed call prepare and parse first, then this with a live session.
+
+        Args:
+            parsed (Tuple[int, pd.DataFrame, Dict[str, dict]]): Result of parse().
+            filename (str): Name of the uploaded file.
+            start_time (float): time.time() when the run started, for time_taken.
+            progress (ProgressCallback, optional): Notified as load starts and ends.
+            checksum (str, optional): SHA-256 of the content; when given, the file is
+                recorded in the ingestion manifest once it is loaded.
+
+        Returns:
+            dict: Feedback about the ETL process, as run_etl.
+        """
+        total_records, transformed_data, phase_stats = parsed
+        try:
+            if progress:
+                progress(
+                    "load",
+                    {
+                        "rows_processed": total_records,
+                        "phase_timings": phase_timings_of(phase_stats),
+                    },
+                )
+            self.updated_records = 0
+            with self.phase("load", phase_stats):
+                inserted_records = await self.load(transformed_data)
+        except Exception:
+            record_etl_failure(type(self).__name__)
+            raise
+
+        phase_timings = phase_timings_of(phase_stats)
         feedback = {
-            "total_records": len(raw_data),
+            "total_records": total_records,
             "inserted_records": inserted_records,
+            "time_taken": round(time.time() - start_time, 2),
+            "phase_timings": phase_timings,
+            "phase_stats": phase_stats,
         }
+        if "covered_records_skipped" in transformed_data.attrs:
+            feedback["covered_records_skipped"] = transformed_data.attrs[
+                "covered_records_skipped"
+            ]
+        feedback.update(self.conflict_feedback(len(transformed_data), inserted_records))
+        if progress:
+            progress(
+                "done",
+                {"rows_processed": total_records, "phase_timings": phase_timings},
+            )
+        record_etl_run(type(self).__name__, feedback)
+        if checksum:
+            await self.record_manifest(filename, checksum, feedback)
+        logging.info(f"ETL process completed: {feedback}")
         return feedback
+
+    async def run_etl_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        max_pending: int = STREAM_MAX_PENDING_CHUNKS,
+        checksum: Optional[str] = None,
+    ) -> dict:
+        """
+        Execute the ETL process over a stream of byte chunks.
+
+        Chunks are regrouped into whole-line blocks, each block is extracted and
+        transformed in the ETL process pool and loaded as soon as it is ready,
+        while the next block is being parsed. At most `max_pending` parsed blocks
+        wait for the loader, so memory is bounded by the chunk size rather than
+        the file size. Duplicates that span blocks are skipped by the database.
+
+        Args:
+            chunks (AsyncIterator[bytes]): Raw byte chunks of the uploaded file.
+            filename (str): Name of the uploaded file.
+            max_pending (int, optional): Parsed blocks allowed to wait for the loader.
+            checksum (str, optional): SHA-256 of the whole file; when given, the file
+                is recorded in the ingestion manifest once it is loaded.
+
+        Returns:
+            dict: Feedback about the ETL process, including the number of chunks.
+        """
+        start_time = time.time()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+
+        async def produce():
+            try:
+                async for block in iter_line_blocks(chunks):
+                    parsed = await run_in_process_pool(
+                        self.extract_transform, block, filename
+                    )
+                    await queue.put(parsed)
+            finally:
+                await queue.put(None)
+
+        await self.prepare(filename)
+        producer = asyncio.create_task(produce())
+        total_records = 0
+        loaded_records = 0
+        inserted_records = 0
+        covered_records_skipped = None
+        self.updated_records = 0
+        block_stats = []
+        try:
+            while True:
+                parsed = await queue.get()
+                if parsed is None:
+                    break
+                block_records, transformed_data, phase_stats = parsed
+                total_records += block_records
+                loaded_records += len(transformed_data)
+                if "covered_records_skipped" in transformed_data.attrs:
+                    covered_records_skipped = (
+                        covered_records_skipped or 0
+                    ) + transformed_data.attrs["covered_records_skipped"]
+                with self.phase("load", phase_stats):
+                    inserted_records += await self.load(transformed_data)
+                block_stats.append(phase_stats)
+            await producer
+        except BaseException:
+            producer.cancel()
+            record_etl_failure(type(self).__name__)
+            raise
+
+        phase_stats = merge_phase_stats(block_stats)
+        feedback = {
+            "total_records": total_records,
+            "inserted_records": inserted_records,
+            "chunks": len(block_stats),
+            "time_taken": round(time.time() - start_time, 2),
+            "phase_timings": phase_timings_of(phase_stats),
+            "phase_stats": phase_stats,
+        }
+        if covered_records_skipped is not None:
+            feedback["covered_records_skipped"] = covered_records_skipped
+        feedback.update(self.conflict_feedback(loaded_records, inserted_records))
+        record_etl_run(type(self).__name__, feedback)
+        if checksum:
+            await self.record_manifest(filename, checksum, feedback)
+        logging.info(f"Streaming ETL process completed: {feedback}")
+        return feedback
+
+    def conflict_feedback(self, loaded_records: int, inserted_records: int) -> dict:
+        """
+        Return the updated and unchanged row counts of an "update" mode load.
+
+        Args:
+            loaded_records (int): Transformed rows sent to the database.
+            inserted_records (int): Rows that were new.
+
+        Returns:
+            dict: Empty in "ignore" mode, where existing rows are never updated.
+        """
+        if self.on_conflict != "update":
+            return {}
+        return {
+            "updated_records": self.updated_records,
+            "unchanged_records": loaded_records
+            - inserted_records
+            - self.updated_records,
+        }
+
+    def __getstate__(self) -> dict:
+        """
+        Drop the database session when the ETL object is sent to a worker process.
+        """
+        state = self.__dict__.copy()
+        state["session"] = None
+        return state
+
+
+def phase_timings_of(phase_stats: Dict[str, dict]) -> Dict[str, float]:
+    """
+    Return the wall-clock seconds of each phase.
+    """
+    return {phase: stats["wall_seconds"] for phase, stats in phase_stats.items()}
@@ -3,21 +3,40 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert
 import logging
 from app.etl.etl_interface import ETLInterface
+from app.etl.copy_loader import copy_merge, copy_upsert
+from app.etl.upsert import values_upsert
+from app.db.data_versions import bump_data_versions
 from app.db.schema import CropYieldData
-import time
+from app.utils.dataset_version import dataset_version
+from app.config import ETL_LOAD_MODE, ETL_ON_CONFLICT
+
+CROP_YIELD_COLUMNS = ["station_id", "year", "yield_value"]
 
 
 class CropYieldETL(ETLInterface):
-    def __init__(self, session: AsyncSession, batch_size: int = 5000):
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: int = 5000,
+        load_mode: str = ETL_LOAD_MODE,
+        on_conflict: str = ETL_ON_CONFLICT,
+    ):
         """
         Initialize CropYieldETL with the database session and batch size.
 
         Args:
             session (AsyncSession): SQLAlchemy asynchronous session.
             batch_size (int, optional): Number of records per batch. Defaults to 5000.
+            load_mode (str, optional): "copy" for COPY into a staging table, "values"
+                for batched INSERT ... VALUES. Defaults to the ETL_LOAD_MODE setting.
+            on_conflict (str, optional): "ignore" to keep stored rows, "update" to
+                overwrite stored yields that changed. Defaults to the ETL_ON_CONFLICT
+                setting.
         """
         self.session = session
         self.batch_size = batch_size
+        self.load_mode = load_mode
+        self.on_conflict = on_conflict
 
     def extract(self, file_content: bytes, filename: str) -> pd.DataFrame:
         """
@@ -74,6 +93,68 @@ class CropYieldETL(ETLInterface):
         return data
 
     async def load(self, data: pd.DataFrame) -> int:
+        """
+        Load transformed crop yield data into the database.
+
+        Args:
+            data (pd.DataFrame): Transformed crop yield data.
+
+        Returns:
+            int: The number of rows successfully inserted.
+        """
+        if self.load_mode == "copy":
+            return await self._load_copy(data)
+        return await self._load_values(data)
+
+    async def _load_copy(self, data: pd.DataFrame) -> int:
+        """
+        Load crop yield data with COPY into a staging table and a single merge statement.
+
+        Args:
+            data (pd.DataFrame): Transformed crop yield data.
+
+        Returns:
+            int: The number of rows successfully inserted.
+        """
+        logging.info(f"Copying {len(data)} crop yield rows into the database.")
+        try:
+            updated_rows = 0
+            if self.on_conflict == "update":
+                inserted_rows, updated_rows = await copy_upsert(
+                    self.session,
+                    CropYieldData.__table__,
+                    data,
+                    columns=CROP_YIELD_COLUMNS,
+                    conflict_columns=["station_id", "year"],
+                    update_columns=["yield_value"],
+                )
+            else:
+                inserted_rows = await copy_merge(
+                    self.session,
+                    CropYieldData.__table__,
+                    data,
+                    columns=CROP_YIELD_COLUMNS,
+                    conflict_columns=["station_id", "year"],
+                )
+            if inserted_rows or updated_rows:
+                await bump_data_versions(self.session, data["station_id"].unique())
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logging.error(f"Error copying crop yield data: {e}")
+            raise e
+
+        if inserted_rows or updated_rows:
+            dataset_version.expire()
+
+        self.updated_records += updated_rows
+        logging.info(
+            f"Crop yield data loaded successfully. Total inserted: {inserted_rows}, "
+            f"updated: {updated_rows}."
+        )
+        return inserted_rows
+
+    async def _load_values(self, data: pd.DataFrame) -> int:
         """
         Load transformed crop yield data into the database using batch inserts with upsert.
 
@@ -96,15 +177,41 @@ class CropYieldETL(ETLInterface):
                 f"Inserting crop yield rows {start + 1} to {min(end, total_rows)} into crop_yield_data."
             )
 
-            stmt = insert(CropYieldData).values(batch)
+            if self.on_conflict == "update":
+                stmt = values_upsert(
+                    CropYieldData.__table__,
+                    batch,
+                    ["station_id", "year"],
+                    ["yield_value"],
+                )
+            else:
+                stmt = insert(CropYieldData).values(batch)
 
-            # Define the upsert behavior: do nothing on conflict
-            stmt = stmt.on_conflict_do_nothing(index_elements=["station_id", "year"])
+                # Define the upsert behavior: do nothing on conflict
+                stmt = stmt.on_conflict_do_nothing(
+                    index_elements=["station_id", "year"]
+                )
 
             try:
                 result = await self.session.execute(stmt)
+                if self.on_conflict == "update":
+                    # One row per inserted or updated row, True if inserted
+                    flags = result.scalars().all()
+                    batch_inserted = sum(flags)
+                    batch_updated = len(flags) - batch_inserted
+                else:
+                    batch_inserted = result.rowcount or 0
+                    batch_updated = 0
+                changed = bool(result.rowcount or batch_updated)
+                if changed:
+                    await bump_data_versions(
+                        self.session, data["station_id"].iloc[start:end].unique()
+                    )
                 await self.session.commit()
-                inserted_rows += result.rowcount or len(batch)
+                inserted_rows += batch_inserted
+                self.updated_records += batch_updated
+                if changed:
+                    dataset_version.expire()
                 logging.info(
                     f"Inserted crop yield rows {start + 1} to {min(end, total_rows)} successfully."
                 )
@@ -117,36 +224,3 @@ class CropYieldETL(ETLInterface):
 
         logging.info("Crop yield data loaded successfully.")
         return inserted_rows
-
-    async def run_etl(self, file_content: bytes, filename: str) -> dict:
-        """
-        Run the ETL process: Extract, Transform, and Load.
-
-        Args:
-            file_content (bytes): Binary content of the uploaded file.
-            filename (str): Name of the uploaded file.
-
-        Returns:
-            dict: Feedback about the ETL process (e.g., total records, inserted records, time taken).
-        """
-        start_time = time.time()
-
-        # Extract
-        raw_data = self.extract(file_content, filename)
-
-        # Transform
-        transformed_data = self.transform(raw_data)
-
-        # Load
-        inserted_rows = await self.load(transformed_data)
-
-        # Calculate total time taken
-        total_time = time.time() - start_time
-
-        feedback = {
-            "total_records": len(raw_data),
-            "inserted_records": inserted_rows,
-            "time_taken": round(total_time, 2),  # Round to 2 decimal places
-        }
-        logging.info(f"ETL process completed: {feedback}")
-        return feedback
@@ -1,23 +1,103 @@
-import time  # Added for tracking time
+from typing import Optional
 import pandas as pd
+import pyarrow as pa
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.dialects.postgresql import insert
 import logging
 from app.etl.etl_interface import ETLInterface
-from app.db.schema import WeatherData
+from app.etl.copy_loader import copy_merge, copy_upsert, dataframe_to_dicts
+from app.etl.upsert import values_upsert
+from app.db.coverage import DateCoverage, fetch_date_coverage
+from app.db.data_versions import bump_data_versions
+from app.db.schema import WeatherData, WeatherDataCompact
+from app.db.stations import get_station_keys
+from app.db.weather_stats import refresh_weather_stats, touched_stats_groups
+from app.utils.cache import invalidate_station_caches
+from app.utils.dataset_version import dataset_version
+from app.etl.wx_parser import (
+    float_to_tenths,
+    read_wx_columns,
+    tenths_to_float,
+    yyyymmdd_to_datetime,
+)
+from app.config import (
+    ETL_INCREMENTAL,
+    ETL_LOAD_MODE,
+    ETL_ON_CONFLICT,
+    WEATHER_PARSER,
+    WEATHER_STORAGE,
+)
+
+WEATHER_COLUMNS = ["station_id", "date", "max_temp", "min_temp", "precipitation"]
+COMPACT_WEATHER_COLUMNS = [
+    "station_key",
+    "date",
+    "max_temp",
+    "min_temp",
+    "precipitation",
+]
+MEASUREMENT_COLUMNS = ["max_temp", "min_temp", "precipitation"]
 
 
 class WeatherETL(ETLInterface):
-    def __init__(self, session: AsyncSession, batch_size: int = 5000):
+    def __init__(
+        self,
+        session: AsyncSession,
+        batch_size: int = 5000,
+        load_mode: str = ETL_LOAD_MODE,
+        parser: str = WEATHER_PARSER,
+        storage: str = WEATHER_STORAGE,
+        incremental: bool = ETL_INCREMENTAL,
+        on_conflict: str = ETL_ON_CONFLICT,
+    ):
         """
         Initialize WeatherETL with the database session and batch size.
 
         Args:
             session (AsyncSession): SQLAlchemy asynchronous session.
             batch_size (int, optional): Number of records per batch. Defaults to 5000.
+            load_mode (str, optional): "copy" for COPY into a staging table, "values"
+                for batched INSERT ... VALUES. Defaults to the ETL_LOAD_MODE setting.
+            parser (str, optional): "arrow" for the vectorized integer parser, "pandas"
+                for the read_csv parser. Defaults to the WEATHER_PARSER setting.
+            storage (str, optional): "float" for weather_data, "compact" for
+                weather_data_compact. Defaults to the WEATHER_STORAGE setting.
+            incremental (bool, optional): Drop rows for dates already stored for the
+                station during transform. Defaults to the ETL_INCREMENTAL setting.
+            on_conflict (str, optional): "ignore" to keep stored rows, "update" to
+                overwrite stored rows whose measurements changed. Defaults to the
+                ETL_ON_CONFLICT setting.
         """
         self.session = session
         self.batch_size = batch_size
+        self.load_mode = load_mode
+        self.parser = parser
+        self.storage = storage
+        self.incremental = incremental
+        self.on_conflict = on_conflict
+        # Stored dates of the station being ingested, set by prepare()
+        self.coverage: Optional[DateCoverage] = None
+
+    def station_of(self, filename: str) -> str:
+        """
+        Return the station of a weather file: its name without extension.
+        """
+        return filename.split(".")[0]
+
+    async def prepare(self, filename: str) -> None:
+        """
+        In incremental mode, look up the dates already stored for the file's station.
+        """
+        self.coverage = None
+        if self.incremental:
+            station_id = self.station_of(filename)
+            self.coverage = await fetch_date_coverage(
+                self.session, station_id, self.storage
+            )
+            logging.info(
+                f"Station {station_id} has data up to {self.coverage.max_date} "
+                f"with {len(self.coverage.gaps())} gaps."
+            )
 
     def extract(self, file_content: bytes, filename: str) -> pd.DataFrame:
         """
@@ -31,8 +111,29 @@ class WeatherETL(ETLInterface):
             pd.DataFrame: Raw weather data.
         """
         logging.info(f"Extracting weather data from file: {filename}")
+        df = None
+        if self.parser == "arrow":
+            try:
+                df = read_wx_columns(file_content)
+            except pa.ArrowInvalid as e:
+                logging.warning(
+                    f"Falling back to the pandas parser for {filename}: {e}"
+                )
+        if df is None:
+            df = self._read_csv(file_content)
+        df["station_id"] = filename.split(".")[
+            0
+        ]  # Assuming station_id is the filename without extension
+        logging.info(f"Extracted {len(df)} records from weather data.")
+        return df
+
+    @staticmethod
+    def _read_csv(file_content: bytes) -> pd.DataFrame:
+        """
+        Parse weather data with pandas, as strings and floats with NaN for -9999.
+        """
         buffer = pd.io.common.BytesIO(file_content)
-        df = pd.read_csv(
+        return pd.read_csv(
             buffer,
             sep="\t",
             header=None,
@@ -45,11 +146,6 @@ class WeatherETL(ETLInterface):
             },
             na_values=-9999,
         )
-        df["station_id"] = filename.split(".")[
-            0
-        ]  # Assuming station_id is the filename without extension
-        logging.info(f"Extracted {len(df)} records from weather data.")
-        return df
 
     def transform(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -62,6 +158,13 @@ class WeatherETL(ETLInterface):
             pd.DataFrame: Cleaned weather data without duplicates.
         """
         logging.info("Transforming weather data.")
+        if pd.api.types.is_integer_dtype(data["date"]):
+            data = self._skip_covered(self._transform_columns(data))
+            logging.info(
+                f"Transformed weather data contains {len(data)} records after cleaning."
+            )
+            return data
+
         # Convert 'date' column to datetime
         data["date"] = pd.to_datetime(data["date"], format="%Y%m%d", errors="coerce")
 
@@ -76,12 +179,161 @@ class WeatherETL(ETLInterface):
         # Remove duplicate records based on 'station_id' and 'date'
         data.drop_duplicates(subset=["station_id", "date"], inplace=True)
 
+        data = self._skip_covered(data)
         logging.info(
             f"Transformed weather data contains {len(data)} records after cleaning."
         )
         return data
 
+    @staticmethod
+    def _transform_columns(data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform the int32 columns of read_wx_columns.
+
+        Produces the same frame, index and dtypes as the string/float path without
+        parsing date strings or copying the columns more than once.
+        """
+        stations = data["station_id"]
+        result = pd.DataFrame(
+            {
+                "date": yyyymmdd_to_datetime(data["date"].to_numpy()),
+                "max_temp": tenths_to_float(data["max_temp"].to_numpy()),
+                "min_temp": tenths_to_float(data["min_temp"].to_numpy()),
+                "precipitation": tenths_to_float(data["precipitation"].to_numpy()),
+                "station_id": stations,
+            },
+            index=data.index,
+        )
+        values = stations.to_numpy()
+        if len(values) and isinstance(values[0], str) and (values == values[0]).all():
+            # One station per file: duplicates only need comparing on date
+            duplicated = result["date"].duplicated()
+        else:
+            result.dropna(how="all", inplace=True)
+            duplicated = result.duplicated(subset=["station_id", "date"])
+        return result[~duplicated.to_numpy()]
+
+    def _skip_covered(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop rows whose station and date are already stored, per self.coverage.
+
+        The number of dropped rows is kept in data.attrs["covered_records_skipped"]
+        so the feedback can report it.
+        """
+        if self.coverage is None:
+            return data
+        covered = self.coverage.covers(data["date"].to_numpy()) & (
+            data["station_id"].to_numpy() == self.coverage.station_id
+        )
+        skipped = int(covered.sum())
+        if skipped:
+            data = data[~covered]
+        data.attrs["covered_records_skipped"] = skipped
+        return data
+
     async def load(self, data: pd.DataFrame) -> int:
+        """
+        Load transformed weather data into the database.
+
+        Args:
+            data (pd.DataFrame): Transformed weather data.
+
+        Returns:
+            int: Total number of records successfully inserted.
+        """
+        if data.empty:
+            # e.g. every row was already stored (incremental mode)
+            logging.info("No weather rows to load.")
+            return 0
+        if self.load_mode == "copy":
+            return await self._load_copy(data)
+        return await self._load_values(data)
+
+    async def _storage_rows(self, data: pd.DataFrame):
+        """
+        Return the target table, its columns, its key and the rows to write.
+
+        With compact storage, stations are replaced by their keys (registering new
+        stations in the current transaction) and measurements by integer tenths.
+
+        Args:
+            data (pd.DataFrame): Transformed weather data.
+
+        Returns:
+            tuple: (table, columns, conflict columns, rows DataFrame).
+        """
+        if self.storage != "compact":
+            return WeatherData.__table__, WEATHER_COLUMNS, ["station_id", "date"], data
+        keys = await get_station_keys(self.session, data["station_id"].unique())
+        rows = pd.DataFrame(
+            {
+                "station_key": data["station_id"].map(keys),
+                "date": data["date"],
+                **{name: float_to_tenths(data[name]) for name in MEASUREMENT_COLUMNS},
+            }
+        )
+        return (
+            WeatherDataCompact.__table__,
+            COMPACT_WEATHER_COLUMNS,
+            ["station_key", "date"],
+            rows,
+        )
+
+    async def _load_copy(self, data: pd.DataFrame) -> int:
+        """
+        Load weather data with COPY into a staging table and a single merge statement.
+
+        Args:
+            data (pd.DataFrame): Transformed weather data.
+
+        Returns:
+            int: Total number of records successfully inserted.
+        """
+        logging.info(f"Copying {len(data)} weather rows into the database.")
+        try:
+            table, columns, conflict_columns, rows = await self._storage_rows(data)
+            total_updated = 0
+            if self.on_conflict == "update":
+                total_inserted, total_updated = await copy_upsert(
+                    self.session,
+                    table,
+                    rows,
+                    columns=columns,
+                    conflict_columns=conflict_columns,
+                    update_columns=MEASUREMENT_COLUMNS,
+                )
+            else:
+                total_inserted = await copy_merge(
+                    self.session,
+                    table,
+                    rows,
+                    columns=columns,
+                    conflict_columns=conflict_columns,
+                )
+            station_ids = data["station_id"].unique()
+            if total_inserted or total_updated:
+                await refresh_weather_stats(
+                    self.session, touched_stats_groups(data), self.storage
+                )
+                await bump_data_versions(self.session, station_ids)
+            await self.session.commit()
+        except Exception as e:
+            await self.session.rollback()
+            logging.error(f"Error copying weather data: {e}")
+            raise e
+
+        if total_inserted or total_updated:
+            invalidate_station_caches(station_ids)
+            dataset_version.expire()
+
+        self.updated_records += total_updated
+        logging.info(
+            f"Weather data loaded successfully. Total inserted: {total_inserted}, "
+            f"updated: {total_updated}."
+        )
+        return total_inserted
+
+    async def _load_values(self, data: pd.DataFrame) -> int:
         """
         Load transformed weather data into the database using batch inserts with upsert.
 
@@ -92,8 +344,15 @@ class WeatherETL(ETLInterface):
             int: Total number of records successfully inserted.
         """
         logging.info("Loading weather data into the database.")
-        rows_to_insert = data.to_dict(orient="records")
+        try:
+            table, columns, conflict_columns, rows = await self._storage_rows(data)
+        except Exception as e:
+            await self.session.rollback()
+            logging.error(f"Error preparing weather rows: {e}")
+            raise e
+        rows_to_insert = dataframe_to_dicts(rows, columns)
         total_inserted = 0
+        total_updated = 0
         total_rows = len(rows_to_insert)
         logging.info(f"Total rows to insert: {total_rows}")
 
@@ -101,19 +360,45 @@ class WeatherETL(ETLInterface):
             end = start + self.batch_size
             batch = rows_to_insert[start:end]
             logging.info(
-                f"Inserting rows {start + 1} to {min(end, total_rows)} into weather_data."
+                f"Inserting rows {start + 1} to {min(end, total_rows)} into {table.name}."
             )
 
-            stmt = insert(WeatherData).values(batch)
+            if self.on_conflict == "update":
+                stmt = values_upsert(
+                    table, batch, conflict_columns, MEASUREMENT_COLUMNS
+                )
+            else:
+                stmt = insert(table).values(batch)
 
-            # Define the upsert behavior: do nothing on conflict
-            stmt = stmt.on_conflict_do_nothing(index_elements=["station_id", "date"])
+                # Define the upsert behavior: do nothing on conflict
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
 
             try:
                 result = await self.session.execute(stmt)
-                # Use rowcount to track successful inserts
-                total_inserted += result.rowcount or 0
+                if self.on_conflict == "update":
+                    # One row per inserted or updated row, True if inserted
+                    flags = result.scalars().all()
+                    batch_inserted = sum(flags)
+                    batch_updated = len(flags) - batch_inserted
+                else:
+                    # Use rowcount to track successful inserts
+                    batch_inserted = result.rowcount or 0
+                    batch_updated = 0
+                total_inserted += batch_inserted
+                total_updated += batch_updated
+                self.updated_records += batch_updated
+                station_ids = data["station_id"].iloc[start:end].unique()
+                if batch_inserted or batch_updated:
+                    await refresh_weather_stats(
+                        self.session,
+                        touched_stats_groups(data.iloc[start:end]),
+                        self.storage,
+                    )
+                    await bump_data_versions(self.session, station_ids)
                 await self.session.commit()
+                if batch_inserted or batch_updated:
+                    invalidate_station_caches(station_ids)
+                    dataset_version.expire()
                 logging.info(
                     f"Inserted rows {start + 1} to {min(end, total_rows)} successfully."
                 )
@@ -125,40 +410,7 @@ class WeatherETL(ETLInterface):
                 raise e
 
         logging.info(
-            f"Weather data loaded successfully. Total inserted: {total_inserted}."
+            f"Weather data loaded successfully. Total inserted: {total_inserted}, "
+            f"updated: {total_updated}."
         )
         return total_inserted
-
-    async def run_etl(self, file_content: bytes, filename: str) -> dict:
-        """
-        Run the ETL process: extract, transform, and load weather data.
-
-        Args:
-            file_content (bytes): Binary content of the uploaded file.
-            filename (str): Name of the uploaded file.
-
-        Returns:
-            dict: Summary of the ETL process, including total records, inserted records, and time taken.
-        """
-        start_time = time.time()  # Start tracking time
-
-        # Extract
-        raw_data = self.extract(file_content, filename)
-        total_records = len(raw_data)
-
-        # Transform
-        transformed_data = self.transform(raw_data)
-
-        # Load
-        inserted_records = await self.load(transformed_data)
-
-        # Calculate time taken
-        end_time = time.time()
-        time_taken = round(end_time - start_time, 2)
-
-        # Return summary
-        return {
-            "total_records": total_records,
-            "inserted_records": inserted_records,
-            "time_taken": time_taken,
-        }
@@ -0,0 +1,180 @@
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Optional
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+
+from app.config import ETL_PROFILE_TOP_N
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# tracemalloc is global to the process, and phases of concurrent uploads and
+# jobs overlap on the event loop: the first traced phase starts tracing and
+# resets the peak, and only the last one to finish stops it.
+_traced_phases = 0
+_started_tracing = False
+_tracing_lock = threading.Lock()
+
+
+class PhaseHook:
+    """
+    Callbacks around each ETL phase (extract, transform, load).
+
+    Subclass and override what you need, then attach with ETLInterface.instrument().
+    Hooks run in the process that runs the phase: extract and transform run in
+    the ETL process pool, so hooks are pickled along with the ETL object and
+    must not rely on state of the API process.
+    """
+
+    def before_phase(self, etl, phase: str) -> None:
+        """
+        Called when a phase starts.
+        """
+
+    def after_phase(self, etl, phase: str, stats: dict) -> None:
+        """
+        Called when a phase finished successfully, with its measurements.
+        """
+
+
+def validate_profiler(profiler: Optional[str]) -> None:
+    """
+    Check that `profiler` is None or a known profiler that is installed.
+
+    Raises:
+        ValueError: If the profiler is unknown or not installed.
+    """
+    if profiler is None:
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler '{profiler}', expected one of {PROFILERS}.")
+    if profiler == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            raise ValueError("pyinstrument is not installed.")
+
+
+def _start_profiler(profiler: Optional[str]):
+    if profiler is None:
+        return None
+    if profiler == "cprofile":
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+    validate_profiler(profiler)
+    from pyinstrument import Profiler
+
+    profile = Profiler(async_mode="enabled")
+    profile.start()
+    return profile
+
+
+def _stop_profiler(profile) -> str:
+    if isinstance(profile, cProfile.Profile):
+        profile.disable()
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(
+            ETL_PROFILE_TOP_N
+        )
+        return output.getvalue()
+    profile.stop()
+    return profile.output_text()
+
+
+@contextmanager
+def measure_phase(
+    trace_memory: bool = False, profiler: Optional[str] = None
+) -> Iterator[dict]:
+    """
+    Measure the code run inside the block.
+
+    The yielded dict is filled in when the block exits without an error with
+    wall_seconds and cpu_seconds, plus peak_memory_bytes (tracemalloc) when
+    `trace_memory` is set and a text report when `profiler` is set. CPU time,
+    memory and profiles cover the whole process, so phases that run on the
+    event loop also see concurrent requests; the memory peak of overlapping
+    traced phases is the process peak since the earliest of them started.
+
+    Args:
+        trace_memory (bool, optional): Record the peak of traced allocations.
+        profiler (Optional[str], optional): "cprofile" or "pyinstrument".
+
+    Yields:
+        dict: The phase measurements.
+    """
+    stats: dict = {}
+    if trace_memory:
+        memory_start = _begin_memory_trace()
+    profile = _start_profiler(profiler)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield stats
+        stats["wall_seconds"] = round(time.perf_counter() - wall_start, 3)
+        stats["cpu_seconds"] = round(time.process_time() - cpu_start, 3)
+        if trace_memory:
+            stats["peak_memory_bytes"] = max(
+                0, tracemalloc.get_traced_memory()[1] - memory_start
+            )
+    finally:
+        if profile is not None:
+            report = _stop_profiler(profile)
+            if "wall_seconds" in stats:
+                stats["profile"] = report
+        if trace_memory:
+            _end_memory_trace()
+
+
+def _begin_memory_trace() -> int:
+    """
+    Register a traced phase and return the traced memory it starts from.
+    """
+    global _traced_phases, _started_tracing
+    with _tracing_lock:
+        if _traced_phases == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _traced_phases += 1
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _end_memory_trace() -> None:
+    """
+    Unregister a traced phase, stopping tracing after the last one if it was
+    started here.
+    """
+    global _traced_phases, _started_tracing
+    with _tracing_lock:
+        _traced_phases -= 1
+        if _traced_phases == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+def merge_phase_stats(blocks: Iterable[Dict[str, dict]]) -> Dict[str, dict]:
+    """
+    Combine the per-phase stats of several blocks of one streaming run.
+
+    Times are summed and the memory peak is the largest block peak.
+    Profiles are not kept.
+    """
+    merged: Dict[str, dict] = {}
+    for block in blocks:
+        for phase, stats in block.items():
+            total = merged.setdefault(phase, {"wall_seconds": 0.0, "cpu_seconds": 0.0})
+            total["wall_seconds"] += stats["wall_seconds"]
+            total["cpu_seconds"] += stats["cpu_seconds"]
+            if "peak_memory_bytes" in stats:
+                total["peak_memory_bytes"] = max(
+                    total.get("peak_memory_bytes", 0), stats["peak_memory_bytes"]
+                )
+    for total in merged.values():
+        total["wall_seconds"] = round(total["wall_seconds"], 3)
+        total["cpu_seconds"] = round(total["cpu_seconds"], 3)
+    return merged
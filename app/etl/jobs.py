@@ -0,0 +1,193 @@
+from collections import OrderedDict
+from typing import List, Optional, Type
+import asyncio
+import logging
+import time
+import uuid
+
+from app.config import (
+    INGESTION_JOB_WORKERS,
+    INGESTION_JOB_QUEUE_SIZE,
+    INGESTION_JOB_HISTORY_SIZE,
+)
+from app.db.database import AsyncSessionLocal
+from app.etl.etl_interface import ETLInterface
+from app.models.jobs import IngestionJobModel
+
+
+class IngestionJobQueue:
+    """
+    In-process queue that runs ETL jobs in the background.
+
+    A fixed number of workers pull jobs from a bounded queue, so a burst of
+    uploads can never hold more than `workers` database connections at once.
+    Job state lives in memory and is lost on restart.
+    """
+
+    def __init__(
+        self,
+        workers: int = INGESTION_JOB_WORKERS,
+        max_queued: int = INGESTION_JOB_QUEUE_SIZE,
+        history_size: int = INGESTION_JOB_HISTORY_SIZE,
+    ):
+        """
+        Initialize the job queue.
+
+        Args:
+            workers (int, optional): Number of jobs that run at the same time.
+            max_queued (int, optional): Jobs that may wait before submit() is refused.
+            history_size (int, optional): Jobs kept for status lookups; oldest finished
+                jobs are forgotten first.
+        """
+        self.workers = workers
+        self.history_size = history_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.jobs: "OrderedDict[str, IngestionJobModel]" = OrderedDict()
+        self._worker_tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """
+        Start the background workers. Must be called from a running event loop.
+        """
+        if self._worker_tasks:
+            return
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        logging.info(f"Started {self.workers} ingestion job workers.")
+
+    async def stop(self) -> None:
+        """
+        Cancel the background workers. Queued jobs are dropped.
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+    def submit(
+        self,
+        etl_cls: Type[ETLInterface],
+        content: bytes,
+        filename: str,
+        checksum: Optional[str] = None,
+    ) -> IngestionJobModel:
+        """
+        Queue a file for ingestion.
+
+        Args:
+            etl_cls (Type[ETLInterface]): ETL class to run the file through.
+            content (bytes): Binary content of the uploaded file.
+            filename (str): Name of the uploaded file.
+            checksum (str, optional): SHA-256 of the content, recorded in the
+                ingestion manifest when the job succeeds.
+
+        Returns:
+            IngestionJobModel: The queued job.
+
+        Raises:
+            asyncio.QueueFull: If the queue is at capacity.
+        """
+        job = IngestionJobModel(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            etl_class=etl_cls.__name__,
+            status="queued",
+            created_at=time.time(),
+        )
+        self.queue.put_nowait((job, etl_cls, content, checksum))
+        self.jobs[job.id] = job
+        self._trim_history()
+        logging.info(f"Queued ingestion job {job.id} for '{filename}'.")
+        return job
+
+    def skip(self, filename: str, etl_class: str, feedback: dict) -> IngestionJobModel:
+        """
+        Record a job for a file that was already ingested, without queueing it.
+
+        Args:
+            filename (str): Name of the uploaded file.
+            etl_class (str): Name of the ETL class that ingested it before.
+            feedback (dict): Feedback of the earlier ingestion.
+
+        Returns:
+            IngestionJobModel: A finished job with status "skipped".
+        """
+        now = time.time()
+        job = IngestionJobModel(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            etl_class=etl_class,
+            status="skipped",
+            feedback=feedback,
+            created_at=now,
+            finished_at=now,
+        )
+        self.jobs[job.id] = job
+        self._trim_history()
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestionJobModel]:
+        """
+        Return a job by ID, or None if it is unknown or was forgotten.
+        """
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[IngestionJobModel]:
+        """
+        Return known jobs, newest first.
+        """
+        return list(reversed(self.jobs.values()))
+
+    def _trim_history(self) -> None:
+        finished = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job.status in ("succeeded", "failed", "skipped")
+        ]
+        for job_id in finished[: max(0, len(self.jobs) - self.history_size)]:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job, etl_cls, content, checksum = await self.queue.get()
+            try:
+                await self._run(job, etl_cls, content, checksum)
+            finally:
+                self.queue.task_done()
+
+    async def _run(
+        self,
+        job: IngestionJobModel,
+        etl_cls: Type[ETLInterface],
+        content: bytes,
+        checksum: Optional[str] = None,
+    ) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+
+        def progress(phase: str, state: dict) -> None:
+            job.phase = phase
+            job.rows_processed = state["rows_processed"]
+            job.phase_timings = dict(state["phase_timings"])
+            elapsed = time.time() - job.started_at
+            if job.rows_processed and elapsed > 0:
+                job.rows_per_second = round(job.rows_processed / elapsed, 1)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                job.feedback = await etl_cls(session).run_etl(
+                    content, job.filename, progress=progress, checksum=checksum
+                )
+            job.phase_timings = job.feedback["phase_timings"]
+            job.status = "succeeded"
+        except Exception as e:
+            logging.error(f"Ingestion job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            logging.info(f"Ingestion job {job.id} finished with status {job.status}.")
+
+
+ingestion_jobs = IngestionJobQueue()
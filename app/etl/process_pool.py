@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+import asyncio
+import logging
+import multiprocessing
+
+from app.config import ETL_PROCESS_POOL_SIZE
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_process_pool(max_workers: int = ETL_PROCESS_POOL_SIZE) -> None:
+    """
+    Create the process pool used for CPU-bound ETL work.
+
+    Workers are spawned rather than forked so they never inherit the
+    event loop or open database connections of the API process.
+
+    Args:
+        max_workers (int, optional): Number of worker processes. 0 disables the pool.
+    """
+    global _process_pool
+    if _process_pool is not None or max_workers <= 0:
+        return
+    _process_pool = ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    logging.info(f"Started ETL process pool with {max_workers} workers.")
+
+
+def shutdown_process_pool() -> None:
+    """
+    Shut down the ETL process pool, waiting for running work to finish.
+    """
+    global _process_pool
+    if _process_pool is None:
+        return
+    _process_pool.shutdown(wait=True)
+    _process_pool = None
+    logging.info("ETL process pool shut down.")
+
+
+async def run_in_process_pool(func: Callable, *args):
+    """
+    Run `func(*args)` in the ETL process pool, or inline when no pool is running.
+
+    Args:
+        func (Callable): Picklable callable.
+        *args: Picklable arguments.
+
+    Returns:
+        The return value of `func`.
+    """
+    if _process_pool is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_process_pool, func, *args)
@@ -0,0 +1,67 @@
+from typing import AsyncIterator
+import hashlib
+
+from fastapi import UploadFile
+
+from app.config import UPLOAD_CHUNK_SIZE
+
+
+async def iter_upload_chunks(
+    file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Read an uploaded file in fixed-size chunks.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        chunk_size (int, optional): Bytes per chunk.
+
+    Yields:
+        bytes: Raw chunks; lines may be split across chunk boundaries.
+    """
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+async def upload_checksum(file: UploadFile, chunk_size: int = UPLOAD_CHUNK_SIZE) -> str:
+    """
+    Return the SHA-256 hex digest of an uploaded file without holding it in memory.
+
+    The file is rewound afterwards so it can be read again.
+
+    Args:
+        file (UploadFile): The uploaded file.
+        chunk_size (int, optional): Bytes read per chunk.
+
+    Returns:
+        str: Hex digest, as produced by app.db.manifest.file_checksum.
+    """
+    digest = hashlib.sha256()
+    async for chunk in iter_upload_chunks(file, chunk_size):
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+async def iter_line_blocks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Regroup raw byte chunks into blocks that only contain whole lines.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Raw byte chunks.
+
+    Yields:
+        bytes: Blocks ending on a line boundary. Blank blocks are skipped.
+    """
+    remainder = b""
+    async for chunk in chunks:
+        data = remainder + chunk
+        cut = data.rfind(b"\n") + 1
+        block, remainder = data[:cut], data[cut:]
+        if block.strip():
+            yield block
+    if remainder.strip():
+        yield remainder
@@ -0,0 +1,35 @@
+from typing import List, Sequence
+
+from sqlalchemy import Table, literal_column, tuple_
+from sqlalchemy.dialects.postgresql import Insert, insert
+
+
+def values_upsert(
+    table: Table,
+    rows: List[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str],
+) -> Insert:
+    """
+    Build an INSERT ... VALUES that overwrites existing rows only if they changed.
+
+    Unchanged rows are not rewritten and not returned. Every returned row says
+    whether it was inserted (xmax = 0) or updated.
+
+    Args:
+        table (Table): Target table.
+        rows (List[dict]): Rows to write, unique on `conflict_columns`.
+        conflict_columns (Sequence[str]): Columns of the unique constraint.
+        update_columns (Sequence[str]): Columns compared and overwritten.
+
+    Returns:
+        Insert: The statement, returning one boolean `inserted` column.
+    """
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=list(conflict_columns),
+        set_={name: stmt.excluded[name] for name in update_columns},
+        where=tuple_(*(table.c[name] for name in update_columns)).is_distinct_from(
+            tuple_(*(stmt.excluded[name] for name in update_columns))
+        ),
+    ).returning(literal_column("(xmax = 0)").label("inserted"))
@@ -0,0 +1,99 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+# Value used for missing measurements in the wx_data files
+MISSING_VALUE = -9999
+
+WX_COLUMNS = ["date", "max_temp", "min_temp", "precipitation"]
+
+# Indexed by month; month 0 has no days and months above 12 are rejected separately
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Whole days representable as datetime64[ns], like pandas.Timestamp.min/max
+_MIN_DAYS = (np.datetime64("1677-09-22") - np.datetime64("1970-01-01")).astype(int)
+_MAX_DAYS = (np.datetime64("2262-04-11") - np.datetime64("1970-01-01")).astype(int)
+
+
+def read_wx_columns(file_content: bytes) -> pd.DataFrame:
+    """
+    Parse wx_data content into int32 columns with the pyarrow CSV reader.
+
+    Dates stay YYYYMMDD integers and measurements stay in tenths with -9999
+    for missing values; see yyyymmdd_to_datetime and tenths_to_float.
+
+    Args:
+        file_content (bytes): Tab-separated lines of date, max temp, min temp
+            and precipitation.
+
+    Returns:
+        pd.DataFrame: One int32 column per field.
+
+    Raises:
+        pa.ArrowInvalid: If the content is not four integer columns, or a field
+            is empty.
+    """
+    table = pa_csv.read_csv(
+        io.BytesIO(file_content),
+        read_options=pa_csv.ReadOptions(column_names=WX_COLUMNS, use_threads=False),
+        parse_options=pa_csv.ParseOptions(delimiter="\t"),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.int32() for name in WX_COLUMNS}
+        ),
+    )
+    if any(column.null_count for column in table.columns):
+        raise pa.ArrowInvalid("wx_data fields must not be empty")
+    return pd.DataFrame(
+        {name: table.column(name).to_numpy() for name in WX_COLUMNS}, copy=False
+    )
+
+
+def yyyymmdd_to_datetime(values: np.ndarray) -> np.ndarray:
+    """
+    Convert YYYYMMDD integers to datetime64[ns] with integer arithmetic.
+
+    Matches pd.to_datetime(str(value), format="%Y%m%d", errors="coerce"):
+    impossible dates (month 13, February 30, -9999) become NaT.
+    """
+    values = values.astype(np.int64)
+    year, month_day = np.divmod(values, 10000)
+    month, day = np.divmod(month_day, 100)
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    days_in_month = _DAYS_IN_MONTH[np.clip(month, 0, 12)] + (leap & (month == 2))
+    valid = (values >= 10000101) & (month <= 12) & (day >= 1)
+    valid &= day <= days_in_month
+
+    # Days since 1970-01-01 of a proleptic Gregorian date (H. Hinnant's
+    # days_from_civil), with years starting in March so leap days come last
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100
+    days = era * 146097 + day_of_era + day_of_year - 719468
+
+    valid &= (days >= _MIN_DAYS) & (days <= _MAX_DAYS)
+    nanoseconds = days
+    nanoseconds *= 86_400_000_000_000
+    nanoseconds[~valid] = np.iinfo(np.int64).min  # NaT
+    return nanoseconds.view("datetime64[ns]")
+
+
+def tenths_to_float(values: np.ndarray) -> np.ndarray:
+    """
+    Scale tenths to float64 units in one allocation, with NaN for -9999.
+    """
+    result = np.full(len(values), np.nan)
+    np.divide(values, 10.0, out=result, where=values != MISSING_VALUE)
+    return result
+
+
+def float_to_tenths(values: pd.Series) -> pd.Series:
+    """
+    Scale real units back to nullable Int16 tenths, the inverse of tenths_to_float.
+    """
+    return (values * 10).round().astype("Int16")
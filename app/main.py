@@ -3,8 +3,14 @@ from fastapi import FastAPI
 from app.routes.ingestion_routes import router as ingestion_router
 from app.routes.migrations_routes import router as migration_router
 from app.routes.weather_routes import router as weather_router
+from app.routes.job_routes import router as job_router
+from app.routes.diagnostics_routes import router as diagnostics_router
+from app.routes.metrics_routes import router as metrics_router
 from app.db.database import init_db
+from app.etl.process_pool import start_process_pool, shutdown_process_pool
+from app.etl.jobs import ingestion_jobs
 from app.utils.logger import setup_logging
+from app.utils.metrics import PrometheusMiddleware
 
 
 app = FastAPI(
@@ -21,13 +27,27 @@ app = FastAPI(
 # Setup logging
 setup_logging()
 
+# Request latency and in-flight metrics, exposed on /metrics
+app.add_middleware(PrometheusMiddleware)
+
 
 @app.on_event("startup")
 async def on_startup():
     await init_db()
+    start_process_pool()
+    ingestion_jobs.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await ingestion_jobs.stop()
+    shutdown_process_pool()
 
 
 # Include routers
 app.include_router(ingestion_router, prefix="/api")
+app.include_router(job_router, prefix="/api")
 app.include_router(migration_router, prefix="/api")
 app.include_router(weather_router, prefix="/api")
+app.include_router(diagnostics_router, prefix="/api")
+app.include_router(metrics_router)
@@ -0,0 +1,41 @@
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class IngestionJobModel(BaseModel):
+    id: str
+    filename: str
+    etl_class: str
+    status: str  # queued, running, succeeded, failed or skipped (unchanged file)
+    phase: Optional[str] = None  # extract, transform, load or done while running
+    rows_processed: int = 0
+    rows_per_second: Optional[float] = None
+    phase_timings: Dict[str, float] = {}
+    feedback: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "5f0c9d1e7a8b4c2d9e3f1a2b3c4d5e6f",
+                "filename": "USC00110072.txt",
+                "etl_class": "WeatherETL",
+                "status": "succeeded",
+                "phase": "done",
+                "rows_processed": 10946,
+                "rows_per_second": 15637.1,
+                "phase_timings": {"extract": 0.05, "transform": 0.02, "load": 0.61},
+                "feedback": {
+                    "total_records": 10946,
+                    "inserted_records": 10946,
+                    "time_taken": 0.7,
+                },
+                "error": None,
+                "created_at": 1737935579.2,
+                "started_at": 1737935579.3,
+                "finished_at": 1737935580.0,
+            }
+        }
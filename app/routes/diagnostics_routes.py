@@ -0,0 +1,84 @@
+from fastapi import APIRouter
+
+from app.db.database import engine
+from app.utils.cache import stats_cache, weather_data_cache
+
+router = APIRouter()
+
+
+@router.get(
+    "/diagnostics/cache",
+    summary="Response cache counters",
+    description=(
+        "Report size, hits, misses, evictions, expirations and invalidations of the "
+        "in-process response caches in front of /weather and /weather/stats."
+    ),
+    tags=["Diagnostics"],
+    responses={
+        200: {
+            "description": "Cache counters.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "weather_stats": {
+                            "name": "weather_stats",
+                            "entries": 412,
+                            "max_entries": 1024,
+                            "ttl_seconds": 300.0,
+                            "hits": 18230,
+                            "misses": 1502,
+                            "hit_ratio": 0.9239,
+                            "evictions": 0,
+                            "expirations": 1090,
+                            "invalidations": 37,
+                        }
+                    }
+                }
+            },
+        }
+    },
+)
+async def get_cache_stats():
+    """
+    Report the counters of every response cache.
+    """
+    return {cache.name: cache.stats() for cache in (stats_cache, weather_data_cache)}
+
+
+@router.get(
+    "/diagnostics/pool",
+    summary="Database connection pool usage",
+    description=(
+        "Report the pool configuration, connections checked out and in, overflow "
+        "connections in use, average and maximum checkout wait and the number of "
+        "checkouts that timed out. Use it to size DB_POOL_SIZE and DB_MAX_OVERFLOW "
+        "against Postgres max_connections."
+    ),
+    tags=["Diagnostics"],
+    responses={
+        200: {
+            "description": "Pool counters for this process.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "pool_size": 5,
+                        "max_overflow": 10,
+                        "timeout_seconds": 30.0,
+                        "checked_out": 7,
+                        "checked_in": 0,
+                        "overflow": 2,
+                        "checkouts": 48211,
+                        "timeouts": 3,
+                        "avg_wait_ms": 0.412,
+                        "max_wait_ms": 30004.8,
+                    }
+                }
+            },
+        }
+    },
+)
+async def get_pool_stats():
+    """
+    Report occupancy and wait statistics of the database connection pool.
+    """
+    return engine.pool.stats()
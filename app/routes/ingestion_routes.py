@@ -1,16 +1,34 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-import pandas as pd
-import io
+from typing import List
+import asyncio
 import logging
+import tarfile
+import time
+import zipfile
 
-from app.etl.impl_weather_etl import WeatherETL
-from app.etl.impl_crop_yield_etl import CropYieldETL
-from app.db.database import get_db
+from app.etl.detect import detect_etl_class
+from app.etl.impl_arrow_weather_etl import ArrowWeatherETL
+from app.etl.streaming import iter_upload_chunks, upload_checksum
+from app.etl.archive import iter_archive_members
+from app.db.database import get_db, AsyncSessionLocal
+from app.db.manifest import file_checksum, find_ingested, find_unchanged
+from app.config import UPLOAD_CHUNK_SIZE, ARCHIVE_INGEST_CONCURRENCY
 
 router = APIRouter()
 
+
+def etl_class_for(sample: bytes):
+    """
+    Return the ETL class for an upload, answering 400 if its type is unknown.
+    """
+    try:
+        return detect_etl_class(sample)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 # Define a reusable response model for file upload
 class FileUploadResponse(BaseModel):
     message: str
@@ -36,7 +54,9 @@ class FileUploadResponse(BaseModel):
     description=(
         "Upload a file containing weather or crop yield data for ingestion into "
         "the database. The system detects the file type dynamically based on the structure "
-        "and processes it accordingly."
+        "and processes it accordingly. Weather data may also be uploaded as a "
+        "Parquet or Arrow IPC file. Files whose name and content are already in "
+        "the ingestion manifest are skipped unless `force` is set."
     ),
     tags=["Data Ingestion"],
     responses={
@@ -61,6 +81,30 @@ class FileUploadResponse(BaseModel):
 )
 async def upload_file(
     file: UploadFile = File(..., description="The file to be uploaded."),
+    stream: bool = Query(
+        False,
+        description=(
+            "Read, parse and load the file in chunks so memory stays bounded "
+            "for very large uploads."
+        ),
+    ),
+    profile: str = Query(
+        None,
+        description=(
+            "Include a per-phase profile in the feedback: cprofile or pyinstrument."
+        ),
+    ),
+    trace_memory: bool = Query(
+        None,
+        description="Report peak memory per phase (tracemalloc; slows the ETL down).",
+    ),
+    force: bool = Query(
+        False,
+        description=(
+            "Ingest the file even if the ingestion manifest lists the same "
+            "content as already ingested."
+        ),
+    ),
     session: AsyncSession = Depends(get_db),
 ):
     """
@@ -68,33 +112,46 @@ async def upload_file(
     """
     logging.info(f"Received file upload: {file.filename}")
 
-    # Read the file content as raw bytes
-    content = await file.read()
-
-    # Determine the file type based on the number of columns
-    try:
-        buffer = io.BytesIO(content)
-        sample_df = pd.read_csv(buffer, sep="\t", header=None, nrows=5)
-        num_columns = len(sample_df.columns)
-    except Exception as e:
-        logging.error(f"Error reading the uploaded file: {e}")
-        raise HTTPException(status_code=400, detail="Invalid file format.")
-
-    # Reset buffer position
-    buffer.seek(0)
+    # Hash the upload and skip content that was already ingested, before parsing
+    if stream:
+        checksum = await upload_checksum(file)
+    else:
+        content = await file.read()
+        checksum = file_checksum(content)
+    unchanged = await find_unchanged(session, file.filename, checksum, force)
+    if unchanged is not None:
+        return {
+            "message": f"File '{file.filename}' is unchanged; skipped.",
+            "details": unchanged,
+        }
 
-    # Determine which ETL class to use based on the number of columns
-    if num_columns == 4:
-        etl_class = WeatherETL(session)
-    elif num_columns == 2:
-        etl_class = CropYieldETL(session)
+    if stream:
+        # Only the first chunk is needed to detect the file type
+        sample = await file.read(UPLOAD_CHUNK_SIZE)
+        etl_class = etl_class_for(sample)(session)
+        await file.seek(0)
+        if isinstance(etl_class, ArrowWeatherETL):
+            # Columnar files cannot be split on line boundaries
+            stream = False
+            content = await file.read()
     else:
-        logging.error("Unknown file structure based on column count.")
-        raise HTTPException(status_code=400, detail="Unknown file structure.")
+        etl_class = etl_class_for(content)(session)
+
+    try:
+        etl_class.instrument(trace_memory=trace_memory, profiler=profile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Run the ETL process and capture the feedback
     try:
-        feedback = await etl_class.run_etl(content, file.filename)
+        if stream:
+            feedback = await etl_class.run_etl_stream(
+                iter_upload_chunks(file), file.filename, checksum=checksum
+            )
+        else:
+            feedback = await etl_class.run_etl(
+                content, file.filename, checksum=checksum
+            )
     except Exception as e:
         logging.error(f"ETL process failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to process the file.")
@@ -106,3 +163,218 @@ async def upload_file(
         "message": f"File '{file.filename}' processed successfully.",
         "details": feedback,
     }
+
+
+class ArchiveUploadResponse(BaseModel):
+    message: str
+    totals: dict
+    files: List[dict]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "message": (
+                    "Archive 'wx_data.zip' processed: 2 succeeded, 0 unchanged, "
+                    "0 failed."
+                ),
+                "totals": {
+                    "files": 2,
+                    "succeeded": 2,
+                    "unchanged": 0,
+                    "failed": 0,
+                    "total_records": 21892,
+                    "inserted_records": 21892,
+                    "time_taken": 1.4,
+                },
+                "files": [
+                    {
+                        "filename": "USC00110072.txt",
+                        "status": "success",
+                        "details": {
+                            "total_records": 10946,
+                            "inserted_records": 10946,
+                            "time_taken": 0.7,
+                        },
+                    }
+                ],
+            }
+        }
+
+
+async def ingest_archive_member(
+    filename: str, content: bytes, force: bool = False
+) -> dict:
+    """
+    Run one archive member through the matching ETL class with its own session.
+
+    Members already listed in the ingestion manifest are skipped before parsing.
+
+    Args:
+        filename (str): Base name of the member.
+        content (bytes): Content of the member.
+        force (bool, optional): Ingest even if the manifest lists the content.
+
+    Returns:
+        dict: Per-file result with status and ETL feedback or error detail.
+    """
+    checksum = file_checksum(content)
+    try:
+        async with AsyncSessionLocal() as member_session:
+            unchanged = await find_unchanged(member_session, filename, checksum, force)
+            if unchanged is not None:
+                return {
+                    "filename": filename,
+                    "status": "unchanged",
+                    "details": unchanged,
+                }
+            try:
+                etl_class = detect_etl_class(content)
+            except ValueError as e:
+                return {"filename": filename, "status": "error", "detail": str(e)}
+            feedback = await etl_class(member_session).run_etl(
+                content, filename, checksum=checksum
+            )
+    except Exception as e:
+        logging.error(f"ETL process failed for archive member '{filename}': {e}")
+        return {
+            "filename": filename,
+            "status": "error",
+            "detail": "Failed to process the file.",
+        }
+    return {"filename": filename, "status": "success", "details": feedback}
+
+
+@router.post(
+    "/upload_archive",
+    response_model=ArchiveUploadResponse,
+    summary="Upload an archive of files for data ingestion",
+    description=(
+        "Upload a zip or tar(.gz) archive of weather and/or crop yield files. "
+        "Each member is matched to its ETL class the same way as /upload_file, "
+        "and members are ingested concurrently with a bounded number of workers. "
+        "Members already in the ingestion manifest are reported as unchanged."
+    ),
+    tags=["Data Ingestion"],
+    responses={
+        200: {"description": "Archive processed; see per-file results."},
+        400: {"description": "Not a zip or tar archive, or no data files inside."},
+    },
+)
+async def upload_archive(
+    file: UploadFile = File(..., description="The zip or tar(.gz) archive to ingest."),
+    force: bool = Query(
+        False, description="Ingest members even if the manifest lists their content."
+    ),
+):
+    """
+    Ingest every station/yield file inside an uploaded archive.
+    """
+    logging.info(f"Received archive upload: {file.filename}")
+    start_time = time.time()
+    semaphore = asyncio.Semaphore(ARCHIVE_INGEST_CONCURRENCY)
+
+    async def bounded_ingest(filename: str, content: bytes) -> dict:
+        try:
+            return await ingest_archive_member(filename, content, force)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    members = iter_archive_members(file.file)
+    try:
+        while True:
+            # Acquire before reading the next member so at most
+            # ARCHIVE_INGEST_CONCURRENCY members are held in memory.
+            await semaphore.acquire()
+            # Decompress in a thread so the event loop keeps serving requests
+            member = await asyncio.to_thread(next, members, None)
+            if member is None:
+                semaphore.release()
+                break
+            tasks.append(asyncio.create_task(bounded_ingest(*member)))
+    except (
+        ValueError,
+        OSError,
+        EOFError,
+        zipfile.BadZipFile,
+        tarfile.TarError,
+    ) as e:
+        logging.error(f"Error reading the uploaded archive: {e}")
+        for task in tasks:
+            task.cancel()
+        raise HTTPException(status_code=400, detail="Invalid archive format.")
+
+    results = list(await asyncio.gather(*tasks))
+    if not results:
+        raise HTTPException(status_code=400, detail="No data files found in archive.")
+
+    succeeded = [r for r in results if r["status"] == "success"]
+    unchanged = [r for r in results if r["status"] == "unchanged"]
+    totals = {
+        "files": len(results),
+        "succeeded": len(succeeded),
+        "unchanged": len(unchanged),
+        "failed": len(results) - len(succeeded) - len(unchanged),
+        "total_records": sum(r["details"]["total_records"] for r in succeeded),
+        "inserted_records": sum(r["details"]["inserted_records"] for r in succeeded),
+        "time_taken": round(time.time() - start_time, 2),
+    }
+    logging.info(f"Archive '{file.filename}' processed: {totals}")
+
+    return {
+        "message": (
+            f"Archive '{file.filename}' processed: {totals['succeeded']} succeeded, "
+            f"{totals['unchanged']} unchanged, {totals['failed']} failed."
+        ),
+        "totals": totals,
+        "files": results,
+    }
+
+
+class ManifestFile(BaseModel):
+    filename: str
+    checksum: str  # SHA-256 hex digest of the file content
+
+
+class ManifestCheckRequest(BaseModel):
+    files: List[ManifestFile]
+
+
+class ManifestCheckResponse(BaseModel):
+    unchanged: List[str]
+    changed: List[str]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "unchanged": ["USC00110072.txt"],
+                "changed": ["USC00110187.txt"],
+            }
+        }
+
+
+@router.post(
+    "/manifest/check",
+    response_model=ManifestCheckResponse,
+    summary="Check files against the ingestion manifest",
+    description=(
+        "Send file names with the SHA-256 of their content and get back which "
+        "of them were already ingested with that exact content, so clients can "
+        "skip uploading unchanged files."
+    ),
+    tags=["Data Ingestion"],
+)
+async def check_manifest(
+    request: ManifestCheckRequest, session: AsyncSession = Depends(get_db)
+):
+    """
+    Split files into unchanged (already ingested) and changed ones.
+    """
+    files = [(f.filename, f.checksum.lower()) for f in request.files]
+    ingested = set(await find_ingested(session, files))
+    return {
+        "unchanged": [name for name, checksum in files if (name, checksum) in ingested],
+        "changed": [
+            name for name, checksum in files if (name, checksum) not in ingested
+        ],
+    }
@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, File, UploadFile, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+import asyncio
+import logging
+
+from app.db.database import get_db
+from app.db.manifest import file_checksum, find_unchanged
+from app.etl.jobs import ingestion_jobs
+from app.models.jobs import IngestionJobModel
+from app.routes.ingestion_routes import etl_class_for
+
+router = APIRouter()
+
+
+@router.post(
+    "/jobs",
+    response_model=IngestionJobModel,
+    status_code=202,
+    summary="Upload a file for background ingestion",
+    description=(
+        "Upload a weather or crop yield file and return immediately with a job ID. "
+        "The file is ingested by a background worker; poll /jobs/{job_id} for "
+        "progress and the final feedback. A file whose name and content are "
+        "already in the ingestion manifest gets a finished job with status "
+        "`skipped` unless `force` is set."
+    ),
+    tags=["Data Ingestion"],
+    responses={
+        202: {"description": "File accepted and queued for ingestion."},
+        400: {"description": "Invalid file format or unknown file structure."},
+        503: {"description": "Ingestion queue is full; retry later."},
+    },
+)
+async def submit_ingestion_job(
+    file: UploadFile = File(..., description="The file to be uploaded."),
+    force: bool = Query(
+        False, description="Ingest the file even if the manifest lists its content."
+    ),
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Queue a file for asynchronous ingestion.
+    """
+    logging.info(f"Received file upload for background ingestion: {file.filename}")
+    content = await file.read()
+    checksum = file_checksum(content)
+    unchanged = await find_unchanged(session, file.filename, checksum, force)
+    etl_cls = etl_class_for(content)
+    if unchanged is not None:
+        return ingestion_jobs.skip(file.filename, etl_cls.__name__, unchanged)
+
+    try:
+        return ingestion_jobs.submit(etl_cls, content, file.filename, checksum)
+    except asyncio.QueueFull:
+        logging.warning(f"Ingestion queue full, rejecting '{file.filename}'.")
+        raise HTTPException(
+            status_code=503, detail="Ingestion queue is full. Retry later."
+        )
+
+
+@router.get(
+    "/jobs",
+    response_model=List[IngestionJobModel],
+    summary="List ingestion jobs",
+    description="List queued, running and recently finished ingestion jobs, newest first.",
+    tags=["Data Ingestion"],
+)
+async def list_ingestion_jobs():
+    """
+    List known ingestion jobs.
+    """
+    return ingestion_jobs.list_jobs()
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=IngestionJobModel,
+    summary="Get ingestion job status",
+    description=(
+        "Report the phase (extract, transform, load or done), rows processed, "
+        "throughput, per-phase timings and, "
+        "once finished, the ETL feedback of an ingestion job."
+    ),
+    tags=["Data Ingestion"],
+    responses={404: {"description": "Unknown job ID."}},
+)
+async def get_ingestion_job(job_id: str):
+    """
+    Get the status of an ingestion job.
+    """
+    job = ingestion_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description=(
+        "Expose request latency histograms per route and status, in-flight "
+        "request gauges and ETL counters and phase histograms per ETL class in "
+        "the Prometheus text format. Values are per process."
+    ),
+    tags=["Diagnostics"],
+    response_class=Response,
+    responses={200: {"content": {CONTENT_TYPE_LATEST: {}}}},
+)
+async def get_metrics():
+    """
+    Render every registered metric in the Prometheus text format.
+    """
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,151 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, column, text
-from app.db.database import get_db
+from sqlalchemy import select, func, column, text, cast, Float, tuple_
+from app.db.database import get_db, AsyncSessionLocal
+from app.db.schema import Station, WeatherDataCompact, WeatherStatsSummary
+from app.db.arrow_export import (
+    ARROW_STREAM_MEDIA_TYPE,
+    PARQUET_MEDIA_TYPE,
+    WEATHER_ARROW_SCHEMA,
+    fetch_arrow_table,
+    last_row_values,
+    table_to_bytes,
+)
 from app.models.weather import WeatherDataModel, WeatherStatsModel
-from typing import List
-import pandas as pd
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.cache import stats_cache, weather_data_cache
+from app.utils.serialization import rows_to_json, json_bytes_response
+from app.utils.dataset_version import conditional_headers, is_not_modified
+from app.config import EXPORT_BATCH_SIZE, WEATHER_STORAGE
+from datetime import date
+from typing import AsyncIterator, List, Optional
+import csv
+import io
+import json
 import logging
+import math
 
 router = APIRouter()
 
+# Columns /weather can be ordered by
+WEATHER_ORDER_COLUMNS = ["station_id", "date", "max_temp", "min_temp", "precipitation"]
+
+# Keys of the JSON objects returned by /weather and /weather/stats, in query order
+WEATHER_COLUMNS = ["station_id", "date", "max_temp", "min_temp", "precipitation"]
+WEATHER_STATS_COLUMNS = [
+    "station_id",
+    "year",
+    "avg_max_temp",
+    "avg_min_temp",
+    "total_precipitation",
+]
+
+# Export formats and their media types
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# Columnar response formats of /weather and their media types
+COLUMNAR_MEDIA_TYPES = {"arrow": ARROW_STREAM_MEDIA_TYPE, "parquet": PARQUET_MEDIA_TYPE}
+
+# Keyset columns for cursor pagination, per order_by. Each page resumes right
+# after the last row of the previous one, so deep pages cost the same as the first.
+WEATHER_KEYSET_COLUMNS = {
+    "station_id": ["station_id", "date"],
+    "date": ["date", "station_id"],
+}
+
+
+def parse_date(value: Optional[str], name: str) -> Optional[date]:
+    """
+    Parse an optional YYYY-MM-DD query parameter.
+
+    Raises:
+        HTTPException: 400 if the value is not a valid date.
+    """
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid {name}, expected YYYY-MM-DD."
+        )
+
+
+def weather_data_source(storage: str = WEATHER_STORAGE):
+    """
+    FROM clause of the weather data endpoints, with measurements in real units.
+
+    Compact storage keeps integer tenths and station keys; they are converted
+    back to degrees and millimetres and joined to their station ids here, in a
+    subquery named weather_data that Postgres flattens into the outer query, so
+    the filters, ordering and cursors below work the same on both layouts.
+    """
+    if storage != "compact":
+        return text("weather_data")
+    compact = WeatherDataCompact
+    return (
+        select(
+            Station.station_id,
+            compact.station_key,
+            compact.date,
+            *[
+                (cast(measurement, Float) / 10.0).label(measurement.name)
+                for measurement in (
+                    compact.max_temp,
+                    compact.min_temp,
+                    compact.precipitation,
+                )
+            ],
+        )
+        .join(Station, Station.id == compact.station_key)
+        .subquery("weather_data")
+    )
+
+
+def sort_column(name: str, storage: str = WEATHER_STORAGE):
+    """
+    Column of weather_data_source() that orders and pages by `name`.
+
+    Compact storage orders stations by their SMALLINT key rather than by
+    station_id: the (station_key, date) primary key and the (date,
+    station_key) index can serve that, while station_id comes from the
+    stations join and would need a full scan and sort on deep pages.
+    """
+    if name == "station_id" and storage == "compact":
+        return column("station_key")
+    return column(name)
+
+
+def keyset_value(name: str, value, storage: str = WEATHER_STORAGE):
+    """
+    Turn a cursor value back into something comparable with sort_column(name).
+
+    Compact storage looks the station's key up in the stations table.
+    """
+    if name == "date":
+        return date.fromisoformat(value)
+    if name == "station_id" and storage == "compact":
+        return select(Station.id).where(Station.station_id == value).scalar_subquery()
+    return value
+
+
+def apply_weather_filters(
+    query, station_id: Optional[str], start_date: Optional[str], end_date: Optional[str]
+):
+    """
+    Apply the station and date range filters shared by the weather data endpoints.
+    """
+    start = parse_date(start_date, "start_date")
+    end = parse_date(end_date, "end_date")
+    if station_id:
+        query = query.where(column("station_id") == station_id)
+    if start:
+        query = query.where(column("date") >= start)
+    if end:
+        query = query.where(column("date") <= end)
+    return query
+
 
 @router.get(
     "/weather",
@@ -16,7 +153,10 @@ router = APIRouter()
     summary="Retrieve Weather Data",
     description=(
         "Fetch raw weather data records with optional filters, sorting, "
-        "and pagination. You can filter by station ID, date range, or order results."
+        "and pagination. You can filter by station ID, date range, or order results. "
+        "When ordering by date or station_id, a full page carries an `X-Next-Cursor` "
+        "header; pass it back as `cursor` to fetch the next page with keyset "
+        "pagination, which costs the same at any depth."
     ),
     tags=["Weather Data"],
     responses={
@@ -33,67 +173,180 @@ router = APIRouter()
                             "precipitation": 5.8,
                         }
                     ]
-                }
+                },
+                ARROW_STREAM_MEDIA_TYPE: {},
+                PARQUET_MEDIA_TYPE: {},
             },
         },
+        304: {"description": "Not modified since the ETag in If-None-Match."},
         400: {"description": "Invalid query parameters."},
         500: {"description": "Internal server error."},
     },
 )
 async def get_weather_data(
+    request: Request,
     station_id: str = Query(None, description="Filter by station ID"),
     start_date: str = Query(None, description="Start date for filtering (YYYY-MM-DD)"),
     end_date: str = Query(None, description="End date for filtering (YYYY-MM-DD)"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     order_by: str = Query(
-        "date", description="Field to order by (e.g., date, max_temp)"
+        "date",
+        description=f"Field to order by ({', '.join(WEATHER_ORDER_COLUMNS)})",
     ),
     order_direction: str = Query("asc", description="Order direction (asc or desc)"),
+    cursor: str = Query(
+        None,
+        description=(
+            "Opaque keyset cursor from the X-Next-Cursor header of the previous "
+            "page. Replaces offset; order_by and order_direction must not change."
+        ),
+    ),
+    format: str = Query(
+        "json",
+        description=(
+            "Response format: json, arrow (Arrow IPC stream) or parquet. "
+            f"An Accept header of {ARROW_STREAM_MEDIA_TYPE} also selects arrow."
+        ),
+    ),
     session: AsyncSession = Depends(get_db),
 ):
-
     """
     Retrieve raw weather data with optional filters, pagination, and sorting.
     """
-    try:
-        query = select(
-            column("station_id"),
-            column("date"),
-            column("max_temp"),
-            column("min_temp"),
-            column("precipitation"),
-        ).select_from(text("weather_data"))
+    if order_by not in WEATHER_ORDER_COLUMNS:
+        raise HTTPException(status_code=400, detail="Invalid order_by field.")
+    if order_direction not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="Invalid order_direction.")
+    if format == "json" and ARROW_STREAM_MEDIA_TYPE in request.headers.get(
+        "accept", ""
+    ):
+        format = "arrow"
+    if format != "json" and format not in COLUMNAR_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid format.")
 
-        if station_id:
-            query = query.where(column("station_id") == station_id)
-        if start_date:
-            query = query.where(column("date") >= start_date)
-        if end_date:
-            query = query.where(column("date") <= end_date)
+    # Answer revalidations from the dataset version, before any query
+    validators = await conditional_headers(
+        session, station_id, variant="" if format == "json" else format
+    )
+    # The format can come from Accept, so shared caches must key on it
+    validators["Vary"] = "Accept"
+    if is_not_modified(request.headers, validators):
+        return Response(status_code=304, headers=validators)
 
-        query = query.offset(offset).limit(limit)
-        results = (await session.execute(query)).fetchall()
-        return [
-            WeatherDataModel.from_row(
-                row
-            )  # Use the `from_row` method to handle serialization
-            for row in results
-        ]
+    cache_key = (
+        station_id or None,
+        start_date or None,
+        end_date or None,
+        limit,
+        offset,
+        order_by,
+        order_direction,
+        cursor or None,
+    )
+    cached = weather_data_cache.get(cache_key) if format == "json" else None
+    if cached is not None:
+        content, headers = cached
+        return json_bytes_response(content, {**headers, **validators})
+
+    keyset_columns = WEATHER_KEYSET_COLUMNS.get(order_by)
+    storage = WEATHER_STORAGE
+    query = select(
+        column("station_id"),
+        column("date"),
+        column("max_temp"),
+        column("min_temp"),
+        column("precipitation"),
+    ).select_from(weather_data_source(storage))
+    query = apply_weather_filters(query, station_id, start_date, end_date)
+
+    if cursor:
+        if keyset_columns is None:
+            raise HTTPException(
+                status_code=400,
+                detail="Cursor pagination requires order_by date or station_id.",
+            )
+        if offset:
+            raise HTTPException(
+                status_code=400, detail="Use either cursor or offset, not both."
+            )
+        try:
+            cursor_order_by, cursor_direction, values = decode_cursor(cursor)
+            if (cursor_order_by, cursor_direction) != (order_by, order_direction):
+                raise ValueError("cursor was issued for a different ordering")
+            if len(values) != len(keyset_columns):
+                raise ValueError("cursor has the wrong number of keyset values")
+            values = [
+                keyset_value(name, v, storage)
+                for name, v in zip(keyset_columns, values)
+            ]
+        except (ValueError, TypeError) as e:
+            logging.error(f"Invalid weather data cursor: {e}")
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        keyset = tuple_(*[sort_column(name, storage) for name in keyset_columns])
+        if order_direction == "asc":
+            query = query.where(keyset > tuple_(*values))
+        else:
+            query = query.where(keyset < tuple_(*values))
+
+    # Tie-break on the unique key so every page has a well-defined order
+    order_columns = [order_by] + [
+        name for name in ("station_id", "date") if name != order_by
+    ]
+    sort_columns = [sort_column(name, storage) for name in order_columns]
+    query = query.order_by(
+        *[sort.desc() if order_direction == "desc" else sort for sort in sort_columns]
+    )
+
+    query = query.offset(offset).limit(limit)
 
+    if format in COLUMNAR_MEDIA_TYPES:
+        # Columnar formats go from COPY output to Arrow without per-row objects
+        try:
+            table = await fetch_arrow_table(session, query, WEATHER_ARROW_SCHEMA)
+        except Exception as e:
+            logging.error(f"Error retrieving weather data: {e}")
+            raise HTTPException(status_code=500, detail="Internal server error.")
+        headers = dict(validators)
+        if keyset_columns and table.num_rows == limit:
+            headers["X-Next-Cursor"] = encode_cursor(
+                order_by, order_direction, last_row_values(table, keyset_columns)
+            )
+        return Response(
+            content=table_to_bytes(table, format),
+            media_type=COLUMNAR_MEDIA_TYPES[format],
+            headers=headers,
+        )
+
+    try:
+        results = (await session.execute(query)).fetchall()
     except Exception as e:
         logging.error(f"Error retrieving weather data: {e}")
         raise HTTPException(status_code=500, detail="Internal server error.")
 
+    headers = {}
+    if keyset_columns and len(results) == limit:
+        last_row = results[-1]
+        headers["X-Next-Cursor"] = encode_cursor(
+            order_by,
+            order_direction,
+            [getattr(last_row, name) for name in keyset_columns],
+        )
+
+    # Rows go straight to JSON bytes; response_model only documents the shape
+    content = rows_to_json(results, WEATHER_COLUMNS)
+    weather_data_cache.set(cache_key, (content, headers), station_id or None)
+    return json_bytes_response(content, {**headers, **validators})
+
 
 @router.get(
     "/weather/stats",
     response_model=List[WeatherStatsModel],
     summary="Retrieve Weather Statistics",
     description=(
-        "Fetch aggregated weather statistics dynamically generated from the "
-        "database view. Statistics include average max/min temperatures and total "
-        "precipitation for each station and year."
+        "Fetch aggregated weather statistics from the summary table that is kept "
+        "up to date during ingestion. Statistics include average max/min "
+        "temperatures and total precipitation for each station and year."
     ),
     tags=["Weather Statistics"],
     responses={
@@ -113,11 +366,13 @@ async def get_weather_data(
                 }
             },
         },
+        304: {"description": "Not modified since the ETag in If-None-Match."},
         400: {"description": "Invalid query parameters."},
         500: {"description": "Internal server error."},
     },
 )
 async def get_weather_stats(
+    request: Request,
     station_id: str = Query(None, description="Filter by station ID"),
     year: int = Query(None, description="Filter by year"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
@@ -125,45 +380,155 @@ async def get_weather_stats(
     session: AsyncSession = Depends(get_db),
 ):
     """
-    Retrieve aggregated weather statistics dynamically from the view.
+    Retrieve aggregated weather statistics from the incrementally maintained summary table.
     """
+    validators = await conditional_headers(session, station_id)
+    if is_not_modified(request.headers, validators):
+        return Response(status_code=304, headers=validators)
+
+    cache_key = (station_id or None, year, limit, offset)
+    cached = stats_cache.get(cache_key)
+    if cached is not None:
+        return json_bytes_response(cached, validators)
+
     try:
+        summary = WeatherStatsSummary
+        row_count = cast(summary.row_count, Float)
         query = select(
-            column("station_id"),
-            column("year"),
-            column("avg_max_temp"),
-            column("avg_min_temp"),
-            column("total_precipitation"),
-        ).select_from(text("weather_stats_view"))
+            summary.station_id,
+            summary.year,
+            (summary.sum_max_temp / row_count).label("avg_max_temp"),
+            (summary.sum_min_temp / row_count).label("avg_min_temp"),
+            summary.sum_precipitation.label("total_precipitation"),
+        ).where(summary.row_count > 0)
 
         if station_id:
-            query = query.where(column("station_id") == station_id)
+            query = query.where(summary.station_id == station_id)
         if year:
-            query = query.where(column("year") == year)
+            query = query.where(summary.year == year)
 
-        query = query.offset(offset).limit(limit)
+        query = (
+            query.order_by(summary.station_id, summary.year).offset(offset).limit(limit)
+        )
         results = (await session.execute(query)).fetchall()
 
-        # Convert rows into models while filtering out invalid float values
-        def sanitize_float(value):
-            return (
-                value
-                if value is not None
-                and not (pd.isna(value) or value in [float("inf"), float("-inf")])
-                else None
-            )
-
-        return [
-            WeatherStatsModel(
-                station_id=row.station_id,
-                year=row.year,
-                avg_max_temp=sanitize_float(row.avg_max_temp),
-                avg_min_temp=sanitize_float(row.avg_min_temp),
-                total_precipitation=sanitize_float(row.total_precipitation),
-            )
-            for row in results
-        ]
+        # NaN and inf become null during serialization
+        content = rows_to_json(results, WEATHER_STATS_COLUMNS)
+        stats_cache.set(cache_key, content, station_id or None)
+        return json_bytes_response(content, validators)
 
     except Exception as e:
         logging.error(f"Error retrieving weather stats: {e}")
         raise HTTPException(status_code=500, detail="Internal server error.")
+
+
+def _clean_float(value):
+    # Rows loaded before missing measurements were stored as NULL may hold NaN
+    return None if value is None or math.isnan(value) else value
+
+
+def serialize_export_rows(rows, export_format: str) -> str:
+    """
+    Serialize one batch of weather rows as NDJSON lines or CSV records.
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(
+            (
+                row.station_id,
+                row.date.isoformat(),
+                *("" if v is None else v for v in map(_clean_float, row[2:])),
+            )
+            for row in rows
+        )
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(
+            {
+                "station_id": row.station_id,
+                "date": row.date.isoformat(),
+                "max_temp": _clean_float(row.max_temp),
+                "min_temp": _clean_float(row.min_temp),
+                "precipitation": _clean_float(row.precipitation),
+            }
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+async def stream_weather_export(query, export_format: str) -> AsyncIterator[str]:
+    """
+    Stream the rows of `query` from a server-side cursor, one batch at a time.
+
+    Uses its own session so the cursor stays open for as long as the response
+    is being sent.
+    """
+    if export_format == "csv":
+        yield "station_id,date,max_temp,min_temp,precipitation\n"
+    async with AsyncSessionLocal() as export_session:
+        result = await export_session.stream(
+            query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            yield serialize_export_rows(rows, export_format)
+
+
+@router.get(
+    "/weather/export",
+    summary="Export Weather Data",
+    description=(
+        "Stream every weather record matching the filters as NDJSON or CSV. Rows "
+        "are read from a server-side cursor and written as they arrive, so there "
+        "is no row limit and memory use does not depend on the result size."
+    ),
+    tags=["Weather Data"],
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Matching weather records, ordered by station and date.",
+            "content": {
+                "application/x-ndjson": {
+                    "example": '{"station_id": "USC00338552", "date": "1985-01-01", '
+                    '"max_temp": 15.6, "min_temp": 0.0, "precipitation": 5.8}\n'
+                },
+                "text/csv": {
+                    "example": "station_id,date,max_temp,min_temp,precipitation\n"
+                    "USC00338552,1985-01-01,15.6,0.0,5.8\n"
+                },
+            },
+        },
+        400: {"description": "Invalid query parameters."},
+    },
+)
+async def export_weather_data(
+    station_id: str = Query(None, description="Filter by station ID"),
+    start_date: str = Query(None, description="Start date for filtering (YYYY-MM-DD)"),
+    end_date: str = Query(None, description="End date for filtering (YYYY-MM-DD)"),
+    format: str = Query("ndjson", description="Export format (ndjson or csv)"),
+):
+    """
+    Stream all matching weather data as NDJSON or CSV.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="Invalid export format.")
+
+    query = select(
+        column("station_id"),
+        column("date"),
+        column("max_temp"),
+        column("min_temp"),
+        column("precipitation"),
+    ).select_from(weather_data_source(WEATHER_STORAGE))
+    query = apply_weather_filters(query, station_id, start_date, end_date)
+    query = query.order_by(sort_column("station_id", WEATHER_STORAGE), column("date"))
+
+    headers = {}
+    if format == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="weather_data.csv"'
+    return StreamingResponse(
+        stream_weather_export(query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers,
+    )
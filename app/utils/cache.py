@@ -0,0 +1,129 @@
+# app/utils/cache.py
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+import time
+
+from app.config import (
+    STATS_CACHE_SIZE,
+    STATS_CACHE_TTL_SECONDS,
+    WEATHER_DATA_CACHE_SIZE,
+    WEATHER_DATA_CACHE_TTL_SECONDS,
+)
+
+
+class QueryCache:
+    """
+    Bounded LRU cache with a TTL, for responses of read endpoints.
+
+    Every entry is tagged with the station it was filtered on, or None when
+    the query spans all stations. Invalidating a station drops its own
+    entries and every untagged one. The cache is per process.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        """
+        Initialize the cache.
+
+        Args:
+            name (str): Name reported in the diagnostics.
+            max_entries (int): Maximum number of entries; 0 disables caching.
+            ttl_seconds (float): Seconds an entry stays valid.
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None on a miss or expired entry.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, station_id: Optional[str]) -> None:
+        """
+        Store a value, evicting the least recently used entries when full.
+
+        Args:
+            key (Hashable): Normalized query parameters.
+            value (Any): Value to cache.
+            station_id (Optional[str]): Station the query is filtered on, or None.
+        """
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, station_id, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_stations(self, station_ids: Iterable[str]) -> int:
+        """
+        Drop entries for the given stations and all entries spanning every station.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        station_ids = set(station_ids)
+        stale = [
+            key
+            for key, (_, tag, _) in self._entries.items()
+            if tag is None or tag in station_ids
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the counters used to size the cache.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+stats_cache = QueryCache("weather_stats", STATS_CACHE_SIZE, STATS_CACHE_TTL_SECONDS)
+weather_data_cache = QueryCache(
+    "weather_data", WEATHER_DATA_CACHE_SIZE, WEATHER_DATA_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_station_caches(station_ids: Iterable[str]) -> None:
+    """
+    Invalidate every read cache for stations that just received new rows.
+    """
+    station_ids = list(station_ids)
+    for cache in (stats_cache, weather_data_cache):
+        cache.invalidate_stations(station_ids)
@@ -0,0 +1,124 @@
+# app/utils/dataset_version.py
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import DATA_VERSION_TTL_SECONDS, HTTP_CACHE_MAX_AGE_SECONDS
+from app.db.data_versions import ALL_DATA_SCOPE, fetch_data_versions
+from app.utils.cache import invalidate_station_caches
+
+
+class DatasetVersion:
+    """
+    Short-lived copy of the data_versions table, global and per station.
+
+    Every load transaction that changes rows bumps the version of all data
+    and of each station it touched. Read endpoints derive their ETag and
+    Last-Modified headers from these versions, so every process hands out
+    the same validators. The table is re-read at most once per TTL; when a
+    station's version changed since the last read, the cached responses for
+    it are invalidated, whichever process ingested the rows.
+    """
+
+    def __init__(self, ttl_seconds: float = DATA_VERSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._versions: Dict[str, Tuple[int, float]] = {}
+        self._expires_at = 0.0
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """
+        Re-read the versions if the copy is older than the TTL.
+        """
+        if self._expires_at > time.monotonic():
+            return
+        rows = await fetch_data_versions(session)
+        versions = {
+            scope: (version, modified_at.timestamp())
+            for scope, (version, modified_at) in rows.items()
+        }
+        changed = [
+            scope
+            for scope, version in versions.items()
+            if scope != ALL_DATA_SCOPE and self._versions.get(scope) != version
+        ]
+        if changed:
+            invalidate_station_caches(changed)
+        self._versions = versions
+        self._expires_at = time.monotonic() + self.ttl_seconds
+
+    async def get(
+        self, session: AsyncSession, station_id: Optional[str] = None
+    ) -> Tuple[int, float]:
+        """
+        Return (version, last modified timestamp) for a station, or for all data.
+        """
+        await self.refresh(session)
+        # Scopes that were never ingested have version 0, modified at the epoch
+        return self._versions.get(station_id or ALL_DATA_SCOPE, (0, 0.0))
+
+    def expire(self) -> None:
+        """
+        Make the next get() re-read the versions, e.g. after a local load.
+        """
+        self._expires_at = 0.0
+
+    def reset(self) -> None:
+        self.__init__(self.ttl_seconds)
+
+
+dataset_version = DatasetVersion()
+
+
+async def conditional_headers(
+    session: AsyncSession, station_id: Optional[str] = None, variant: str = ""
+) -> dict:
+    """
+    Build ETag, Last-Modified and Cache-Control headers for a read response.
+
+    Args:
+        session (AsyncSession): SQLAlchemy asynchronous session, used when the
+            data versions are due for a refresh.
+        station_id (Optional[str]): Station the query is filtered on, or None.
+        variant (str, optional): Distinguishes representations of the same
+            data, e.g. the response format.
+
+    Returns:
+        dict: Response headers.
+    """
+    version, modified_at = await dataset_version.get(session, station_id or None)
+    scope = f"s:{station_id}" if station_id else "all"
+    # The timestamp keeps tags distinct if the table is ever recreated
+    etag = f'W/"{scope}-{version}-{int(modified_at * 1000)}'
+    if variant:
+        etag += f"-{variant}"
+    return {
+        "ETag": etag + '"',
+        "Last-Modified": formatdate(modified_at, usegmt=True),
+        "Cache-Control": f"max-age={HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate",
+    }
+
+
+def is_not_modified(request_headers, headers: dict) -> bool:
+    """
+    Check the request's If-None-Match / If-Modified-Since against `headers`.
+
+    If-None-Match takes precedence; If-Modified-Since is only used without it.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: W/"x" and "x" match
+        etag = headers["ETag"].removeprefix("W/")
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+            modified = parsedate_to_datetime(headers["Last-Modified"])
+        except (TypeError, ValueError):
+            return False
+        return modified <= since
+    return False
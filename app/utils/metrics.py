@@ -0,0 +1,115 @@
+# app/utils/metrics.py
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being handled, by route template.",
+    ["method", "route"],
+)
+
+ETL_RUNS = Counter(
+    "etl_runs_total", "ETL runs by ETL class and outcome.", ["etl_class", "status"]
+)
+ETL_ROWS_EXTRACTED = Counter(
+    "etl_rows_extracted_total", "Raw rows read from uploaded files.", ["etl_class"]
+)
+ETL_ROWS_INSERTED = Counter(
+    "etl_rows_inserted_total", "Rows inserted into the database.", ["etl_class"]
+)
+ETL_DUPLICATES_SKIPPED = Counter(
+    "etl_duplicates_skipped_total",
+    "Raw rows neither inserted nor updated: blank, duplicated in the file or "
+    "already stored unchanged.",
+    ["etl_class"],
+)
+ETL_PHASE_SECONDS = Histogram(
+    "etl_phase_duration_seconds",
+    "Seconds spent per ETL phase (extract, transform, load).",
+    ["etl_class", "phase"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+def record_etl_run(etl_class: str, feedback: dict) -> None:
+    """
+    Record the feedback of a successful ETL run.
+
+    Args:
+        etl_class (str): Name of the ETL class that ran.
+        feedback (dict): Feedback returned by run_etl / run_etl_stream.
+    """
+    ETL_RUNS.labels(etl_class, "success").inc()
+    ETL_ROWS_EXTRACTED.labels(etl_class).inc(feedback["total_records"])
+    ETL_ROWS_INSERTED.labels(etl_class).inc(feedback["inserted_records"])
+    ETL_DUPLICATES_SKIPPED.labels(etl_class).inc(
+        max(
+            0,
+            feedback["total_records"]
+            - feedback["inserted_records"]
+            - feedback.get("updated_records", 0),
+        )
+    )
+    for phase, seconds in feedback["phase_timings"].items():
+        ETL_PHASE_SECONDS.labels(etl_class, phase).observe(seconds)
+
+
+def record_etl_failure(etl_class: str) -> None:
+    ETL_RUNS.labels(etl_class, "failure").inc()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Return the path template of the route matching `scope`, e.g. /api/jobs/{job_id}.
+
+    Unmatched paths share one label so scans cannot blow up the series count.
+    """
+    for route in scope["app"].routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware that records latency and in-flight requests per route.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(
+                time.perf_counter() - start
+            )
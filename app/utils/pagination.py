@@ -0,0 +1,47 @@
+# app/utils/pagination.py
+from datetime import date
+from typing import List, Tuple
+import base64
+import json
+
+
+def encode_cursor(order_by: str, order_direction: str, values: List) -> str:
+    """
+    Encode the sort keys of the last row of a page into an opaque cursor.
+
+    Args:
+        order_by (str): Column the page is ordered by.
+        order_direction (str): "asc" or "desc".
+        values (List): Keyset values of the last row; dates are stored as ISO strings.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    payload = {
+        "o": order_by,
+        "d": order_direction,
+        "k": [v.isoformat() if isinstance(v, date) else v for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str, List]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string from a previous response.
+
+    Returns:
+        Tuple[str, str, List]: Order column, order direction and raw keyset values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        return payload["o"], payload["d"], list(payload["k"])
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
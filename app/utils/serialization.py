@@ -0,0 +1,31 @@
+from typing import Iterable, Optional, Sequence
+
+import orjson
+from fastapi import Response
+
+
+def rows_to_json(rows: Iterable[Sequence], columns: Sequence[str]) -> bytes:
+    """
+    Serialize result rows as a JSON array of objects in one pass.
+
+    orjson writes dates as ISO strings and NaN/inf as null natively, so rows go
+    straight to bytes without building Pydantic models or checking each float.
+
+    Args:
+        rows (Iterable[Sequence]): Result rows with values in `columns` order.
+        columns (Sequence[str]): Object keys, one per value.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return orjson.dumps([dict(zip(columns, row)) for row in rows])
+
+
+def json_bytes_response(content: bytes, headers: Optional[dict] = None) -> Response:
+    """
+    Wrap pre-serialized JSON so FastAPI sends it as is.
+
+    Returning a Response skips response_model validation, while the route's
+    response_model still documents the payload in the OpenAPI schema.
+    """
+    return Response(content=content, media_type="application/json", headers=headers)
@@ -1,62 +1,270 @@
 import os
-import requests
+import asyncio
+import json
 import logging
+import hashlib
+import random
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 import argparse
-import sys
 
-# Configure logging
-logging.basicConfig(
-    filename="scripts/upload_all_files.log",
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+import httpx
 
 # Configuration
 # DEFAULT_API_URL = "http://localhost:8000/api/upload_file"  # Update if different
-DEFAULT_API_URL = "https://weather-api-assignment-production.up.railway.app/api/upload_file"
+DEFAULT_API_URL = (
+    "https://weather-api-assignment-production.up.railway.app/api/upload_file"
+)
 DEFAULT_DATA_DIR = Path(
     "/Users/gavinnelson/coderepos/weather-api-assignment/data/wx_data"
 )  # Adjust the path as needed
 ALLOWED_EXTENSIONS = {".txt"}
 
+# Uploads in flight at once. The server parses each upload in its ETL process
+# pool and holds a DB connection while loading, so keep this near
+# ETL_PROCESS_POOL_SIZE rather than raising it for throughput.
+DEFAULT_CONCURRENCY = 4
+# Attempts per file after the first one, on 5xx responses, timeouts and
+# connection errors; waits BACKOFF_BASE_SECONDS * 2**attempt plus jitter.
+DEFAULT_RETRIES = 4
+BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_TIMEOUT_SECONDS = 300.0
+# Files uploaded by earlier runs (name -> SHA-256), so a crashed run resumes
+DEFAULT_STATE_FILE = Path("scripts/upload_state.json")
+
 
 def get_all_files(directory: Path, allowed_extensions: set) -> List[Path]:
     """Retrieve all files with allowed extensions from the specified directory."""
     if not directory.exists():
         logging.error(f"Data directory does not exist: {directory}")
         return []
-    files = [
+    files = sorted(
         file
         for file in directory.iterdir()
         if file.suffix in allowed_extensions and file.is_file()
-    ]
+    )
     logging.info(f"Found {len(files)} files to upload in {directory}.")
     return files
 
 
-def upload_file(file_path: Path, api_url: str) -> bool:
-    """Upload a single file to the API."""
+def file_checksum(file_path: Path) -> str:
+    """SHA-256 of a file's content, as recorded in the server's ingestion manifest."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def manifest_url_for(api_url: str) -> str:
+    """Derive the manifest check endpoint from the upload endpoint URL."""
+    return api_url.rsplit("/", 1)[0] + "/manifest/check"
+
+
+class UploadState:
+    """
+    Files a previous run uploaded, kept in a JSON file mapping name to SHA-256.
+
+    The file is rewritten after every upload (atomically, via a temporary file),
+    so a crashed or interrupted run loses at most the uploads in flight. A file
+    whose content changed since is uploaded again.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = path
+        self.done: Dict[str, str] = {}
+        if path and path.exists():
+            try:
+                self.done = json.loads(path.read_text())
+            except ValueError as e:
+                logging.warning(f"Ignoring unreadable state file {path}: {e}")
+
+    def is_done(self, file_path: Path, checksum: str) -> bool:
+        return self.done.get(file_path.name) == checksum
+
+    def mark_done(self, file_path: Path, checksum: str) -> None:
+        self.done[file_path.name] = checksum
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.done, indent=1, sort_keys=True))
+        os.replace(temporary, self.path)
+
+
+async def find_unchanged_files(
+    client: httpx.AsyncClient, checksums: Dict[Path, str], api_url: str
+) -> Set[str]:
+    """
+    Ask the API which files were already ingested with the same content.
+
+    Returns the names of the unchanged files, or an empty set if the check fails,
+    in which case every file is uploaded (the server still skips unchanged ones).
+    """
+    payload = {
+        "files": [
+            {"filename": file.name, "checksum": checksum}
+            for file, checksum in checksums.items()
+        ]
+    }
     try:
-        with open(file_path, "rb") as f:
-            files = {"file": (file_path.name, f, "text/plain")}
-            response = requests.post(api_url, files=files)
-
-        if response.status_code == 200:
-            logging.info(f"Successfully uploaded {file_path.name}: {response.json()}")
-            return True
-        else:
-            logging.error(
-                f"Failed to upload {file_path.name}: {response.status_code} - {response.text}"
-            )
-            return False
+        response = await client.post(manifest_url_for(api_url), json=payload)
+        response.raise_for_status()
+        return set(response.json()["unchanged"])
     except Exception as e:
-        logging.error(f"Exception uploading {file_path.name}: {e}")
-        return False
+        logging.warning(f"Manifest check failed, uploading every file: {e}")
+        return set()
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_SECONDS) -> float:
+    """Seconds to wait before retry `attempt` (0-based): exponential plus jitter."""
+    return base * 2**attempt + random.uniform(0, base)
 
 
-def main(api_url: Optional[str] = None, data_dir: Optional[str] = None):
+async def upload_file(
+    client: httpx.AsyncClient,
+    file_path: Path,
+    api_url: str,
+    force: bool = False,
+    retries: int = DEFAULT_RETRIES,
+    backoff_base: float = BACKOFF_BASE_SECONDS,
+) -> Optional[dict]:
+    """
+    Upload a single file to the API, retrying on 5xx responses and timeouts.
+
+    Returns the ETL feedback from the response, or None if the upload failed.
+    """
+    content = file_path.read_bytes()
+    params = {"force": "true"} if force else None
+    for attempt in range(retries + 1):
+        try:
+            response = await client.post(
+                api_url,
+                files={"file": (file_path.name, content, "text/plain")},
+                params=params,
+            )
+            if response.status_code == 200:
+                feedback = response.json().get("details", {})
+                logging.info(f"Successfully uploaded {file_path.name}: {feedback}")
+                return feedback
+            error = f"{response.status_code} - {response.text}"
+            if response.status_code < 500:
+                logging.error(f"Failed to upload {file_path.name}: {error}")
+                return None
+        except (httpx.TimeoutException, httpx.TransportError) as e:
+            error = f"{type(e).__name__}: {e}"
+        if attempt < retries:
+            delay = backoff_delay(attempt, backoff_base)
+            logging.warning(
+                f"Upload of {file_path.name} failed ({error}); "
+                f"retry {attempt + 1}/{retries} in {delay:.1f}s."
+            )
+            await asyncio.sleep(delay)
+    logging.error(
+        f"Failed to upload {file_path.name} after {retries + 1} attempts: {error}"
+    )
+    return None
+
+
+async def upload_all(
+    files: List[Path],
+    api_url: str,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    state: Optional[UploadState] = None,
+    backoff_base: float = BACKOFF_BASE_SECONDS,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> dict:
+    """
+    Upload files concurrently over one keep-alive HTTP client.
+
+    Unless `force` is set, files recorded in `state` with the same content and
+    files the ingestion manifest lists as unchanged are skipped. Uploaded files
+    are recorded in `state` either way.
+
+    Returns a summary with file counts, rows, elapsed seconds and throughput.
+    """
+    state = state or UploadState(None)
+    start = time.perf_counter()
+    checksums = {file: file_checksum(file) for file in files}
+    if force:
+        resumed, pending = [], list(files)
+    else:
+        resumed = [file for file in files if state.is_done(file, checksums[file])]
+        pending = [file for file in files if not state.is_done(file, checksums[file])]
+    summary = {
+        "files": len(files),
+        "resumed": len(resumed),
+        "unchanged": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "total_records": 0,
+        "inserted_records": 0,
+    }
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(
+        limits=limits, timeout=timeout, transport=transport
+    ) as client:
+        if not force and pending:
+            unchanged = await find_unchanged_files(
+                client, {file: checksums[file] for file in pending}, api_url
+            )
+            for file in pending:
+                if file.name in unchanged:
+                    state.mark_done(file, checksums[file])
+            summary["unchanged"] = len(unchanged)
+            pending = [file for file in pending if file.name not in unchanged]
+
+        async def bounded_upload(file: Path) -> None:
+            async with semaphore:
+                feedback = await upload_file(
+                    client, file, api_url, force, retries, backoff_base
+                )
+            if feedback is None:
+                summary["failed"] += 1
+                print(f"FAILED   {file.name}")
+                return
+            state.mark_done(file, checksums[file])
+            if feedback.get("unchanged"):
+                summary["unchanged"] += 1
+                print(f"unchanged {file.name}")
+                return
+            summary["succeeded"] += 1
+            summary["total_records"] += feedback.get("total_records", 0)
+            summary["inserted_records"] += feedback.get("inserted_records", 0)
+            print(
+                f"uploaded {file.name}: {feedback.get('total_records', 0)} rows "
+                f"in {feedback.get('time_taken', 0)}s"
+            )
+
+        await asyncio.gather(*(bounded_upload(file) for file in pending))
+
+    elapsed = time.perf_counter() - start
+    uploaded = summary["succeeded"] + summary["failed"]
+    summary["elapsed_seconds"] = round(elapsed, 2)
+    summary["files_per_second"] = round(uploaded / elapsed, 2) if elapsed else 0.0
+    summary["rows_per_second"] = (
+        round(summary["total_records"] / elapsed, 1) if elapsed else 0.0
+    )
+    return summary
+
+
+def main(
+    api_url: Optional[str] = None,
+    data_dir: Optional[str] = None,
+    force: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    state_file: Optional[str] = str(DEFAULT_STATE_FILE),
+):
     """Main function to upload all files."""
     api_url = api_url or DEFAULT_API_URL
     data_dir = Path(data_dir) if data_dir else DEFAULT_DATA_DIR
@@ -71,22 +279,31 @@ def main(api_url: Optional[str] = None, data_dir: Optional[str] = None):
         print("No files found to upload. Check the log for details.")
         return
 
-    success = 0
-    failure = 0
-    for file in files:
-        print(f"Uploading {file.name}...")
-        if upload_file(file, api_url):
-            success += 1
-        else:
-            failure += 1
+    state = UploadState(Path(state_file) if state_file else None)
+    summary = asyncio.run(
+        upload_all(files, api_url, force, concurrency, retries, timeout, state)
+    )
 
-    logging.info(f"Upload completed: {success} succeeded, {failure} failed.")
+    logging.info(f"Upload completed: {summary}")
     print(
-        f"Upload completed: {success} succeeded, {failure} failed. Check 'upload_all_files.log' for details."
+        f"Upload completed: {summary['succeeded']} succeeded, {summary['failed']} "
+        f"failed, {summary['unchanged']} unchanged, {summary['resumed']} already "
+        f"done by an earlier run.\n"
+        f"{summary['files_per_second']} files/sec, {summary['rows_per_second']} "
+        f"rows/sec ({summary['total_records']} rows, {summary['inserted_records']} "
+        f"inserted) in {summary['elapsed_seconds']}s. "
+        f"Check 'upload_all_files.log' for details."
     )
 
 
 if __name__ == "__main__":
+    # Configure logging
+    logging.basicConfig(
+        filename="scripts/upload_all_files.log",
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
     parser = argparse.ArgumentParser(
         description="Upload all weather data files to the API."
     )
@@ -102,6 +319,48 @@ if __name__ == "__main__":
         default=str(DEFAULT_DATA_DIR),
         help="The directory containing the data files to upload (default: ../data/code-challenge-template/wx_data)",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upload and ingest every file, even those the state file or the ingestion manifest lists as done",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Uploads in flight at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per file on 5xx responses and timeouts (default: {DEFAULT_RETRIES})",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT_SECONDS,
+        help=f"Seconds before a request times out (default: {DEFAULT_TIMEOUT_SECONDS:g})",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        default=str(DEFAULT_STATE_FILE),
+        help=f"Where finished uploads are recorded so a rerun resumes (default: {DEFAULT_STATE_FILE})",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignore and do not write the state file",
+    )
 
     args = parser.parse_args()
-    main(api_url=args.api_url, data_dir=args.data_dir)
+    main(
+        api_url=args.api_url,
+        data_dir=args.data_dir,
+        force=args.force,
+        concurrency=args.concurrency,
+        retries=args.retries,
+        timeout=args.timeout,
+        state_file=None if args.no_resume else args.state_file,
+    )
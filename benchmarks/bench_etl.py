@@ -0,0 +1,168 @@
+"""
+Throughput and memory benchmark of the WeatherETL phases.
+
+Generates deterministic station files (see benchmarks/wx_generator.py) and
+runs WeatherETL.extract, transform and load on each of them, timing every
+phase separately, against a local Postgres. Tables are created in a scratch
+schema. A second pass over a sample of the files repeats every phase with
+tracemalloc on to record peak memory without slowing down the timed pass.
+Results are printed and written as JSON.
+
+Usage:
+    python -m benchmarks.bench_etl --stations 200 --years 30 --load-mode copy
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import platform
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.schema import Base
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.instrumentation import measure_phase
+from benchmarks.wx_generator import iter_stations
+
+SCHEMA = "bench_etl"
+PHASES = ("extract", "transform", "load")
+
+
+async def run_file(etl: WeatherETL, filename: str, content: bytes, trace: bool):
+    """
+    Run the three phases on one file and return (raw rows, inserted, stats per phase).
+    """
+    with measure_phase(trace_memory=trace) as extract_stats:
+        raw_data = etl.extract(content, filename)
+    with measure_phase(trace_memory=trace) as transform_stats:
+        transformed = etl.transform(raw_data)
+    with measure_phase(trace_memory=trace) as load_stats:
+        inserted = await etl.load(transformed)
+    stats = {"extract": extract_stats, "transform": transform_stats, "load": load_stats}
+    return len(raw_data), inserted, stats
+
+
+def summarize(rows: int, seconds: float) -> dict:
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds) if seconds else None,
+    }
+
+
+async def main(args):
+    load_dotenv()
+    engine = create_async_engine(
+        os.getenv("DATABASE_URL"),
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+
+    totals = {phase: {"rows": 0, "seconds": 0.0} for phase in PHASES}
+    raw_rows = inserted_rows = file_bytes = 0
+    memory = {phase: 0 for phase in PHASES}
+    print(
+        f"Timing {args.stations} stations x {args.years} years "
+        f"(load mode {args.load_mode})..."
+    )
+    try:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            etl = WeatherETL(session, load_mode=args.load_mode)
+            wall_start = time.perf_counter()
+            for filename, content in iter_stations(
+                args.stations, args.years, args.seed
+            ):
+                file_bytes += len(content)
+                raw, inserted, stats = await run_file(etl, filename, content, False)
+                raw_rows += raw
+                inserted_rows += inserted
+                totals["extract"]["rows"] += raw
+                totals["transform"]["rows"] += raw
+                totals["load"]["rows"] += inserted
+                for phase in PHASES:
+                    totals[phase]["seconds"] += stats[phase]["wall_seconds"]
+            wall_seconds = time.perf_counter() - wall_start
+
+            # Memory pass: reload a sample into empty tables with tracemalloc on
+            sample = min(args.memory_sample, args.stations)
+            print(f"Tracing memory on {sample} stations...")
+            await session.execute(text("TRUNCATE weather_data, weather_stats_summary"))
+            await session.commit()
+            for filename, content in iter_stations(sample, args.years, args.seed):
+                _, _, stats = await run_file(etl, filename, content, True)
+                for phase in PHASES:
+                    memory[phase] = max(
+                        memory[phase], stats[phase]["peak_memory_bytes"]
+                    )
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+    results = {
+        "benchmark": "etl",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "stations": args.stations,
+        "years": args.years,
+        "seed": args.seed,
+        "load_mode": args.load_mode,
+        "file_megabytes": round(file_bytes / 1e6, 1),
+        "raw_rows": raw_rows,
+        "inserted_rows": inserted_rows,
+        "wall_seconds": round(wall_seconds, 3),
+        "rows_per_second": round(raw_rows / wall_seconds) if wall_seconds else None,
+        "memory_sample_stations": sample,
+        "phases": {
+            phase: {
+                **summarize(totals[phase]["rows"], totals[phase]["seconds"]),
+                "peak_memory_bytes_per_file": memory[phase],
+            }
+            for phase in PHASES
+        },
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    print(f"{'phase':10} {'rows':>12} {'seconds':>10} {'rows/s':>12} {'peak MiB':>9}")
+    for phase, result in results["phases"].items():
+        print(
+            f"{phase:10} {result['rows']:>12} {result['seconds']:>10}"
+            f" {result['rows_per_second'] or '-':>12}"
+            f" {result['peak_memory_bytes_per_file'] / 2**20:>9.1f}"
+        )
+    print(f"Overall: {results['rows_per_second']} raw rows/s")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=200)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-mode", choices=["copy", "values"], default="copy")
+    parser.add_argument(
+        "--memory-sample",
+        type=int,
+        default=10,
+        help="Stations re-run with tracemalloc for peak memory",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results") / f"etl-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the scratch schema afterwards"
+    )
+    asyncio.run(main(parser.parse_args()))
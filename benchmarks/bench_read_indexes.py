@@ -0,0 +1,223 @@
+"""
+EXPLAIN ANALYZE benchmark for the weather read-path indexes.
+
+Builds a synthetic copy of weather_data / weather_stats_summary in a scratch
+schema, runs the queries behind /api/weather and /api/weather/stats with
+EXPLAIN (ANALYZE, BUFFERS), adds the indexes from migration b8e5d0c27f4a and
+runs them again. Results are printed and written as JSON.
+
+Usage:
+    python -m benchmarks.bench_read_indexes --stations 300 --years 30
+"""
+
+from datetime import date, datetime
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import statistics
+
+import asyncpg
+from dotenv import load_dotenv
+
+SCHEMA = "bench_read_indexes"
+
+# Keep in sync with app/db/migrations/versions/b8e5d0c27f4a_add_read_path_indexes.py
+INDEX_DDL = [
+    "CREATE INDEX ix_weather_data_date_station ON weather_data (date, station_id)",
+    "CREATE INDEX ix_weather_stats_summary_year ON weather_stats_summary (year)",
+]
+
+SETUP_SQL = [
+    f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCHEMA}",
+    """
+    CREATE TABLE weather_data (
+        id serial PRIMARY KEY,
+        station_id varchar NOT NULL,
+        date date NOT NULL,
+        max_temp double precision,
+        min_temp double precision,
+        precipitation double precision,
+        CONSTRAINT uq_weather_station_date UNIQUE (station_id, date)
+    )
+    """,
+    # Rows arrive roughly in date order within each station file, and station
+    # files are ingested one after another, like the real data.
+    """
+    INSERT INTO weather_data (station_id, date, max_temp, min_temp, precipitation)
+    SELECT
+        'USC' || lpad(s::text, 8, '0'),
+        d::date,
+        round((random() * 40 - 5)::numeric, 1),
+        round((random() * 30 - 15)::numeric, 1),
+        CASE WHEN random() < 0.7 THEN 0 ELSE round((random() * 30)::numeric, 1) END
+    FROM
+        generate_series(1, $1) AS s,
+        generate_series(make_date(1985, 1, 1), make_date(1984 + $2, 12, 31), '1 day') AS d
+    ORDER BY s, d
+    """,
+    """
+    CREATE TABLE weather_stats_summary (
+        station_id varchar NOT NULL,
+        year integer NOT NULL,
+        row_count integer NOT NULL,
+        sum_max_temp double precision,
+        sum_min_temp double precision,
+        sum_precipitation double precision,
+        PRIMARY KEY (station_id, year)
+    )
+    """,
+    """
+    INSERT INTO weather_stats_summary
+    SELECT station_id, EXTRACT(YEAR FROM date)::integer, COUNT(*),
+           SUM(max_temp), SUM(min_temp), SUM(precipitation)
+    FROM weather_data
+    GROUP BY 1, 2
+    """,
+]
+
+# The statements the API issues, with representative parameters.
+QUERIES = {
+    "weather_date_range": (
+        "SELECT station_id, date, max_temp, min_temp, precipitation "
+        "FROM weather_data WHERE date >= $1 AND date <= $2 "
+        "ORDER BY date, station_id LIMIT 100",
+        lambda years: [date(1984 + years // 2, 6, 1), date(1984 + years // 2, 6, 30)],
+    ),
+    "weather_first_page_by_date": (
+        "SELECT station_id, date, max_temp, min_temp, precipitation "
+        "FROM weather_data ORDER BY date, station_id LIMIT 100",
+        lambda years: [],
+    ),
+    "weather_keyset_page_by_date": (
+        "SELECT station_id, date, max_temp, min_temp, precipitation "
+        "FROM weather_data WHERE (date, station_id) > ($1, $2) "
+        "ORDER BY date, station_id LIMIT 100",
+        lambda years: [date(1984 + years // 2, 1, 1), "USC00000001"],
+    ),
+    "weather_station_range": (
+        "SELECT station_id, date, max_temp, min_temp, precipitation "
+        "FROM weather_data WHERE station_id = $1 AND date >= $2 "
+        "ORDER BY date, station_id LIMIT 100",
+        lambda years: ["USC00000001", date(1990, 1, 1)],
+    ),
+    "stats_by_year": (
+        "SELECT station_id, year, sum_max_temp / row_count, "
+        "sum_min_temp / row_count, sum_precipitation "
+        "FROM weather_stats_summary WHERE row_count > 0 AND year = $1 "
+        "ORDER BY station_id, year LIMIT 100",
+        lambda years: [1984 + years // 2],
+    ),
+    "stats_by_station": (
+        "SELECT station_id, year, sum_max_temp / row_count, "
+        "sum_min_temp / row_count, sum_precipitation "
+        "FROM weather_stats_summary WHERE row_count > 0 AND station_id = $1 "
+        "ORDER BY station_id, year LIMIT 100",
+        lambda years: ["USC00000001"],
+    ),
+}
+
+
+async def explain(conn: asyncpg.Connection, sql: str, args: list, runs: int) -> dict:
+    """
+    Run EXPLAIN ANALYZE `runs` times and summarize the plan and timings.
+    """
+    timings = []
+    plan = None
+    for _ in range(runs):
+        result = await conn.fetchval(
+            f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", *args
+        )
+        plan = json.loads(result)[0] if isinstance(result, str) else result[0]
+        timings.append(plan["Execution Time"])
+    nodes = []
+    node = plan["Plan"]
+    while node:
+        name = node["Node Type"]
+        if "Index Name" in node:
+            name += f" using {node['Index Name']}"
+        nodes.append(name)
+        node = (node.get("Plans") or [None])[0]
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "plan": nodes,
+        "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks"),
+        "shared_read_blocks": plan["Plan"].get("Shared Read Blocks"),
+    }
+
+
+async def run_queries(conn: asyncpg.Connection, years: int, runs: int) -> dict:
+    return {
+        name: await explain(conn, sql, make_args(years), runs)
+        for name, (sql, make_args) in QUERIES.items()
+    }
+
+
+async def main(stations: int, years: int, runs: int, output: Path, keep: bool):
+    load_dotenv()
+    dsn = os.getenv("DATABASE_URL").replace("postgresql+asyncpg://", "postgresql://")
+    conn = await asyncpg.connect(dsn)
+    try:
+        print(f"Building {stations} stations x {years} years in schema {SCHEMA}...")
+        await conn.execute(SETUP_SQL[0])
+        await conn.execute(SETUP_SQL[1])
+        await conn.execute(f"SET search_path TO {SCHEMA}")
+        await conn.execute(SETUP_SQL[2])
+        await conn.execute(SETUP_SQL[3], stations, years)
+        await conn.execute(SETUP_SQL[4])
+        await conn.execute(SETUP_SQL[5])
+        await conn.execute("ANALYZE")
+        row_count = await conn.fetchval("SELECT COUNT(*) FROM weather_data")
+
+        before = await run_queries(conn, years, runs)
+        for ddl in INDEX_DDL:
+            await conn.execute(ddl)
+        await conn.execute("ANALYZE")
+        after = await run_queries(conn, years, runs)
+    finally:
+        if not keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+    results = {
+        "benchmark": "read_indexes",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "stations": stations,
+        "years": years,
+        "weather_rows": row_count,
+        "runs": runs,
+        "queries": {
+            name: {"before": before[name], "after": after[name]} for name in QUERIES
+        },
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(f"{'query':32} {'before ms':>10} {'after ms':>10}  plan after")
+    for name in QUERIES:
+        print(
+            f"{name:32} {before[name]['median_ms']:>10} {after[name]['median_ms']:>10}"
+            f"  {' > '.join(after[name]['plan'])}"
+        )
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--stations", type=int, default=300)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--runs", type=int, default=5, help="EXPLAIN runs per query")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"read_indexes-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the scratch schema afterwards"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.stations, args.years, args.runs, args.output, args.keep))
@@ -0,0 +1,189 @@
+"""
+Microbenchmark of the /api/weather and /api/weather/stats response serialization.
+
+Compares the previous path (a Pydantic model per row, validated against the
+route's response_model and rendered by JSONResponse, as FastAPI does) with the
+direct orjson path used by the routes now. No database is needed; rows are
+synthetic tuples shaped like the query results. Results are printed and
+written as JSON.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 1000 --runs 200
+"""
+
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.weather import WeatherDataModel, WeatherStatsModel
+from app.routes.weather_routes import WEATHER_COLUMNS, WEATHER_STATS_COLUMNS
+from app.utils.serialization import json_bytes_response, rows_to_json
+
+
+class AttrRow(tuple):
+    """
+    Tuple with attribute access, like a SQLAlchemy Row.
+    """
+
+    _fields: List[str] = []
+
+    def __getattr__(self, name):
+        return self[self._fields.index(name)]
+
+
+class WeatherRow(AttrRow):
+    _fields = WEATHER_COLUMNS
+
+
+class StatsRow(AttrRow):
+    _fields = WEATHER_STATS_COLUMNS
+
+
+def make_weather_rows(count: int) -> list:
+    start = date(1985, 1, 1)
+    return [
+        WeatherRow(
+            (
+                "USC00110072",
+                start + timedelta(days=i),
+                round(20 + i % 15 * 0.7, 1),
+                # The old path cannot render NaN at all, so gaps are NULLs here
+                None if i % 50 == 0 else round(i % 11 * 0.9 - 3, 1),
+                round(i % 7 * 1.3, 1),
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def make_stats_rows(count: int) -> list:
+    return [
+        StatsRow(
+            (
+                f"USC{i // 30:08d}",
+                1985 + i % 30,
+                16.79 + i % 13 / 7,
+                math.inf if i % 97 == 0 else 5.66 + i % 5 / 3,
+                712.3 + i,
+            )
+        )
+        for i in range(count)
+    ]
+
+
+def sanitize_float(value):
+    # The per-value check the stats route used to run
+    return None if value is None or math.isnan(value) or math.isinf(value) else value
+
+
+async def pydantic_weather(rows: list, field) -> bytes:
+    records = [WeatherDataModel.from_row(row) for row in rows]
+    content = await serialize_response(field=field, response_content=records)
+    return JSONResponse(content).body
+
+
+async def pydantic_stats(rows: list, field) -> bytes:
+    records = [
+        WeatherStatsModel(
+            station_id=row.station_id,
+            year=row.year,
+            avg_max_temp=sanitize_float(row.avg_max_temp),
+            avg_min_temp=sanitize_float(row.avg_min_temp),
+            total_precipitation=sanitize_float(row.total_precipitation),
+        )
+        for row in rows
+    ]
+    content = await serialize_response(field=field, response_content=records)
+    return JSONResponse(content).body
+
+
+async def orjson_path(rows: list, columns: list) -> bytes:
+    return json_bytes_response(rows_to_json(rows, columns)).body
+
+
+async def measure(func, args, runs: int) -> dict:
+    await func(*args)  # warm up
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(sorted(timings)[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+async def main(rows: int, runs: int, output: Path):
+    weather_rows = make_weather_rows(rows)
+    stats_rows = make_stats_rows(rows)
+    weather_field = create_response_field(name="weather", type_=List[WeatherDataModel])
+    stats_field = create_response_field(name="stats", type_=List[WeatherStatsModel])
+
+    # Both paths must produce the same documents
+    assert json.loads(await pydantic_weather(weather_rows, weather_field)) == (
+        json.loads(await orjson_path(weather_rows, WEATHER_COLUMNS))
+    )
+    assert json.loads(await pydantic_stats(stats_rows, stats_field)) == json.loads(
+        await orjson_path(stats_rows, WEATHER_STATS_COLUMNS)
+    )
+
+    cases = {
+        "weather": (
+            (pydantic_weather, (weather_rows, weather_field)),
+            (orjson_path, (weather_rows, WEATHER_COLUMNS)),
+        ),
+        "stats": (
+            (pydantic_stats, (stats_rows, stats_field)),
+            (orjson_path, (stats_rows, WEATHER_STATS_COLUMNS)),
+        ),
+    }
+    results = {
+        "benchmark": "serialization",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "rows": rows,
+        "runs": runs,
+        "endpoints": {},
+    }
+    print(f"{'endpoint':10} {'pydantic ms':>12} {'orjson ms':>10} {'speedup':>8}")
+    for name, ((old_func, old_args), (new_func, new_args)) in cases.items():
+        before = await measure(old_func, old_args, runs)
+        after = await measure(new_func, new_args, runs)
+        speedup = round(before["median_ms"] / after["median_ms"], 1)
+        results["endpoints"][name] = {
+            "pydantic": before,
+            "orjson": after,
+            "speedup": speedup,
+        }
+        print(
+            f"{name:10} {before['median_ms']:>12} {after['median_ms']:>10}"
+            f" {speedup:>7}x"
+        )
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per response")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"serialization-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.runs, args.output))
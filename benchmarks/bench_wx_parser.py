@@ -0,0 +1,143 @@
+"""
+Per-file benchmark of the pandas and arrow wx_data parsers.
+
+Runs WeatherETL.extract and transform with parser="pandas" and parser="arrow"
+on every file of a directory (data/wx_data by default) or on generated
+stations, checks that both produce the same frame, and reports the median
+milliseconds per file and the speedup. No database is needed. Results are
+printed and written as JSON.
+
+Usage:
+    python -m benchmarks.bench_wx_parser data/wx_data --repeat 5
+    python -m benchmarks.bench_wx_parser --generate 50 --years 30
+"""
+
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Iterator, Tuple
+import argparse
+import json
+import logging
+import platform
+import time
+
+import pandas as pd
+
+from app.etl.impl_weather_etl import WeatherETL
+from benchmarks.wx_generator import iter_stations
+
+PARSERS = ("pandas", "arrow")
+
+
+def iter_files(directory: Path) -> Iterator[Tuple[str, bytes]]:
+    for path in sorted(directory.glob("*.txt")):
+        yield path.name, path.read_bytes()
+
+
+def time_parser(etl: WeatherETL, filename: str, content: bytes, repeat: int):
+    """
+    Return (median seconds of extract + transform, transformed frame).
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transformed = etl.transform(etl.extract(content, filename))
+        timings.append(time.perf_counter() - start)
+    return median(timings), transformed
+
+
+def main(args):
+    # Per-file INFO logging would dominate the timings
+    logging.disable(logging.INFO)
+    etls = {parser: WeatherETL(session=None, parser=parser) for parser in PARSERS}
+    if args.generate:
+        files = iter_stations(args.generate, args.years, args.seed)
+        source = f"{args.generate} generated stations x {args.years} years"
+    else:
+        files = iter_files(args.directory)
+        source = str(args.directory)
+
+    per_file = []
+    for filename, content in files:
+        seconds = {}
+        frames = {}
+        for parser, etl in etls.items():
+            seconds[parser], frames[parser] = time_parser(
+                etl, filename, content, args.repeat
+            )
+        pd.testing.assert_frame_equal(frames["arrow"], frames["pandas"])
+        per_file.append(
+            {
+                "file": filename,
+                "bytes": len(content),
+                "rows": len(frames["arrow"]),
+                **{
+                    f"{parser}_ms": round(seconds[parser] * 1000, 3)
+                    for parser in PARSERS
+                },
+                "speedup": round(seconds["pandas"] / seconds["arrow"], 2),
+            }
+        )
+    if not per_file:
+        raise SystemExit(f"No .txt files found in {source}")
+
+    totals = {
+        parser: sum(result[f"{parser}_ms"] for result in per_file) for parser in PARSERS
+    }
+    rows = sum(result["rows"] for result in per_file)
+    results = {
+        "benchmark": "wx_parser",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "source": source,
+        "files": len(per_file),
+        "repeat": args.repeat,
+        "rows": rows,
+        **{
+            f"{parser}_median_ms_per_file": round(
+                median(result[f"{parser}_ms"] for result in per_file), 3
+            )
+            for parser in PARSERS
+        },
+        **{
+            f"{parser}_rows_per_second": round(rows / totals[parser] * 1000)
+            for parser in PARSERS
+        },
+        "speedup": round(totals["pandas"] / totals["arrow"], 2),
+        "per_file": per_file,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    print(f"{'parser':8} {'ms/file':>9} {'rows/s':>12}")
+    for parser in PARSERS:
+        print(
+            f"{parser:8} {results[f'{parser}_median_ms_per_file']:>9}"
+            f" {results[f'{parser}_rows_per_second']:>12}"
+        )
+    print(f"{len(per_file)} files, {results['speedup']}x faster with the arrow parser")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", type=Path, nargs="?", default=Path("data/wx_data"))
+    parser.add_argument(
+        "--generate",
+        type=int,
+        default=0,
+        help="Benchmark this many generated stations instead of a directory",
+    )
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per file and parser"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"wx-parser-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    main(parser.parse_args())
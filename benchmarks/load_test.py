@@ -0,0 +1,289 @@
+"""
+Async load generator for the read API.
+
+Runs a weighted mix of /api/weather and /api/weather/stats scenarios
+(station + date range, date range only, deep offsets, keyset pages, station
+and year stats) against a running app for a fixed duration with a fixed
+number of concurrent clients. Station ids and years are discovered from
+/api/weather/stats, so seed the database first. Reports throughput, error
+counts and p50/p95/p99 latency per endpoint and per scenario, and writes them
+as JSON.
+
+Pass --compare with an earlier result file to exit with status 1 when any
+scenario's p95 got slower by more than --max-regression.
+
+Usage:
+    python -m benchmarks.load_test --base-url http://localhost:8000 --duration 60
+    python -m benchmarks.load_test --compare benchmarks/results/load-before.json
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+import httpx
+
+# name -> (endpoint, weight)
+SCENARIOS = {
+    "weather_station_range": ("/api/weather", 30),
+    "weather_date_range": ("/api/weather", 15),
+    "weather_deep_offset": ("/api/weather", 10),
+    "weather_keyset_page": ("/api/weather", 10),
+    "stats_station": ("/api/weather/stats", 15),
+    "stats_year": ("/api/weather/stats", 15),
+    "stats_station_year": ("/api/weather/stats", 5),
+}
+
+
+class Dataset:
+    """
+    Stations and years present in the database, used to pick parameters.
+    """
+
+    def __init__(self, stations: List[str], years: List[int]):
+        self.stations = stations
+        self.years = years
+
+    def random_range(self, rng: random.Random) -> Tuple[str, str]:
+        start = date(rng.choice(self.years), 1, 1) + timedelta(days=rng.randrange(365))
+        end = start + timedelta(days=rng.choice([7, 30, 90, 365]))
+        return start.isoformat(), end.isoformat()
+
+
+async def discover(client: httpx.AsyncClient, max_pages: int = 50) -> Dataset:
+    """
+    Collect station ids and years from /api/weather/stats.
+    """
+    stations, years = set(), set()
+    for page in range(max_pages):
+        response = await client.get(
+            "/api/weather/stats", params={"limit": 1000, "offset": page * 1000}
+        )
+        response.raise_for_status()
+        rows = response.json()
+        for row in rows:
+            stations.add(row["station_id"])
+            years.add(row["year"])
+        if len(rows) < 1000:
+            break
+    if not stations:
+        raise SystemExit("No statistics found; ingest data before load testing.")
+    return Dataset(sorted(stations), sorted(years))
+
+
+def build_params(
+    scenario: str, data: Dataset, rng: random.Random, max_offset: int
+) -> dict:
+    """
+    Pick random query parameters for one request of `scenario`.
+    """
+    if scenario == "weather_station_range":
+        start, end = data.random_range(rng)
+        return {
+            "station_id": rng.choice(data.stations),
+            "start_date": start,
+            "end_date": end,
+            "limit": 100,
+        }
+    if scenario == "weather_date_range":
+        start, end = data.random_range(rng)
+        return {"start_date": start, "end_date": end, "limit": 100}
+    if scenario == "weather_deep_offset":
+        return {
+            "offset": rng.randrange(max_offset),
+            "limit": 100,
+            "order_by": rng.choice(["date", "station_id"]),
+        }
+    if scenario == "weather_keyset_page":
+        return {"station_id": rng.choice(data.stations), "limit": 1000}
+    if scenario == "stats_station":
+        return {"station_id": rng.choice(data.stations)}
+    if scenario == "stats_year":
+        return {"year": rng.choice(data.years), "limit": 1000}
+    return {"station_id": rng.choice(data.stations), "year": rng.choice(data.years)}
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    data: Dataset,
+    rng: random.Random,
+    deadline: float,
+    max_offset: int,
+    record: Callable[[str, float, Optional[int]], None],
+) -> None:
+    names = list(SCENARIOS)
+    weights = [weight for _, weight in SCENARIOS.values()]
+    cursor: Optional[str] = None
+    walk_params: dict = {}
+    while time.perf_counter() < deadline:
+        scenario = rng.choices(names, weights)[0]
+        params = build_params(scenario, data, rng, max_offset)
+        if scenario == "weather_keyset_page":
+            if cursor:
+                # Continue the previous walk, with the filters it started with
+                params = {**walk_params, "cursor": cursor}
+            else:
+                walk_params = params
+        start = time.perf_counter()
+        try:
+            response = await client.get(SCENARIOS[scenario][0], params=params)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        record(scenario, time.perf_counter() - start, status)
+        if scenario == "weather_keyset_page":
+            cursor = response.headers.get("X-Next-Cursor") if status == 200 else None
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, seconds: float) -> dict:
+    values = sorted(latencies)
+    if not values:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "requests_per_second": round(len(values) / seconds, 1),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2),
+    }
+
+
+def regressions(current: dict, baseline: dict, max_regression: float) -> List[str]:
+    """
+    List scenarios whose p95 got slower than the baseline by more than max_regression.
+    """
+    failures = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name, {}).get("p95_ms")
+        after = result.get("p95_ms")
+        if before and after and after > before * (1 + max_regression):
+            failures.append(f"{name}: p95 {before} ms -> {after} ms")
+    return failures
+
+
+async def main(args) -> int:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        data = await discover(client)
+        print(
+            f"Found {len(data.stations)} stations and {len(data.years)} years. "
+            f"Running {args.concurrency} clients for {args.duration}s..."
+        )
+
+        latencies: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+
+        def record(scenario: str, seconds: float, status: Optional[int]) -> None:
+            if status is not None and status < 400:
+                latencies[scenario].append(seconds)
+            else:
+                errors[scenario] += 1
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(
+            *[
+                worker(
+                    client,
+                    data,
+                    random.Random(rng.random()),
+                    deadline,
+                    args.max_offset,
+                    record,
+                )
+                for _ in range(args.concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+
+    endpoints: Dict[str, List[float]] = defaultdict(list)
+    endpoint_errors: Dict[str, int] = defaultdict(int)
+    for name, (endpoint, _) in SCENARIOS.items():
+        endpoints[endpoint].extend(latencies[name])
+        endpoint_errors[endpoint] += errors[name]
+    all_latencies = [value for values in latencies.values() for value in values]
+
+    results = {
+        "benchmark": "load_test",
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "base_url": args.base_url,
+        "duration_seconds": round(elapsed, 1),
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+        "stations": len(data.stations),
+        "total": summarize(all_latencies, sum(errors.values()), elapsed),
+        "endpoints": {
+            name: summarize(values, endpoint_errors[name], elapsed)
+            for name, values in endpoints.items()
+        },
+        "scenarios": {
+            name: summarize(latencies[name], errors[name], elapsed)
+            for name in SCENARIOS
+        },
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(results, indent=2))
+
+    print(
+        f"{'':24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    )
+    rows = {**results["endpoints"], **results["scenarios"], "total": results["total"]}
+    for name, result in rows.items():
+        print(
+            f"{name:24} {result.get('requests_per_second', 0):>8}"
+            f" {result.get('p50_ms', '-'):>8} {result.get('p95_ms', '-'):>8}"
+            f" {result.get('p99_ms', '-'):>8} {result['errors']:>7}"
+        )
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        failures = regressions(results, baseline, args.max_regression)
+        for failure in failures:
+            print(f"REGRESSION {failure}")
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--max-offset", type=int, default=100_000, help="Largest deep offset"
+    )
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--compare", type=Path, help="Earlier result file")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Allowed p95 slowdown per scenario with --compare (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("benchmarks/results")
+        / f"load-{datetime.now():%Y%m%d-%H%M%S}.json",
+    )
+    sys.exit(asyncio.run(main(parser.parse_args())))
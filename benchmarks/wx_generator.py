@@ -0,0 +1,114 @@
+"""
+Deterministic generator of station files in the wx_data format.
+
+Each file is named after its station and holds one tab-separated line per
+day: date (YYYYMMDD), max temp, min temp (tenths of a degree C) and
+precipitation (tenths of a mm), right-aligned like the real files. Missing
+values are -9999, a few days have every value missing, and a few lines are
+repeated to exercise duplicate handling. The same seed, station index and
+years always produce the same bytes.
+
+Usage:
+    python -m benchmarks.wx_generator data/generated --stations 3000 --years 30
+"""
+
+from pathlib import Path
+from typing import Iterator, Tuple
+import argparse
+import io
+
+import numpy as np
+
+MISSING = -9999
+
+
+def station_id(index: int) -> str:
+    return f"USC{index:08d}"
+
+
+def generate_station(
+    index: int,
+    years: int = 30,
+    start_year: int = 1985,
+    seed: int = 0,
+    gap_rate: float = 0.02,
+    duplicate_rate: float = 0.005,
+) -> bytes:
+    """
+    Generate the content of one station file.
+
+    Args:
+        index (int): Station number; also part of the random seed.
+        years (int, optional): Number of years of daily data.
+        start_year (int, optional): First year.
+        seed (int, optional): Seed shared by every station of a data set.
+        gap_rate (float, optional): Share of values replaced by -9999.
+        duplicate_rate (float, optional): Share of lines written twice.
+
+    Returns:
+        bytes: File content.
+    """
+    rng = np.random.default_rng([seed, index])
+    days = np.arange(
+        np.datetime64(f"{start_year}-01-01"),
+        np.datetime64(f"{start_year + years}-01-01"),
+    )
+    months = days.astype("datetime64[M]")
+    dates = (
+        (months.astype("datetime64[Y]").astype(np.int64) + 1970) * 10000
+        + (months.astype(np.int64) % 12 + 1) * 100
+        + (days - months).astype(np.int64)
+        + 1
+    )
+
+    # Seasonal temperatures around a per-station climate, in tenths
+    day_of_year = (days - days.astype("datetime64[Y]")).astype(np.int64)
+    season = np.sin(2 * np.pi * (day_of_year - 105) / 365.25)
+    base = rng.normal(120, 40)
+    max_temp = base + 130 * season + rng.normal(0, 35, len(days))
+    min_temp = max_temp - 60 - np.abs(rng.normal(40, 25, len(days)))
+    precipitation = np.where(
+        rng.random(len(days)) < 0.7, 0, rng.gamma(0.8, 60, len(days))
+    )
+    values = np.column_stack([max_temp, min_temp, precipitation]).round()
+    values = values.astype(np.int64)
+
+    values[rng.random(values.shape) < gap_rate] = MISSING
+    values[rng.random(len(days)) < gap_rate / 10] = MISSING
+
+    rows = np.column_stack([dates, values])
+    repeats = np.where(rng.random(len(rows)) < duplicate_rate, 2, 1)
+    rows = np.repeat(rows, repeats, axis=0)
+
+    buffer = io.BytesIO()
+    np.savetxt(buffer, rows, fmt="%d\t%5d\t%5d\t%5d")
+    return buffer.getvalue()
+
+
+def iter_stations(
+    stations: int, years: int = 30, seed: int = 0, first_index: int = 0
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (file name, content) for `stations` consecutive stations.
+    """
+    for index in range(first_index, first_index + stations):
+        yield f"{station_id(index)}.txt", generate_station(index, years, seed=seed)
+
+
+def main(output: Path, stations: int, years: int, seed: int):
+    output.mkdir(parents=True, exist_ok=True)
+    total_bytes = 0
+    for filename, content in iter_stations(stations, years, seed):
+        (output / filename).write_bytes(content)
+        total_bytes += len(content)
+    print(f"Wrote {stations} station files ({total_bytes / 1e6:.1f} MB) to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", type=Path, help="Directory for the station files")
+    parser.add_argument("--stations", type=int, default=100)
+    parser.add_argument("--years", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    main(args.output, args.stations, args.years, args.seed)
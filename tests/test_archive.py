@@ -0,0 +1,143 @@
+# tests/test_archive.py
+
+import asyncio
+import io
+import tarfile
+import threading
+import zipfile
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from app.etl.archive import iter_archive_members
+from app.routes.ingestion_routes import upload_archive
+
+WEATHER_CONTENT = b"20230101\t100\t-50\t5\n"
+YIELD_CONTENT = b"2023\t150\n"
+
+
+def build_zip() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("wx_data/USC00110072.txt", WEATHER_CONTENT)
+        archive.writestr("yld_data/US_corn_grain_yield.txt", YIELD_CONTENT)
+        archive.writestr("__MACOSX/wx_data/._USC00110072.txt", b"junk")
+        archive.writestr("README.md", b"not data")
+    buffer.seek(0)
+    return buffer
+
+
+def build_tar_gz() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in [
+            ("wx_data/USC00110072.txt", WEATHER_CONTENT),
+            ("yld_data/US_corn_grain_yield.txt", YIELD_CONTENT),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.parametrize("build", [build_zip, build_tar_gz])
+def test_iter_archive_members(build):
+    """
+    Test that zip and tar.gz archives yield only data files, by base name.
+    """
+    members = dict(iter_archive_members(build()))
+    assert members == {
+        "USC00110072.txt": WEATHER_CONTENT,
+        "US_corn_grain_yield.txt": YIELD_CONTENT,
+    }
+
+
+def test_iter_archive_members_rejects_plain_files():
+    """
+    Test that a non-archive upload is rejected.
+    """
+    with pytest.raises(ValueError):
+        list(iter_archive_members(io.BytesIO(WEATHER_CONTENT)))
+
+
+@pytest.mark.asyncio
+async def test_upload_archive_reads_members_off_the_event_loop():
+    """
+    Test that archive members are decompressed in a worker thread and each
+    one is handed to the ETL.
+    """
+    loop_thread = threading.get_ident()
+    reader_threads = set()
+
+    def members(fileobj):
+        for name, content in iter_archive_members(fileobj):
+            reader_threads.add(threading.get_ident())
+            yield name, content
+
+    async def ingest(filename, content, force):
+        return {
+            "filename": filename,
+            "status": "success",
+            "details": {"total_records": 1, "inserted_records": 1},
+        }
+
+    upload = UploadFile(file=build_zip(), filename="wx_data.zip")
+    with patch("app.routes.ingestion_routes.iter_archive_members", members), patch(
+        "app.routes.ingestion_routes.ingest_archive_member", ingest
+    ):
+        result = await upload_archive(file=upload, force=False)
+
+    assert result["totals"]["succeeded"] == 2
+    assert reader_threads and loop_thread not in reader_threads
+
+
+def build_corrupt_zip() -> io.BytesIO:
+    # The second member's bytes no longer match its CRC-32
+    buffer = build_zip()
+    data = buffer.getvalue().replace(YIELD_CONTENT, b"2023\t151\n")
+    return io.BytesIO(data)
+
+
+def build_truncated_tar() -> io.BytesIO:
+    # Cut off inside the second member's data
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, content in [
+            ("wx_data/USC00110072.txt", WEATHER_CONTENT),
+            ("yld_data/US_corn_grain_yield.txt", YIELD_CONTENT * 100),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return io.BytesIO(buffer.getvalue()[: 3 * tarfile.BLOCKSIZE + 200])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("build", [build_corrupt_zip, build_truncated_tar])
+async def test_upload_archive_rejects_corrupt_members(build):
+    """
+    Test that an archive that breaks partway through is a 400 and the member
+    ingestions already started are cancelled.
+    """
+    started, cancelled = [], []
+
+    async def ingest(filename, content, force):
+        started.append(filename)
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            cancelled.append(filename)
+            raise
+
+    upload = UploadFile(file=build(), filename="wx_data")
+    with patch("app.routes.ingestion_routes.ingest_archive_member", ingest):
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_archive(file=upload, force=False)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid archive format."
+    await asyncio.sleep(0)
+    assert started == ["USC00110072.txt"]
+    assert cancelled == started
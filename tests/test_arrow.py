@@ -0,0 +1,136 @@
+# tests/test_arrow.py
+
+import io
+import pytest
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import date
+from unittest.mock import AsyncMock
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.arrow_export import (
+    WEATHER_ARROW_SCHEMA,
+    nan_to_null,
+    table_to_bytes,
+    last_row_values,
+)
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.impl_arrow_weather_etl import ArrowWeatherETL, is_columnar_file
+from app.etl.detect import detect_etl_class
+
+WEATHER_TEXT = (
+    b"20230101\t100\t-50\t5\n20230102\t-9999\t-40\t0\n20230102\t110\t-40\t0\n"
+)
+
+
+@pytest.fixture
+def session():
+    return AsyncMock(spec=AsyncSession)
+
+
+@pytest.fixture
+def weather_table():
+    return pa.table(
+        {
+            "date": pa.array([20230101, 20230102, 20230102], pa.int32()),
+            "max_temp": pa.array([100, -9999, 110], pa.int16()),
+            "min_temp": pa.array([-50, -40, -40], pa.int16()),
+            "precipitation": pa.array([5, 0, 0], pa.int16()),
+        }
+    )
+
+
+def parquet_bytes(table: pa.Table) -> bytes:
+    sink = io.BytesIO()
+    pq.write_table(table, sink)
+    return sink.getvalue()
+
+
+def arrow_file_bytes(table: pa.Table) -> bytes:
+    sink = io.BytesIO()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def text_etl_output(session) -> pd.DataFrame:
+    etl = WeatherETL(session)
+    return etl.transform(etl.extract(WEATHER_TEXT, "USC00110072.txt"))
+
+
+@pytest.mark.parametrize(
+    "to_bytes",
+    [parquet_bytes, arrow_file_bytes, lambda t: table_to_bytes(t, "arrow")],
+)
+def test_arrow_etl_matches_text_etl(session, weather_table, to_bytes):
+    """
+    Parquet and Arrow files transform to the same rows as the text format.
+    """
+    etl = ArrowWeatherETL(session)
+    result = etl.transform(etl.extract(to_bytes(weather_table), "USC00110072.parquet"))
+    pd.testing.assert_frame_equal(result, text_etl_output(session))
+
+
+def test_arrow_etl_date_column_and_station_id(session, weather_table):
+    """
+    A real date column and an explicit station_id column are both accepted.
+    """
+    table = weather_table.set_column(
+        0,
+        "date",
+        pa.array([date(2023, 1, 1), date(2023, 1, 2), date(2023, 1, 2)], pa.date32()),
+    ).append_column("station_id", pa.array(["USC00110072"] * 3))
+    etl = ArrowWeatherETL(session)
+    result = etl.transform(etl.extract(parquet_bytes(table), "upload.parquet"))
+    pd.testing.assert_frame_equal(result, text_etl_output(session))
+
+
+def test_arrow_etl_uses_integer_columns(session, weather_table):
+    """
+    Columnar files reach transform as integer columns (no date strings), and
+    nulls or float measurements give the same rows as the text format.
+    """
+    etl = ArrowWeatherETL(session)
+    raw = etl.extract(parquet_bytes(weather_table), "USC00110072.parquet")
+    assert raw["date"].dtype == "int32"
+
+    table = weather_table.set_column(
+        1, "max_temp", pa.array([10.0 * 10, None, 110.0], pa.float64())
+    )
+    result = etl.transform(etl.extract(parquet_bytes(table), "USC00110072.parquet"))
+    pd.testing.assert_frame_equal(result, text_etl_output(session))
+
+
+def test_detect_etl_class_by_magic_bytes(weather_table):
+    """
+    Columnar files are routed to ArrowWeatherETL before the text sniffing.
+    """
+    assert is_columnar_file(parquet_bytes(weather_table))
+    assert detect_etl_class(parquet_bytes(weather_table)) is ArrowWeatherETL
+    assert detect_etl_class(arrow_file_bytes(weather_table)) is ArrowWeatherETL
+    assert detect_etl_class(WEATHER_TEXT) is WeatherETL
+
+
+def test_table_to_bytes_roundtrip():
+    """
+    NaN becomes null and both output formats read back to the same table.
+    """
+    table = pa.table(
+        {
+            "station_id": ["A", "B"],
+            "date": pa.array([date(2023, 1, 1), date(2023, 1, 2)], pa.date32()),
+            "max_temp": [float("nan"), 1.5],
+            "min_temp": [0.5, None],
+            "precipitation": [0.0, 2.0],
+        },
+        schema=WEATHER_ARROW_SCHEMA,
+    )
+    table = nan_to_null(table)
+    assert table.column("max_temp").to_pylist() == [None, 1.5]
+
+    parquet = pq.read_table(io.BytesIO(table_to_bytes(table, "parquet")))
+    stream = pa.ipc.open_stream(table_to_bytes(table, "arrow")).read_all()
+    assert parquet.equals(table)
+    assert stream.equals(table)
+    assert last_row_values(table, ["date", "station_id"]) == [date(2023, 1, 2), "B"]
@@ -0,0 +1,121 @@
+# tests/test_automate_ingestion.py
+
+import json
+
+import httpx
+import pytest
+
+from automate_ingestion import UploadState, file_checksum, upload_all
+
+API_URL = "http://testserver/api/upload_file"
+
+
+def write_files(directory, names):
+    files = []
+    for index, name in enumerate(names):
+        path = directory / name
+        path.write_bytes(f"2023010{index + 1}\t100\t-50\t5\n".encode())
+        files.append(path)
+    return files
+
+
+@pytest.mark.asyncio
+async def test_upload_all_retries_skips_unchanged_and_records_state(tmp_path):
+    """
+    Test that 5xx responses are retried, manifest-unchanged files are not
+    uploaded, and finished files are written to the state file.
+    """
+    files = write_files(tmp_path, ["A.txt", "B.txt", "C.txt"])
+    attempts = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/manifest/check":
+            return httpx.Response(200, json={"unchanged": ["C.txt"], "changed": []})
+        name = "A.txt" if b'filename="A.txt"' in request.content else "B.txt"
+        attempts[name] = attempts.get(name, 0) + 1
+        if name == "A.txt" and attempts[name] == 1:
+            return httpx.Response(503, text="queue full")
+        details = {"total_records": 10, "inserted_records": 10, "time_taken": 0.1}
+        return httpx.Response(200, json={"message": "ok", "details": details})
+
+    state = UploadState(tmp_path / "state.json")
+    summary = await upload_all(
+        files,
+        API_URL,
+        state=state,
+        transport=httpx.MockTransport(handler),
+        backoff_base=0,
+    )
+
+    assert attempts == {"A.txt": 2, "B.txt": 1}
+    assert summary["succeeded"] == 2
+    assert summary["unchanged"] == 1
+    assert summary["failed"] == 0
+    assert summary["total_records"] == 20
+    assert summary["rows_per_second"] > 0
+    assert json.loads((tmp_path / "state.json").read_text()) == {
+        file.name: file_checksum(file) for file in files
+    }
+
+
+@pytest.mark.asyncio
+async def test_upload_all_resumes_from_state_and_gives_up_on_client_errors(
+    tmp_path,
+):
+    files = write_files(tmp_path, ["A.txt", "B.txt"])
+    state = UploadState(tmp_path / "state.json")
+    state.mark_done(files[0], file_checksum(files[0]))
+    uploads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        uploads.append(request.url.path)
+        if request.url.path == "/api/manifest/check":
+            return httpx.Response(200, json={"unchanged": [], "changed": ["B.txt"]})
+        return httpx.Response(400, json={"detail": "Unknown file structure."})
+
+    summary = await upload_all(
+        files,
+        API_URL,
+        state=UploadState(tmp_path / "state.json"),
+        transport=httpx.MockTransport(handler),
+        backoff_base=0,
+    )
+
+    assert uploads == ["/api/manifest/check", "/api/upload_file"]
+    assert summary["resumed"] == 1
+    assert summary["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_all_force_ignores_state(tmp_path):
+    """
+    Test that --force uploads files the state file lists as done, without
+    asking the manifest, and still records them.
+    """
+    files = write_files(tmp_path, ["A.txt", "B.txt"])
+    state = UploadState(tmp_path / "state.json")
+    for file in files:
+        state.mark_done(file, file_checksum(file))
+    uploads = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        uploads.append(request.url.params.get("force"))
+        details = {"total_records": 1, "inserted_records": 0, "time_taken": 0.1}
+        return httpx.Response(200, json={"message": "ok", "details": details})
+
+    summary = await upload_all(
+        files,
+        API_URL,
+        force=True,
+        state=UploadState(tmp_path / "state.json"),
+        transport=httpx.MockTransport(handler),
+        backoff_base=0,
+    )
+
+    assert uploads == ["true", "true"]
+    assert summary["resumed"] == 0
+    assert summary["succeeded"] == 2
+    assert set(json.loads((tmp_path / "state.json").read_text())) == {
+        "A.txt",
+        "B.txt",
+    }
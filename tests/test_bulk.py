@@ -0,0 +1,104 @@
+# tests/test_bulk.py
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.manifest import file_checksum
+from app.etl.bulk import bulk_ingest, find_data_files
+from app.etl.impl_crop_yield_etl import CropYieldETL
+
+WEATHER_CONTENT = b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n"
+YIELD_CONTENT = b"1985\t7000\n1986\t7100\n"
+
+
+def write_tree(root):
+    (root / "wx_data").mkdir()
+    (root / "yld_data").mkdir()
+    (root / "wx_data" / "USC00110072.txt").write_bytes(WEATHER_CONTENT)
+    (root / "wx_data" / ".USC00110072.txt").write_bytes(b"junk")
+    (root / "yld_data" / "US_corn_grain_yield.txt").write_bytes(YIELD_CONTENT)
+    (root / "yld_data" / "bad.txt").write_bytes(b"1\t2\t3\n")
+    (root / "README.md").write_bytes(b"not data")
+
+
+def test_find_data_files_skips_hidden_and_other_files(tmp_path):
+    write_tree(tmp_path)
+    assert [path.name for path in find_data_files(tmp_path)] == [
+        "USC00110072.txt",
+        "US_corn_grain_yield.txt",
+        "bad.txt",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingest_loads_skips_unchanged_and_reports(tmp_path):
+    """
+    Test that each file is loaded with its ETL class, files in the manifest
+    are skipped and unknown files are reported as errors, and that no session
+    is open while a file is parsed.
+    """
+    write_tree(tmp_path)
+    weather_checksum = file_checksum(WEATHER_CONTENT)
+    sessions = []
+    open_sessions = []
+
+    @asynccontextmanager
+    async def session_factory():
+        session = AsyncMock(spec=AsyncSession)
+        result = MagicMock(rowcount=2)
+
+        def manifest_entry():
+            statement = session.execute.call_args.args[0]
+            params = statement.compile().params
+            if "USC00110072.txt" in params.values():
+                return MagicMock(
+                    checksum=weather_checksum, row_count=2, ingested_at=None
+                )
+            return None
+
+        result.scalars.return_value.first.side_effect = manifest_entry
+        session.execute.return_value = result
+        sessions.append(session)
+        open_sessions.append(session)
+        try:
+            yield session
+        finally:
+            open_sessions.remove(session)
+
+    open_during_extract = []
+    extract = CropYieldETL.extract
+
+    def recording_extract(etl, file_content, filename):
+        open_during_extract.append(etl.session in open_sessions)
+        return extract(etl, file_content, filename)
+
+    lines = []
+    with patch.object(CropYieldETL, "extract", recording_extract):
+        summary = await bulk_ingest(
+            tmp_path,
+            connections=2,
+            session_factory=session_factory,
+            report=lines.append,
+        )
+
+    # The yield file opens one session for the manifest check and one to load
+    assert len(sessions) == 4
+    assert open_during_extract == [False]
+    assert summary["succeeded"] == 1
+    assert summary["unchanged"] == 1
+    assert summary["failed"] == 1
+    assert summary["total_records"] == 2
+    assert summary["rows_per_second"] > 0
+    statuses = {result["filename"]: result["status"] for result in summary["results"]}
+    assert statuses == {
+        "USC00110072.txt": "unchanged",
+        "US_corn_grain_yield.txt": "success",
+        "bad.txt": "error",
+    }
+    assert any(
+        line.startswith("loaded    US_corn_grain_yield.txt (CropYieldETL)")
+        for line in lines
+    )
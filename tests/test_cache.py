@@ -0,0 +1,66 @@
+# tests/test_cache.py
+
+from unittest.mock import patch
+
+from app.utils.cache import QueryCache
+
+
+def test_cache_hits_and_misses():
+    """
+    Test that lookups are counted as hits or misses.
+    """
+    cache = QueryCache("test", max_entries=2, ttl_seconds=60)
+    assert cache.get("a") is None
+    cache.set("a", [1], station_id="S1")
+    assert cache.get("a") == [1]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = QueryCache("test", max_entries=2, ttl_seconds=60)
+    cache.set("a", 1, station_id=None)
+    cache.set("b", 2, station_id=None)
+    cache.get("a")
+    cache.set("c", 3, station_id=None)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_entries_expire():
+    """
+    Test that entries older than the TTL are treated as misses.
+    """
+    cache = QueryCache("test", max_entries=2, ttl_seconds=10)
+    with patch("app.utils.cache.time.monotonic", return_value=100.0):
+        cache.set("a", 1, station_id=None)
+    with patch("app.utils.cache.time.monotonic", return_value=111.0):
+        assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_cache_invalidates_station_and_global_entries():
+    """
+    Test that invalidating a station drops its entries and all-station entries only.
+    """
+    cache = QueryCache("test", max_entries=10, ttl_seconds=60)
+    cache.set("s1", 1, station_id="S1")
+    cache.set("s2", 2, station_id="S2")
+    cache.set("all", 3, station_id=None)
+    assert cache.invalidate_stations(["S1"]) == 2
+    assert cache.get("s2") == 2
+    assert cache.get("s1") is None
+    assert cache.get("all") is None
+
+
+def test_cache_disabled_with_zero_size():
+    """
+    Test that a zero-sized cache never stores anything.
+    """
+    cache = QueryCache("test", max_entries=0, ttl_seconds=60)
+    cache.set("a", 1, station_id=None)
+    assert cache.get("a") is None
@@ -0,0 +1,87 @@
+# tests/test_coverage.py
+
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.coverage import DateCoverage
+from app.etl.impl_weather_etl import WeatherETL
+
+RANGES = [(date(2023, 1, 1), date(2023, 1, 2)), (date(2023, 1, 5), date(2023, 1, 6))]
+WEATHER_CONTENT = (
+    b"20230101\t100\t-50\t5\n"
+    b"20230102\t110\t-40\t0\n"
+    b"20230103\t120\t-30\t0\n"
+    b"20230106\t130\t-20\t0\n"
+    b"20230107\t140\t-10\t0\n"
+)
+
+
+def test_date_coverage_max_date_gaps_and_mask():
+    """
+    Test that stored ranges report their max date, the gaps between them and
+    which dates they cover.
+    """
+    coverage = DateCoverage("USC00110072", RANGES)
+    assert coverage.max_date == date(2023, 1, 6)
+    assert coverage.gaps() == [(date(2023, 1, 3), date(2023, 1, 4))]
+
+    dates = np.array(
+        ["2022-12-31", "2023-01-01", "2023-01-03", "2023-01-06", "2023-01-07", "NaT"],
+        dtype="datetime64[ns]",
+    )
+    assert coverage.covers(dates).tolist() == [False, True, False, True, False, False]
+
+
+def test_empty_date_coverage_covers_nothing():
+    coverage = DateCoverage("USC00110072", [])
+    assert coverage.max_date is None
+    assert coverage.gaps() == []
+    dates = np.array(["2023-01-01"], dtype="datetime64[ns]")
+    assert not coverage.covers(dates).any()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser", ["arrow", "pandas"])
+async def test_incremental_run_skips_stored_dates(parser):
+    """
+    Test that incremental mode loads only rows outside the stored ranges and
+    reports how many were skipped.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock(rowcount=2)
+    result.fetchall.return_value = RANGES
+    session.execute.return_value = result
+    etl = WeatherETL(
+        session=session, load_mode="values", parser=parser, incremental=True
+    )
+
+    feedback = await etl.run_etl(WEATHER_CONTENT, "USC00110072.txt")
+
+    coverage_sql = session.execute.call_args_list[0].args[0]
+    assert "ROW_NUMBER()" in str(coverage_sql)
+    insert_params = session.execute.call_args_list[1].args[0].compile().params
+    assert sorted(
+        value for key, value in insert_params.items() if key.startswith("date")
+    ) == [date(2023, 1, 3), date(2023, 1, 7)]
+    assert feedback["total_records"] == 5
+    assert feedback["covered_records_skipped"] == 3
+    assert feedback["inserted_records"] == 2
+
+
+@pytest.mark.asyncio
+async def test_incremental_run_with_everything_stored_loads_nothing():
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    result.fetchall.return_value = [(date(2023, 1, 1), date(2023, 1, 7))]
+    session.execute.return_value = result
+    etl = WeatherETL(session=session, load_mode="copy", incremental=True)
+
+    feedback = await etl.run_etl(WEATHER_CONTENT, "USC00110072.txt")
+
+    assert session.execute.await_count == 1
+    assert feedback["covered_records_skipped"] == 5
+    assert feedback["inserted_records"] == 0
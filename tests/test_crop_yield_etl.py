@@ -4,7 +4,8 @@ import pytest
 import pandas as pd
 from app.etl.impl_crop_yield_etl import CropYieldETL
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
 from pandas.api.types import is_integer_dtype
 
 
@@ -15,7 +16,7 @@ def session():
 
 @pytest.fixture
 def crop_yield_etl(session):
-    return CropYieldETL(session=session)
+    return CropYieldETL(session=session, load_mode="values")
 
 
 @pytest.fixture
@@ -74,3 +75,44 @@ async def test_crop_yield_etl_load(crop_yield_etl):
     # Verify that the session.execute method was called
     assert crop_yield_etl.session.execute.called
     assert crop_yield_etl.session.commit.called
+
+
+@pytest.mark.asyncio
+async def test_crop_yield_etl_update_mode_counts_changed_rows():
+    """
+    Test that update mode in values mode counts inserted and updated rows from
+    the rows returned by the upsert.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [True, False]
+    session.execute.return_value = result
+    etl = CropYieldETL(session=session, load_mode="values", on_conflict="update")
+
+    feedback = await etl.run_etl(b"1985\t7000\n1986\t7100\n1987\t7200\n", "US_corn.txt")
+
+    upsert, bump = session.execute.call_args_list
+    sql = str(upsert.args[0].compile(dialect=postgresql.dialect()))
+    assert "DO UPDATE SET yield_value = excluded.yield_value" in sql
+    assert "IS DISTINCT FROM (excluded.yield_value)" in sql
+    assert feedback["inserted_records"] == 1
+    assert feedback["updated_records"] == 1
+    assert feedback["unchanged_records"] == 1
+    assert "INSERT INTO data_versions" in str(bump.args[0])
+
+
+@pytest.mark.asyncio
+async def test_crop_yield_etl_reingest_counts_nothing_inserted():
+    """
+    Test that re-ingesting a file whose rows all exist reports 0 inserted and
+    leaves the data version alone.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=0)
+    etl = CropYieldETL(session=session, load_mode="values")
+
+    feedback = await etl.run_etl(b"1985\t7000\n1986\t7100\n", "US_corn.txt")
+
+    assert feedback["inserted_records"] == 0
+    assert feedback["total_records"] == 2
+    assert session.execute.call_count == 1
@@ -0,0 +1,89 @@
+# tests/test_dataset_version.py
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.data_versions import bump_data_versions
+from app.utils.cache import weather_data_cache
+from app.utils.dataset_version import (
+    DatasetVersion,
+    conditional_headers,
+    dataset_version,
+    is_not_modified,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+T1 = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_versions_are_read_from_the_database_with_a_ttl():
+    """
+    Test that versions come from data_versions, are reused within the TTL, and
+    that a changed station invalidates its cached responses.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    rows = {"*": (2, T0), "S1": (1, T0), "S2": (2, T0)}
+    fetch = AsyncMock(side_effect=lambda session: dict(rows))
+    versions = DatasetVersion(ttl_seconds=60)
+    with patch("app.utils.dataset_version.fetch_data_versions", fetch):
+        assert await versions.get(session) == (2, T0.timestamp())
+        assert await versions.get(session, "S1") == (1, T0.timestamp())
+        assert await versions.get(session, "S3") == (0, 0.0)
+        assert fetch.call_count == 1
+
+        weather_data_cache.set("key", b"[]", "S1")
+        rows.update({"*": (3, T1), "S1": (2, T1)})
+        assert await versions.get(session, "S1") == (1, T0.timestamp())
+        versions.expire()
+        assert await versions.get(session, "S1") == (2, T1.timestamp())
+        assert weather_data_cache.get("key") is None
+    weather_data_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_bump_data_versions_covers_stations_and_all_data():
+    """
+    Test that a bump upserts the touched stations and "*", in lock order.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    await bump_data_versions(session, ["S2", "S1", "S2"])
+    sql, params = session.execute.call_args.args
+    assert "ON CONFLICT (scope) DO UPDATE" in str(sql)
+    assert params == {"scopes": ["*", "S1", "S2"]}
+    session.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_is_not_modified_checks_etag_then_date():
+    """
+    Test weak ETag comparison and the If-Modified-Since fallback.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    rows = {"*": (1, T0), "S1": (1, T0)}
+    fetch = AsyncMock(side_effect=lambda session: dict(rows))
+    dataset_version.reset()
+    with patch("app.utils.dataset_version.fetch_data_versions", fetch):
+        headers = await conditional_headers(session, "S1")
+        etag = headers["ETag"]
+
+        assert is_not_modified({"if-none-match": etag}, headers)
+        assert is_not_modified({"if-none-match": f'"x", {etag[2:]}'}, headers)
+        assert not is_not_modified({"if-none-match": '"other"'}, headers)
+        # If-None-Match wins over If-Modified-Since
+        assert not is_not_modified(
+            {"if-none-match": '"other"', "if-modified-since": headers["Last-Modified"]},
+            headers,
+        )
+        assert is_not_modified({"if-modified-since": headers["Last-Modified"]}, headers)
+        assert not is_not_modified({"if-modified-since": "garbage"}, headers)
+
+        rows["S1"] = (2, T1)
+        dataset_version.expire()
+        assert not is_not_modified(
+            {"if-none-match": etag}, await conditional_headers(session, "S1")
+        )
+    dataset_version.reset()
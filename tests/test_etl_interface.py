@@ -1,7 +1,12 @@
 # tests/test_etl_interface.py
 
+import pickle
 import pytest
 from app.etl.etl_interface import ETLInterface
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.process_pool import start_process_pool, shutdown_process_pool
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock
 
 
 def test_etl_interface_abstract_methods():
@@ -23,3 +28,64 @@ def test_etl_interface_requires_methods():
 
     with pytest.raises(TypeError):
         IncompleteETL()
+
+
+@pytest.fixture
+def weather_etl():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=2)
+    return WeatherETL(session=session, load_mode="values")
+
+
+def test_etl_interface_pickle_drops_session(weather_etl):
+    """
+    Test that ETL objects can be sent to worker processes without their session.
+    """
+    clone = pickle.loads(pickle.dumps(weather_etl))
+    assert clone.session is None
+    assert clone.load_mode == "values"
+    assert weather_etl.session is not None
+
+
+@pytest.mark.asyncio
+async def test_etl_interface_run_etl_in_process_pool(weather_etl):
+    """
+    Test that run_etl offloads extract/transform to the process pool and loads on the loop.
+    """
+    start_process_pool(max_workers=1)
+    try:
+        feedback = await weather_etl.run_etl(
+            b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n", "USC00110072.txt"
+        )
+    finally:
+        shutdown_process_pool()
+
+    assert feedback["total_records"] == 2
+    assert "time_taken" in feedback
+    assert weather_etl.session.execute.called
+
+
+@pytest.mark.asyncio
+async def test_etl_interface_run_etl_reports_every_phase(weather_etl):
+    """
+    Test that progress callbacks see extract, transform, load and done, in order.
+    """
+    phases = []
+    start_process_pool(max_workers=1)
+    try:
+        await weather_etl.run_etl(
+            b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n",
+            "USC00110072.txt",
+            progress=lambda phase, state: phases.append(
+                (phase, sorted(state["phase_timings"]))
+            ),
+        )
+    finally:
+        shutdown_process_pool()
+
+    assert phases == [
+        ("extract", []),
+        ("transform", ["extract"]),
+        ("load", ["extract", "transform"]),
+        ("done", ["extract", "load", "transform"]),
+    ]
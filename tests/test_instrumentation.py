@@ -0,0 +1,106 @@
+# tests/test_instrumentation.py
+
+import tracemalloc
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock
+
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.instrumentation import PhaseHook, measure_phase, merge_phase_stats
+
+WEATHER_CONTENT = b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n"
+
+
+class RecordingHook(PhaseHook):
+    def __init__(self):
+        self.calls = []
+
+    def before_phase(self, etl, phase):
+        self.calls.append(("before", phase))
+
+    def after_phase(self, etl, phase, stats):
+        self.calls.append(("after", phase, sorted(stats)))
+
+
+@pytest.fixture
+def weather_etl():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=2)
+    return WeatherETL(session=session, load_mode="values")
+
+
+@pytest.mark.asyncio
+async def test_run_etl_calls_hooks_and_reports_phase_stats(weather_etl):
+    """
+    Test that every phase is wrapped by the hooks and measured in the feedback.
+    """
+    hook = RecordingHook()
+    weather_etl.instrument(hooks=[hook], trace_memory=True)
+    feedback = await weather_etl.run_etl(WEATHER_CONTENT, "USC00110072.txt")
+
+    measured = ["cpu_seconds", "peak_memory_bytes", "wall_seconds"]
+    assert hook.calls == [
+        ("before", "extract"),
+        ("after", "extract", measured),
+        ("before", "transform"),
+        ("after", "transform", measured),
+        ("before", "load"),
+        ("after", "load", measured),
+    ]
+    assert set(feedback["phase_stats"]) == {"extract", "transform", "load"}
+    assert feedback["phase_timings"]["load"] == (
+        feedback["phase_stats"]["load"]["wall_seconds"]
+    )
+    assert feedback["phase_stats"]["extract"]["peak_memory_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_run_etl_with_cprofile(weather_etl):
+    """
+    Test that a cProfile report is attached to every phase when requested.
+    """
+    feedback = await weather_etl.instrument(profiler="cprofile").run_etl(
+        WEATHER_CONTENT, "USC00110072.txt"
+    )
+    assert "read_wx_columns" in feedback["phase_stats"]["extract"]["profile"]
+    assert "function calls" in feedback["phase_stats"]["load"]["profile"]
+
+
+def test_instrument_rejects_unknown_profiler(weather_etl):
+    with pytest.raises(ValueError):
+        weather_etl.instrument(profiler="perf")
+
+
+def test_merge_phase_stats_sums_times_and_keeps_max_peak():
+    blocks = [
+        {"load": {"wall_seconds": 0.5, "cpu_seconds": 0.25, "peak_memory_bytes": 10}},
+        {"load": {"wall_seconds": 1.0, "cpu_seconds": 0.5, "peak_memory_bytes": 30}},
+    ]
+    assert merge_phase_stats(blocks) == {
+        "load": {"wall_seconds": 1.5, "cpu_seconds": 0.75, "peak_memory_bytes": 30}
+    }
+
+
+def test_overlapping_traced_phases_share_tracemalloc():
+    """
+    Test that a traced phase that starts later neither resets the peak of one
+    that is running, and that the first phase to finish does not stop tracing
+    for the other.
+    """
+    assert not tracemalloc.is_tracing()
+    first = measure_phase(trace_memory=True)
+    first_stats = first.__enter__()
+    block = bytearray(1_000_000)
+    del block
+    second = measure_phase(trace_memory=True)
+    second_stats = second.__enter__()
+    first.__exit__(None, None, None)
+    assert tracemalloc.is_tracing()
+    block = bytearray(500_000)
+    del block
+    second.__exit__(None, None, None)
+
+    assert not tracemalloc.is_tracing()
+    assert first_stats["peak_memory_bytes"] >= 1_000_000
+    assert second_stats["peak_memory_bytes"] >= 500_000
@@ -0,0 +1,59 @@
+# tests/test_jobs.py
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.jobs import IngestionJobQueue
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class ValuesWeatherETL(WeatherETL):
+    def __init__(self, session):
+        super().__init__(session, load_mode="values")
+
+
+@asynccontextmanager
+async def mock_session_factory():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=2)
+    yield session
+
+
+@pytest.mark.asyncio
+async def test_ingestion_job_reports_progress_and_feedback():
+    """
+    Test that a queued job runs in the background and records phases and throughput.
+    """
+    jobs = IngestionJobQueue(workers=1, max_queued=5)
+    with patch("app.etl.jobs.AsyncSessionLocal", mock_session_factory):
+        jobs.start()
+        job = jobs.submit(
+            ValuesWeatherETL,
+            b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n",
+            "USC00110072.txt",
+        )
+        assert job.status == "queued"
+        await asyncio.wait_for(jobs.queue.join(), timeout=5)
+        await jobs.stop()
+
+    job = jobs.get(job.id)
+    assert job.status == "succeeded"
+    assert job.phase == "done"
+    assert job.rows_processed == 2
+    assert job.rows_per_second > 0
+    assert set(job.phase_timings) == {"extract", "transform", "load"}
+    assert job.feedback["inserted_records"] == 2
+
+
+def test_ingestion_job_queue_is_bounded():
+    """
+    Test that submit() refuses jobs once the queue is full.
+    """
+    jobs = IngestionJobQueue(workers=1, max_queued=1)
+    jobs.submit(ValuesWeatherETL, b"", "a.txt")
+    with pytest.raises(asyncio.QueueFull):
+        jobs.submit(ValuesWeatherETL, b"", "b.txt")
+    assert len(jobs.list_jobs()) == 1
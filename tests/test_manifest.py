@@ -0,0 +1,144 @@
+# tests/test_manifest.py
+
+import hashlib
+import io
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import UploadFile
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.manifest import file_checksum, find_unchanged
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.streaming import upload_checksum
+from app.routes.ingestion_routes import (
+    ManifestCheckRequest,
+    check_manifest,
+    upload_file,
+)
+
+WEATHER_CONTENT = b"20230101\t100\t-50\t5\n20230102\t110\t-40\t0\n"
+
+
+def manifest_session(entry=None, rows=()):
+    session = AsyncMock(spec=AsyncSession)
+    result = MagicMock(rowcount=2)
+    result.scalars.return_value.first.return_value = entry
+    result.fetchall.return_value = list(rows)
+    session.execute.return_value = result
+    return session
+
+
+@pytest.mark.asyncio
+async def test_upload_checksum_matches_file_checksum():
+    """
+    Test that hashing an upload in chunks matches hashing its bytes, and rewinds it.
+    """
+    upload = UploadFile(file=io.BytesIO(WEATHER_CONTENT), filename="USC00110072.txt")
+    checksum = await upload_checksum(upload, chunk_size=7)
+    assert checksum == file_checksum(WEATHER_CONTENT)
+    assert checksum == hashlib.sha256(WEATHER_CONTENT).hexdigest()
+    assert await upload.read() == WEATHER_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_upload_file_skips_unchanged_content_before_parsing():
+    """
+    Test that a file listed in the manifest is answered without running the ETL.
+    """
+    entry = SimpleNamespace(
+        checksum=file_checksum(WEATHER_CONTENT),
+        row_count=2,
+        ingested_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+    )
+    session = manifest_session(entry)
+    upload = UploadFile(file=io.BytesIO(WEATHER_CONTENT), filename="USC00110072.txt")
+
+    with patch("app.routes.ingestion_routes.detect_etl_class") as detect:
+        result = await upload_file(
+            file=upload,
+            stream=False,
+            profile=None,
+            trace_memory=None,
+            force=False,
+            session=session,
+        )
+
+    detect.assert_not_called()
+    assert result["details"]["unchanged"] is True
+    assert result["details"]["inserted_records"] == 0
+    assert result["details"]["total_records"] == 2
+
+
+@pytest.mark.asyncio
+async def test_find_unchanged_only_matches_the_latest_version():
+    """
+    Test that content ingested before a newer version of the file is not
+    skipped (A, then B, then A again).
+    """
+    entry = SimpleNamespace(
+        checksum=file_checksum(b"other content"),
+        row_count=1,
+        ingested_at=datetime(2026, 10, 2, tzinfo=timezone.utc),
+    )
+    session = manifest_session(entry)
+    checksum = file_checksum(WEATHER_CONTENT)
+    assert await find_unchanged(session, "USC00110072.txt", checksum) is None
+
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "WHERE ingestion_manifest.filename = " in sql
+    assert "ORDER BY ingestion_manifest.ingested_at DESC" in sql
+    assert "checksum =" not in sql
+
+
+@pytest.mark.asyncio
+async def test_run_etl_records_manifest_entry():
+    """
+    Test that a successful run with a checksum is recorded in the manifest.
+    """
+    session = manifest_session()
+    etl = WeatherETL(session=session, load_mode="values")
+    checksum = file_checksum(WEATHER_CONTENT)
+    await etl.run_etl(WEATHER_CONTENT, "USC00110072.txt", checksum=checksum)
+
+    statement = session.execute.call_args.args[0]
+    params = statement.compile().params
+    assert statement.table.name == "ingestion_manifest"
+    assert params["checksum"] == checksum
+    assert params["station_id"] == "USC00110072"
+    assert params["row_count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_check_manifest_splits_unchanged_and_changed_files():
+    session = manifest_session(rows=[("a.txt", "aa")])
+    request = ManifestCheckRequest(
+        files=[
+            {"filename": "a.txt", "checksum": "AA"},
+            {"filename": "b.txt", "checksum": "bb"},
+        ]
+    )
+    assert await check_manifest(request, session) == {
+        "unchanged": ["a.txt"],
+        "changed": ["b.txt"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_check_manifest_treats_superseded_content_as_changed():
+    """
+    Test that a checksum only counts as unchanged while it is the file's
+    latest ingested version.
+    """
+    # The latest entry of a.txt has content "bb", an older one "aa"
+    session = manifest_session(rows=[("a.txt", "bb")])
+    request = ManifestCheckRequest(files=[{"filename": "a.txt", "checksum": "aa"}])
+    assert await check_manifest(request, session) == {
+        "unchanged": [],
+        "changed": ["a.txt"],
+    }
+    sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "DISTINCT ON (ingestion_manifest.filename)" in sql
@@ -0,0 +1,133 @@
+# tests/test_metrics.py
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock
+
+from app.etl.impl_weather_etl import WeatherETL
+from app.routes.metrics_routes import get_metrics
+from app.utils.metrics import PrometheusMiddleware, record_etl_run
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+async def call(app, path):
+    """
+    Send one GET request through the ASGI app and return the response status.
+    """
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_records_latency_by_route_template():
+    """
+    Test that requests are labelled with the route template and status code.
+    """
+    app = FastAPI()
+    app.add_middleware(PrometheusMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"item_id": item_id}
+
+    labels = dict(method="GET", route="/items/{item_id}")
+    ok_before = sample("http_request_duration_seconds_count", status="200", **labels)
+    missing_before = sample(
+        "http_request_duration_seconds_count", status="404", **labels
+    )
+
+    assert await call(app, "/items/1") == 200
+    assert await call(app, "/items/2") == 200
+    assert await call(app, "/items/0") == 404
+    assert await call(app, "/nowhere") == 404
+
+    assert (
+        sample("http_request_duration_seconds_count", status="200", **labels)
+        == ok_before + 2
+    )
+    assert (
+        sample("http_request_duration_seconds_count", status="404", **labels)
+        == missing_before + 1
+    )
+    assert sample(
+        "http_request_duration_seconds_count",
+        method="GET",
+        route="unmatched",
+        status="404",
+    )
+    assert sample("http_requests_in_progress", **labels) == 0
+
+
+@pytest.mark.asyncio
+async def test_run_etl_records_etl_metrics():
+    """
+    Test that run_etl counts extracted, inserted and skipped rows per ETL class.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=1)
+    etl = WeatherETL(session=session, load_mode="values")
+    labels = dict(etl_class="WeatherETL")
+    extracted_before = sample("etl_rows_extracted_total", **labels)
+    skipped_before = sample("etl_duplicates_skipped_total", **labels)
+    loads_before = sample("etl_phase_duration_seconds_count", phase="load", **labels)
+
+    await etl.run_etl(
+        b"20230101\t100\t-50\t5\n20230101\t100\t-50\t5\n", "USC00110072.txt"
+    )
+
+    assert sample("etl_rows_extracted_total", **labels) == extracted_before + 2
+    assert sample("etl_duplicates_skipped_total", **labels) == skipped_before + 1
+    assert (
+        sample("etl_phase_duration_seconds_count", phase="load", **labels)
+        == loads_before + 1
+    )
+
+    response = await get_metrics()
+    assert b"etl_rows_inserted_total" in response.body
+
+
+def test_updated_rows_are_not_counted_as_skipped():
+    """
+    Test that rows overwritten in update mode are not reported as skipped.
+    """
+    labels = dict(etl_class="UpdateModeETL")
+    record_etl_run(
+        "UpdateModeETL",
+        {
+            "total_records": 5,
+            "inserted_records": 1,
+            "updated_records": 3,
+            "phase_timings": {},
+        },
+    )
+    assert sample("etl_rows_inserted_total", **labels) == 1
+    assert sample("etl_duplicates_skipped_total", **labels) == 1
@@ -0,0 +1,35 @@
+# tests/test_pool.py
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.db.pool import InstrumentedQueuePool
+
+
+def checkout_twice(pool):
+    first = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    first.close()
+    pool.connect().close()
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkouts_and_timeouts():
+    """
+    Test that checkouts, waits and pool timeouts are recorded.
+    """
+    pool = InstrumentedQueuePool(
+        creator=MagicMock, pool_size=1, max_overflow=0, timeout=0.05
+    )
+    await greenlet_spawn(checkout_twice, pool)
+
+    stats = pool.stats()
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["avg_wait_ms"] is not None
@@ -0,0 +1,67 @@
+# tests/test_streaming.py
+
+import pytest
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.streaming import iter_line_blocks
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock, MagicMock
+
+
+async def as_chunks(content: bytes, size: int):
+    for start in range(0, len(content), size):
+        yield content[start : start + size]
+
+
+@pytest.fixture
+def weather_file_content():
+    """
+    Simulated binary content of a weather file with a duplicated date.
+    """
+    return (
+        b"20230101\t100\t-50\t5\n"
+        b"20230102\t110\t-40\t0\n"
+        b"20230103\t-9999\t-30\t2\n"
+        b"20230101\t100\t-50\t5\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_line_blocks_keeps_lines_whole(weather_file_content):
+    """
+    Test that chunks are regrouped on line boundaries without losing bytes.
+    """
+    blocks = [
+        block async for block in iter_line_blocks(as_chunks(weather_file_content, 7))
+    ]
+    assert b"".join(blocks) == weather_file_content
+    assert all(block.endswith(b"\n") for block in blocks)
+
+
+@pytest.mark.asyncio
+async def test_iter_line_blocks_without_trailing_newline():
+    """
+    Test that the last line is emitted even without a trailing newline.
+    """
+    blocks = [
+        block async for block in iter_line_blocks(as_chunks(b"1985\t10\n1986\t20", 100))
+    ]
+    assert blocks == [b"1985\t10\n", b"1986\t20"]
+
+
+@pytest.mark.asyncio
+async def test_run_etl_stream_loads_each_block(weather_file_content):
+    """
+    Test that run_etl_stream parses and loads the file block by block.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(rowcount=1)
+    etl = WeatherETL(session=session, load_mode="values")
+
+    feedback = await etl.run_etl_stream(
+        as_chunks(weather_file_content, 25), "USC00110072.txt"
+    )
+
+    assert feedback["total_records"] == 4
+    assert feedback["chunks"] == 4
+    assert feedback["inserted_records"] == 4
+    assert session.commit.call_count == 4
@@ -2,9 +2,10 @@
 
 import pytest
 import pandas as pd
+from datetime import date
 from app.etl.impl_weather_etl import WeatherETL
 from sqlalchemy.ext.asyncio import AsyncSession
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 
 @pytest.fixture
@@ -14,7 +15,21 @@ def session():
 
 @pytest.fixture
 def weather_etl(session):
-    return WeatherETL(session=session)
+    return WeatherETL(session=session, load_mode="values")
+
+
+@pytest.fixture
+def driver_connection(session):
+    """
+    Mocked asyncpg connection behind the session, as used by COPY loads.
+    """
+    driver_connection = AsyncMock()
+    connection = AsyncMock()
+    connection.get_raw_connection.return_value = MagicMock(
+        driver_connection=driver_connection
+    )
+    session.connection.return_value = connection
+    return driver_connection
 
 
 @pytest.fixture
@@ -81,3 +96,125 @@ async def test_weather_etl_load(weather_etl):
     # Verify that the session.execute method was called
     assert weather_etl.session.execute.called
     assert weather_etl.session.commit.called
+
+
+@pytest.mark.asyncio
+async def test_weather_etl_load_values_writes_null_for_missing(weather_etl):
+    """
+    Test that the VALUES load mode stores missing measurements as NULL, like COPY.
+    """
+    weather_etl.session.execute.return_value = MagicMock(rowcount=1)
+    transformed_data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2023-01-01"]),
+            "max_temp": [float("nan")],
+            "min_temp": [-5.0],
+            "precipitation": [0.5],
+            "station_id": ["USC00110072"],
+        }
+    )
+
+    await weather_etl.load(transformed_data)
+
+    params = weather_etl.session.execute.call_args_list[0].args[0].compile().params
+    assert params["max_temp_m0"] is None
+    assert params["date_m0"] == date(2023, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_weather_etl_load_copy(session, driver_connection):
+    """
+    Test the COPY load mode of WeatherETL with a mocked asyncpg connection.
+    """
+    session.execute.return_value = MagicMock(rowcount=1)
+
+    transformed_data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+            "max_temp": [10.0, float("nan")],
+            "min_temp": [-5.0, -4.0],
+            "precipitation": [0.5, 0.0],
+            "station_id": ["USC00110072", "USC00110072"],
+        }
+    )
+
+    etl = WeatherETL(session=session, load_mode="copy")
+    inserted = await etl.load(transformed_data)
+
+    assert inserted == 1
+    # The data version is bumped inside the load transaction
+    sql, params = session.execute.call_args.args
+    assert "INSERT INTO data_versions" in str(sql)
+    assert params == {"scopes": ["*", "USC00110072"]}
+    args, kwargs = driver_connection.copy_records_to_table.call_args
+    assert args == ("weather_data_staging",)
+    assert kwargs["columns"] == [
+        "station_id",
+        "date",
+        "max_temp",
+        "min_temp",
+        "precipitation",
+    ]
+    records = kwargs["records"]
+    assert records[0] == ("USC00110072", date(2023, 1, 1), 10.0, -5.0, 0.5)
+    assert records[1][2] is None
+    assert session.commit.called
+
+
+@pytest.mark.asyncio
+async def test_weather_etl_load_compact_storage(session, driver_connection):
+    """
+    Test that compact storage copies station keys and integer tenths.
+    """
+    session.execute.return_value = MagicMock(
+        rowcount=2, fetchall=MagicMock(return_value=[("USC00110072", 7)])
+    )
+
+    transformed_data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2023-01-01", "2023-01-02"]),
+            "max_temp": [10.0, float("nan")],
+            "min_temp": [-5.0, -0.3],
+            "precipitation": [0.5, 0.0],
+            "station_id": ["USC00110072", "USC00110072"],
+        }
+    )
+
+    etl = WeatherETL(session=session, load_mode="copy", storage="compact")
+    assert await etl.load(transformed_data) == 2
+
+    args, kwargs = driver_connection.copy_records_to_table.call_args
+    assert args == ("weather_data_compact_staging",)
+    assert kwargs["columns"][0] == "station_key"
+    assert kwargs["records"] == [
+        (7, date(2023, 1, 1), 100, -50, 5),
+        (7, date(2023, 1, 2), None, -3, 0),
+    ]
+    statements = [str(call.args[0]) for call in session.execute.call_args_list]
+    assert "INSERT INTO stations" in statements[0]
+    assert "weather_data_compact" in statements[-2]
+    assert "INSERT INTO data_versions" in statements[-1]
+
+
+@pytest.mark.asyncio
+async def test_weather_etl_update_mode_counts_changed_rows(
+    session, driver_connection, weather_file_content
+):
+    """
+    Test that update mode overwrites only changed rows and reports
+    inserted, updated and unchanged counts.
+    """
+    session.execute.return_value = MagicMock(one=MagicMock(return_value=(0, 1)))
+
+    etl = WeatherETL(session=session, load_mode="copy", on_conflict="update")
+    feedback = await etl.run_etl(weather_file_content, "USC00110072.txt")
+
+    merge = str(session.execute.call_args_list[1].args[0])
+    assert "DO UPDATE SET max_temp = EXCLUDED.max_temp" in merge
+    assert (
+        "WHERE (weather_data.max_temp, weather_data.min_temp, "
+        "weather_data.precipitation) IS DISTINCT FROM" in merge
+    )
+    assert feedback["inserted_records"] == 0
+    assert feedback["updated_records"] == 1
+    assert feedback["unchanged_records"] == 1
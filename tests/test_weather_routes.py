@@ -0,0 +1,415 @@
+# tests/test_weather_routes.py
+
+import json
+from collections import namedtuple
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pyarrow as pa
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import column, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.arrow_export import WEATHER_ARROW_SCHEMA
+from app.routes.weather_routes import (
+    get_weather_data,
+    get_weather_stats,
+    serialize_export_rows,
+    stream_weather_export,
+    weather_data_source,
+)
+from app.utils.cache import stats_cache, weather_data_cache
+from app.utils.dataset_version import dataset_version
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+WeatherRow = namedtuple(
+    "WeatherRow", ["station_id", "date", "max_temp", "min_temp", "precipitation"]
+)
+
+
+def make_row(station_id, day):
+    return WeatherRow(station_id, day, 1.0, 0.0, 0.0)
+
+
+@pytest.fixture(autouse=True)
+def data_versions():
+    """
+    Stand in for the data_versions table; tests edit it to simulate loads.
+    """
+    versions = {"*": (1, datetime(2026, 1, 1, tzinfo=timezone.utc))}
+    fetch_data_versions = AsyncMock(side_effect=lambda session: dict(versions))
+    with patch("app.utils.dataset_version.fetch_data_versions", fetch_data_versions):
+        yield versions
+
+
+def bump(versions, station_id):
+    version, _ = versions.get(station_id, (0, None))
+    versions[station_id] = (version + 1, datetime.now(timezone.utc))
+    dataset_version.expire()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    stats_cache.clear()
+    weather_data_cache.clear()
+    dataset_version.reset()
+    yield
+    stats_cache.clear()
+    weather_data_cache.clear()
+
+
+@pytest.fixture
+def session():
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(
+        fetchall=MagicMock(
+            return_value=[
+                make_row("USC00110072", date(1985, 1, 1)),
+                make_row("USC00110072", date(1985, 1, 2)),
+            ]
+        )
+    )
+    return session
+
+
+async def fetch(session, **params):
+    defaults = dict(
+        station_id=None,
+        start_date=None,
+        end_date=None,
+        limit=2,
+        offset=0,
+        order_by="date",
+        order_direction="asc",
+        cursor=None,
+        format="json",
+    )
+    defaults.update(params)
+    request = SimpleNamespace(headers=defaults.pop("headers", {}))
+    return await get_weather_data(request=request, session=session, **defaults)
+
+
+def compiled_sql(session) -> str:
+    statement = session.execute.call_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip():
+    """
+    Test that cursors encode the ordering and the keyset values.
+    """
+    cursor = encode_cursor("date", "desc", [date(1985, 1, 2), "USC00110072"])
+    assert decode_cursor(cursor) == ("date", "desc", ["1985-01-02", "USC00110072"])
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_weather_data_rejects_unknown_order_by(session):
+    """
+    Test that order_by is restricted to whitelisted columns.
+    """
+    with pytest.raises(HTTPException) as excinfo:
+        await fetch(session, order_by="id; DROP TABLE weather_data")
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_weather_data_orders_and_returns_next_cursor(session):
+    """
+    Test that a full page is ordered on the keyset and returns a cursor to the next page.
+    """
+    response = await fetch(session, order_direction="desc")
+    assert len(json.loads(response.body)) == 2
+    assert "ORDER BY date DESC, station_id DESC" in compiled_sql(session)
+    assert decode_cursor(response.headers["X-Next-Cursor"]) == (
+        "date",
+        "desc",
+        ["1985-01-02", "USC00110072"],
+    )
+
+
+@pytest.mark.asyncio
+async def test_weather_data_serializes_rows_directly(session):
+    """
+    Test that rows are written as the documented JSON objects without models.
+    """
+    response = await fetch(session)
+    assert response.media_type == "application/json"
+    assert json.loads(response.body)[0] == {
+        "station_id": "USC00110072",
+        "date": "1985-01-01",
+        "max_temp": 1.0,
+        "min_temp": 0.0,
+        "precipitation": 0.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_weather_stats_turns_nan_and_inf_into_null():
+    """
+    Test that non-finite aggregates are returned as null.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    session.execute.return_value = MagicMock(
+        fetchall=MagicMock(
+            return_value=[("USC00110072", 1985, float("nan"), float("inf"), 12.5)]
+        )
+    )
+    response = await get_weather_stats(
+        request=SimpleNamespace(headers={}),
+        station_id=None,
+        year=None,
+        limit=100,
+        offset=0,
+        session=session,
+    )
+    assert json.loads(response.body) == [
+        {
+            "station_id": "USC00110072",
+            "year": 1985,
+            "avg_max_temp": None,
+            "avg_min_temp": None,
+            "total_precipitation": 12.5,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_weather_data_cursor_uses_keyset_predicate(session):
+    """
+    Test that a cursor turns into a row comparison instead of an OFFSET.
+    """
+    cursor = encode_cursor("station_id", "asc", ["USC00110072", date(1985, 1, 2)])
+    await fetch(session, order_by="station_id", cursor=cursor)
+    sql = compiled_sql(session)
+    assert "(station_id, date) > (" in sql
+    assert "ORDER BY station_id, date" in sql
+
+
+@pytest.mark.asyncio
+async def test_compact_weather_data_cursor_pages_on_station_key(session):
+    """
+    Test that compact storage pages on the table's (station_key, date) key,
+    looking the cursor's station up in the stations table.
+    """
+    cursor = encode_cursor("station_id", "asc", ["USC00110072", date(1985, 1, 2)])
+    with patch("app.routes.weather_routes.WEATHER_STORAGE", "compact"):
+        await fetch(session, order_by="station_id", cursor=cursor)
+    sql = compiled_sql(session)
+    assert "(station_key, date) > ((SELECT stations.id" in sql
+    assert "WHERE stations.station_id = " in sql
+    assert "ORDER BY station_key, date" in sql
+
+
+@pytest.mark.asyncio
+async def test_weather_data_cursor_must_match_ordering(session):
+    """
+    Test that a cursor issued for another ordering is rejected.
+    """
+    cursor = encode_cursor("station_id", "asc", ["USC00110072", date(1985, 1, 2)])
+    with pytest.raises(HTTPException) as excinfo:
+        await fetch(session, order_by="date", cursor=cursor)
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values", [["1985-01-02"], ["1985-01-02", "USC00110072", "extra"]]
+)
+async def test_weather_data_cursor_must_have_every_keyset_value(session, values):
+    """
+    Test that a cursor with too few or too many keyset values is rejected
+    before it reaches the database.
+    """
+    cursor = encode_cursor("date", "asc", values)
+    with pytest.raises(HTTPException) as excinfo:
+        await fetch(session, cursor=cursor)
+    assert excinfo.value.status_code == 400
+    session.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_weather_data_is_served_from_cache_until_invalidated(session):
+    """
+    Test that repeated queries hit the cache and ingestion for the station invalidates it.
+    """
+    first = await fetch(session, station_id="USC00110072")
+    second = await fetch(session, station_id="USC00110072")
+    assert session.execute.call_count == 1
+    assert second.body == first.body
+    assert "X-Next-Cursor" in second.headers
+
+    weather_data_cache.invalidate_stations(["USC00110072"])
+    await fetch(session, station_id="USC00110072")
+    assert session.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_weather_data_cache_dropped_when_another_process_loads(
+    session, data_versions
+):
+    """
+    Test that a version bump seen in the data_versions table invalidates the
+    station's cached responses, even though this process did not load the rows.
+    """
+    await fetch(session, station_id="USC00110072")
+    await fetch(session, station_id="USC00110072")
+    assert session.execute.call_count == 1
+
+    bump(data_versions, "USC00110072")
+    await fetch(session, station_id="USC00110072")
+    assert session.execute.call_count == 2
+
+
+def test_compact_weather_source_converts_to_real_units():
+    """
+    Test that compact storage is read through a join with tenths scaled back.
+    """
+    query = select(column("station_id"), column("max_temp")).select_from(
+        weather_data_source("compact")
+    )
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "JOIN stations ON stations.id = weather_data_compact.station_key" in sql
+    assert "CAST(weather_data_compact.max_temp AS FLOAT) / " in sql
+    assert sql.endswith("AS weather_data")
+    assert str(weather_data_source("float")) == "weather_data"
+
+
+@pytest.mark.asyncio
+async def test_weather_data_arrow_response(session):
+    """
+    Test that the Arrow Accept header returns an IPC stream built from COPY output.
+    """
+    table = pa.table(
+        {
+            "station_id": ["A", "A"],
+            "date": pa.array([date(1985, 1, 1), date(1985, 1, 2)], pa.date32()),
+            "max_temp": [1.0, 2.0],
+            "min_temp": [0.0, 0.0],
+            "precipitation": [0.0, 0.0],
+        },
+        schema=WEATHER_ARROW_SCHEMA,
+    )
+    fetch_arrow_table = AsyncMock(return_value=table)
+    with patch("app.routes.weather_routes.fetch_arrow_table", fetch_arrow_table):
+        result = await fetch(
+            session, headers={"accept": "application/vnd.apache.arrow.stream"}
+        )
+
+    assert result.media_type == "application/vnd.apache.arrow.stream"
+    assert result.headers["Vary"] == "Accept"
+    assert pa.ipc.open_stream(result.body).read_all().equals(table)
+    assert decode_cursor(result.headers["X-Next-Cursor"]) == (
+        "date",
+        "asc",
+        ["1985-01-02", "A"],
+    )
+    session.execute.assert_not_called()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await fetch(session, format="xml")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_weather_data_not_modified_until_station_is_ingested(
+    session, data_versions
+):
+    """
+    Test that a matching If-None-Match gets a 304 without a query until the
+    station's data version changes.
+    """
+    bump(data_versions, "USC00110072")
+    first = await fetch(session, station_id="USC00110072")
+    etag = first.headers["ETag"]
+    assert "Last-Modified" in first.headers
+    assert "must-revalidate" in first.headers["Cache-Control"]
+    assert first.headers["Vary"] == "Accept"
+
+    weather_data_cache.clear()
+    revalidated = await fetch(
+        session, station_id="USC00110072", headers={"if-none-match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.headers["Vary"] == "Accept"
+    assert session.execute.call_count == 1
+
+    # Other stations do not change this station's version
+    bump(data_versions, "USC00999999")
+    still_valid = await fetch(
+        session, station_id="USC00110072", headers={"if-none-match": etag}
+    )
+    assert still_valid.status_code == 304
+
+    bump(data_versions, "USC00110072")
+    changed = await fetch(
+        session, station_id="USC00110072", headers={"if-none-match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+ExportRow = namedtuple(
+    "ExportRow", ["station_id", "date", "max_temp", "min_temp", "precipitation"]
+)
+
+
+def test_serialize_export_rows_ndjson_and_csv():
+    """
+    Test that export batches serialize missing values (None or NaN) as null/empty.
+    """
+    rows = [
+        ExportRow("USC00110072", date(1985, 1, 1), -2.2, -12.8, 9.4),
+        ExportRow("USC00110072", date(1985, 1, 2), float("nan"), None, 0.0),
+    ]
+    lines = serialize_export_rows(rows, "ndjson").splitlines()
+    assert json.loads(lines[1]) == {
+        "station_id": "USC00110072",
+        "date": "1985-01-02",
+        "max_temp": None,
+        "min_temp": None,
+        "precipitation": 0.0,
+    }
+    assert serialize_export_rows(rows, "csv") == (
+        "USC00110072,1985-01-01,-2.2,-12.8,9.4\n" "USC00110072,1985-01-02,,,0.0\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_weather_export_reads_partitions():
+    """
+    Test that the export streams every partition of the server-side cursor.
+    """
+    partitions = [
+        [ExportRow("A", date(1985, 1, 1), 1.0, 0.0, 0.0)],
+        [ExportRow("A", date(1985, 1, 2), 2.0, 0.0, 0.0)],
+    ]
+
+    async def iter_partitions():
+        for partition in partitions:
+            yield partition
+
+    export_session = AsyncMock()
+    export_session.stream.return_value = MagicMock(
+        partitions=MagicMock(return_value=iter_partitions())
+    )
+
+    @asynccontextmanager
+    async def session_factory():
+        yield export_session
+
+    with patch("app.routes.weather_routes.AsyncSessionLocal", session_factory):
+        chunks = [
+            chunk
+            async for chunk in stream_weather_export(MagicMock(), export_format="csv")
+        ]
+
+    assert chunks[0].startswith("station_id,date")
+    assert len(chunks) == 3
@@ -0,0 +1,69 @@
+# tests/test_weather_stats.py
+
+import pandas as pd
+import pytest
+from app.db.weather_stats import refresh_weather_stats, touched_stats_groups
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock
+
+
+def test_touched_stats_groups():
+    """
+    Test that only the distinct (station_id, year) groups of a batch are returned.
+    """
+    data = pd.DataFrame(
+        {
+            "station_id": ["USC00110072"] * 3 + ["USC00110187"],
+            "date": pd.to_datetime(["1985-01-01", "1985-06-01", "1986-01-01", None]),
+        }
+    )
+    assert touched_stats_groups(data) == [
+        ("USC00110072", 1985),
+        ("USC00110072", 1986),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_refresh_weather_stats_binds_groups():
+    """
+    Test that the refresh statement receives the groups as parallel arrays.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    await refresh_weather_stats(session, [("A", 1985), ("B", 1986)])
+    _, params = session.execute.call_args.args
+    assert params == {"station_ids": ["A", "B"], "years": [1985, 1986]}
+
+
+@pytest.mark.asyncio
+async def test_refresh_weather_stats_skips_empty_batches():
+    """
+    Test that nothing is executed when no group was touched.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    await refresh_weather_stats(session, [])
+    assert not session.execute.called
+
+
+@pytest.mark.asyncio
+async def test_refresh_weather_stats_reads_compact_storage():
+    """
+    Test that compact storage recomputes the summary from the tenths table.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    await refresh_weather_stats(session, [("A", 1985)], storage="compact")
+    statement, _ = session.execute.call_args.args
+    assert "weather_data_compact" in str(statement)
+
+
+@pytest.mark.asyncio
+async def test_refresh_weather_stats_locks_groups_before_recompute():
+    """
+    Test that the touched groups are advisory-locked, in a statement of their
+    own, before the summary is recomputed.
+    """
+    session = AsyncMock(spec=AsyncSession)
+    await refresh_weather_stats(session, [("B", 1986), ("A", 1985)])
+    lock, refresh = (str(call.args[0]) for call in session.execute.call_args_list)
+    assert "pg_advisory_xact_lock" in lock
+    assert "ORDER BY g.station_id, g.year" in lock
+    assert "INSERT INTO weather_stats_summary" in refresh
@@ -0,0 +1,27 @@
+# tests/test_wx_generator.py
+
+from app.etl.impl_weather_etl import WeatherETL
+from benchmarks.wx_generator import generate_station, iter_stations
+
+
+def test_generated_station_is_deterministic_and_parses():
+    """
+    Test that generated files are reproducible and contain gaps and duplicates
+    that the weather ETL handles.
+    """
+    content = generate_station(7, years=2, seed=1)
+    assert content == generate_station(7, years=2, seed=1)
+    assert content != generate_station(8, years=2, seed=1)
+    assert b"-9999" in content
+
+    etl = WeatherETL(session=None)
+    raw_data = etl.extract(content, "USC00000007.txt")
+    transformed = etl.transform(raw_data.copy())
+    assert len(raw_data) > len(transformed) >= 730
+    assert transformed["date"].notna().all()
+    assert transformed["max_temp"].isna().any()
+
+
+def test_iter_stations_names_files_by_station():
+    names = [name for name, _ in iter_stations(2, years=1, first_index=10)]
+    assert names == ["USC00000010.txt", "USC00000011.txt"]
@@ -0,0 +1,53 @@
+# tests/test_wx_parser.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.etl.impl_weather_etl import WeatherETL
+from app.etl.wx_parser import read_wx_columns, yyyymmdd_to_datetime
+from benchmarks.wx_generator import generate_station
+
+EDGE_CASES = (
+    b"20230101\t  100\t  -50\t    5\n"
+    b"20230230\t    1\t    2\t    3\n"  # February 30
+    b"20231301\t-9999\t-9999\t-9999\n"  # month 13, nothing measured
+    b"-9999\t-9999\t-9999\t-9999\n"
+    b"20230101\t    5\t    5\t    5\n"  # duplicate date
+    b"19000229\t    1\t    1\t    1\n"  # not a leap year
+    b"20000229\t    1\t    1\t    1\n"
+    b"16000101\t    1\t    1\t    1\n"  # before datetime64[ns]
+)
+
+
+def parse(content: bytes, parser: str) -> pd.DataFrame:
+    etl = WeatherETL(session=None, parser=parser)
+    return etl.transform(etl.extract(content, "USC00000001.txt"))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        EDGE_CASES,
+        generate_station(1, years=3, seed=2, duplicate_rate=0.05),
+        b"20230101\t1.5\t2\t3\n",  # floats: falls back to pandas
+        b"20230101\t1\t\t3\r\n20230102\t1\t2\t3\r\n",  # empty field: falls back
+    ],
+)
+def test_arrow_parser_matches_pandas_parser(content):
+    """
+    Test that the vectorized parser produces exactly the frame of the pandas parser.
+    """
+    pd.testing.assert_frame_equal(parse(content, "arrow"), parse(content, "pandas"))
+
+
+def test_read_wx_columns_uses_int32_columns():
+    df = read_wx_columns(EDGE_CASES)
+    assert df.dtypes.tolist() == [np.dtype("int32")] * 4
+    assert df["date"].iat[0] == 20230101
+
+
+def test_yyyymmdd_to_datetime_rejects_impossible_dates():
+    dates = yyyymmdd_to_datetime(np.array([20240229, 20230229, 20231232, 123]))
+    assert dates[0] == np.datetime64("2024-02-29")
+    assert np.isnat(dates[1:]).all()